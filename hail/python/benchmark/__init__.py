@@ -1,7 +1,10 @@
 from .utils import run_all, run_single
+from .import_benchmarks import *
+from .literal_benchmarks import *
 from .matrix_table_benchmarks import *
 from .methods_benchmarks import *
 from .table_benchmarks import *
+from .type_benchmarks import *
 
 __all__ = [
     'run_all',
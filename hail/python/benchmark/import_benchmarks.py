@@ -0,0 +1,16 @@
+import subprocess
+import sys
+
+from benchmark.utils import benchmark
+
+# imported on first use, not by `import hail`
+_lazy_modules = ['bokeh', 'pandas', 'pyspark', 'scipy', 'hail.linalg', 'hail.plot', 'hail.stats']
+
+
+@benchmark
+def import_hail():
+    # a fresh interpreter, since modules imported once are cached
+    subprocess.check_call([sys.executable, '-c',
+                           'import sys; import hail; '
+                           f'loaded = [m for m in {_lazy_modules!r} if m in sys.modules]; '
+                           'assert not loaded, f"imported by import hail: {loaded}"'])
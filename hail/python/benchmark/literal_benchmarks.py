@@ -0,0 +1,39 @@
+import hail as hl
+from hail.backend.backend import EncodedLiteralCache
+from hail.ir.renderer import Renderer
+from benchmark.utils import benchmark
+
+
+def _variant_id_filter(n):
+    # a join-by-lookup against a large set of variant IDs
+    ids = {f'1:{i}:A:T' for i in range(n)}
+    return hl.literal(ids).contains('1:1000:A:T')._ir
+
+
+def _submit(x, literal_cache):
+    r = Renderer(stop_at_jir=True, literal_cache=literal_cache)
+    code = r(x)
+    x.parse(code, ir_map=r.jirs)
+
+
+def _run(literal_cache_factory):
+    x = _variant_id_filter(1_000_000)
+    for i in range(5):
+        _submit(x, literal_cache_factory())
+
+
+@benchmark
+def submit_large_literal_inline():
+    _run(lambda: None)
+
+
+@benchmark
+def submit_large_literal_encoded():
+    # a fresh cache each time, so every submission sends the literal
+    _run(EncodedLiteralCache)
+
+
+@benchmark
+def submit_large_literal_encoded_cached():
+    cache = EncodedLiteralCache()
+    _run(lambda: cache)
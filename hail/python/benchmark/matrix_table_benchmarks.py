@@ -30,6 +30,11 @@ def matrix_table_rows_is_transition():
     ht = hl.read_matrix_table(resource('profile.mt')).rows().key_by()
     ht.select(is_snp = hl.is_snp(ht.alleles[0], ht.alleles[1]))._force_count()
 
+@benchmark
+def matrix_table_to_numpy():
+    mt = hl.read_matrix_table(resource('profile.mt'))
+    mt.to_numpy(mt.GT, dtype='int8', missing='mask')
+
 def many_aggs(mt):
     aggs = [
         hl.agg.count_where(mt.GT.is_hom_ref()),
@@ -39,7 +39,16 @@ def hwe_normalized_pca():
     mt = mt.filter_rows(mt.info.AF[0] > 0.01)
     hl.hwe_normalized_pca(mt.GT)
 
+
 @benchmark
 def split_multi_hts():
     mt = hl.read_matrix_table(resource('profile.mt'))
     hl.split_multi_hts(mt)._force_count_rows()
+
+
+@benchmark
+def block_matrix_to_from_numpy():
+    import numpy as np
+    from hail.linalg import BlockMatrix
+    a = np.random.rand(10_000, 10_000)
+    BlockMatrix.from_numpy(a).to_numpy()
@@ -54,3 +54,38 @@ def table_big_aggregate_compile_and_execute():
     ht = hl.utils.range_table(M)
     expr = tuple([hl.agg.fraction(ht.idx % i == 0) for i in range(N) if i > 0])
     ht.aggregate(expr)
+
+
+@benchmark
+def table_collect_numpy():
+    N = 10_000_000
+    ht = hl.utils.range_table(N)
+    hl.struct(x=hl.float64(ht.idx) / 2, y=ht.idx % 3).collect_numpy()
+
+
+@benchmark
+def table_iter_rows():
+    N = 10_000_000
+    ht = hl.utils.range_table(N)
+    ht = ht.annotate(x=hl.str(ht.idx))
+    for _ in ht.iter_rows():
+        pass
+
+
+@benchmark
+def table_to_pandas():
+    N = 10_000_000
+    ht = hl.utils.range_table(N)
+    ht = ht.annotate(x=hl.float64(ht.idx) / 2, y=ht.idx % 3 == 0)
+    ht.to_pandas()
+
+
+@benchmark
+def table_from_pandas():
+    import numpy as np
+    import pandas as pd
+    N = 10_000_000
+    df = pd.DataFrame({'idx': np.arange(N, dtype=np.int32),
+                       'x': np.arange(N) / 2,
+                       'y': np.arange(N) % 3 == 0})
+    hl.Table.from_pandas(df, key='idx')._force_count()
@@ -0,0 +1,39 @@
+import hail as hl
+from hail.expr.type_parsing import parse_type
+from benchmark.utils import benchmark
+
+
+def _wide_vcf_row_type(n_info_fields):
+    # a VEP-annotated VCF row with many INFO fields
+    transcript_consequence = hl.tstruct(
+        allele_num=hl.tint32, amino_acids=hl.tstr, biotype=hl.tstr, canonical=hl.tint32,
+        cdna_start=hl.tint32, cdna_end=hl.tint32, codons=hl.tstr, consequence_terms=hl.tarray(hl.tstr),
+        distance=hl.tint32, domains=hl.tarray(hl.tstruct(db=hl.tstr, name=hl.tstr)),
+        gene_id=hl.tstr, gene_symbol=hl.tstr, hgvsc=hl.tstr, hgvsp=hl.tstr, impact=hl.tstr,
+        polyphen_score=hl.tfloat64, sift_score=hl.tfloat64, transcript_id=hl.tstr)
+    vep = hl.tstruct(
+        assembly_name=hl.tstr, allele_string=hl.tstr, end=hl.tint32, id=hl.tstr, input=hl.tstr,
+        most_severe_consequence=hl.tstr, seq_region_name=hl.tstr, start=hl.tint32, strand=hl.tint32,
+        transcript_consequences=hl.tarray(transcript_consequence),
+        regulatory_feature_consequences=hl.tarray(hl.tstruct(
+            allele_num=hl.tint32, biotype=hl.tstr, consequence_terms=hl.tarray(hl.tstr),
+            impact=hl.tstr, regulatory_feature_id=hl.tstr)))
+    info_types = [hl.tint32, hl.tfloat64, hl.tstr, hl.tarray(hl.tint32), hl.tarray(hl.tfloat64), hl.tbool]
+    info = hl.tstruct(**{f'INFO_FIELD_{i}': info_types[i % len(info_types)] for i in range(n_info_fields)})
+    return hl.tstruct(
+        locus=hl.tstr, alleles=hl.tarray(hl.tstr), rsid=hl.tstr, qual=hl.tfloat64,
+        filters=hl.tset(hl.tstr), info=info, vep=vep)
+
+
+@benchmark
+def parse_wide_schema():
+    s = str(_wide_vcf_row_type(5_000))
+    for i in range(10):
+        parse_type(s)
+
+
+@benchmark
+def parse_wide_schema_interned():
+    s = str(_wide_vcf_row_type(5_000))
+    for i in range(1_000):
+        hl.dtype(s)
@@ -1,32 +1,178 @@
+import collections
+import concurrent.futures
+import gzip
+import hashlib
+import json
+import os
+import threading
+import uuid
+import zlib
+
 import hail as hl
 
+from hail.backend.backend import _encode_result, _encoded_result_mime_type, _chunk_size
 from hail.utils.java import Env, info
 
 import logging
 import flask
 
-hl.init()
-
 app = flask.Flask('hail-apiserver')
+log = logging.getLogger('hail-apiserver')
+
+# responses smaller than this are not worth compressing
+compress_threshold = 1024
+
+# queries run on a fixed pool of worker threads, so a slow query holds up
+# only its own worker; requests beyond the pool size wait in the queue
+n_workers = int(os.environ.get('HAIL_APISERVER_WORKERS', 4))
+executor = concurrent.futures.ThreadPoolExecutor(max_workers=n_workers,
+                                                 thread_name_prefix='hail-query')
+
+# seconds a query may run before it is cancelled, unless the request sets
+# the X-Hail-Timeout header
+default_timeout = float(os.environ.get('HAIL_APISERVER_TIMEOUT', 600))
+
+# parsed queries, keyed by the SHA-256 of their text, least recently used
+# first
+plans = collections.OrderedDict()
+plans_max_size = int(os.environ.get('HAIL_APISERVER_PLAN_CACHE_SIZE', 256))
+plans_lock = threading.Lock()
+
+# futures of queued and running queries, by request id
+running = {}
+cancelled = set()
+running_lock = threading.Lock()
+
+
+def _plan(code):
+    digest = hashlib.sha256(code.encode('utf-8')).hexdigest()
+    with plans_lock:
+        plan = plans.get(digest)
+        if plan is not None:
+            plans.move_to_end(digest)
+    if plan is not None:
+        return digest, plan, True
+    jir = Env.hail().expr.ir.IRParser.parse_value_ir(code, {}, {})
+    plan = (jir, hl.dtype(jir.typ().toString()))
+    with plans_lock:
+        plans[digest] = plan
+        plans.move_to_end(digest)
+        while len(plans) > plans_max_size:
+            plans.popitem(last=False)
+    return digest, plan, False
+
+
+def _run(request_id, code, encoded):
+    digest, (jir, typ), cached = _plan(code)
+    info(f'execute {request_id}: plan {digest[:12]}, {len(code)} characters'
+         f'{", cached" if cached else ""}')
+    interpret = Env.hail().expr.ir.Interpret
+    if encoded:
+        return typ, interpret.interpretEncodedChunks(jir, request_id, _chunk_size)
+    return typ, interpret.interpretJSON(jir, request_id)
+
+
+def _cancel(request_id):
+    with running_lock:
+        future = running.get(request_id)
+        if future is None:
+            return False
+        cancelled.add(request_id)
+    # a query still in the queue never starts; a running one has its Spark
+    # jobs cancelled and fails
+    if not future.cancel():
+        Env.hail().expr.ir.Interpret.cancelJobGroup(request_id)
+    return True
+
+
+def _encoded_chunks(typ, chunks):
+    # the framing of _encode_result, then the encoding a chunk at a time from
+    # the JVM
+    yield _encode_result(typ, b'')
+    while chunks.hasNext():
+        yield chunks.next()
+
+
+def _slices(data):
+    for i in range(0, len(data), _chunk_size):
+        yield data[i:i + _chunk_size]
+
+
+def _stream(chunks, compress):
+    if compress:
+        # wbits=31 writes a gzip header and trailer
+        c = zlib.compressobj(wbits=31)
+        for chunk in chunks:
+            chunk = c.compress(chunk)
+            if chunk:
+                yield chunk
+        yield c.flush()
+    else:
+        yield from chunks
+
+
+def _error(status, message):
+    return flask.jsonify({'error': message}), status
+
 
 @app.route('/execute', methods=['POST'])
 def execute():
-    code = flask.request.json
-    
-    info(f'execute: {code}')
-    
-    jir = Env.hail().expr.ir.IRParser.parse_value_ir(code, {}, {})
-    
-    typ = hl.dtype(jir.typ().toString())
-    value = Env.hail().expr.ir.Interpret.interpretPyIR(code, {}, {})
-
-    result = {
-        'type': str(typ),
-        'value': value
-    }
-    
-    info(f'result: {result}')
-    
-    return flask.jsonify(result)
-
-app.run(threaded=False, host='0.0.0.0')
+    body = flask.request.get_data()
+    if flask.request.headers.get('Content-Encoding') == 'gzip':
+        body = gzip.decompress(body)
+    code = json.loads(body)
+    log.debug(f'query: {code}')
+
+    request_id = flask.request.headers.get('X-Hail-Request-Id') or uuid.uuid4().hex
+    timeout = float(flask.request.headers.get('X-Hail-Timeout', default_timeout))
+    encoded = _encoded_result_mime_type in flask.request.headers.get('Accept', '')
+
+    with running_lock:
+        if request_id in running:
+            return _error(409, f'request {request_id} is already running')
+        future = executor.submit(_run, request_id, code, encoded)
+        running[request_id] = future
+
+    try:
+        typ, result = future.result(timeout=timeout)
+    except concurrent.futures.TimeoutError:
+        _cancel(request_id)
+        info(f'execute {request_id}: timed out after {timeout}s')
+        return _error(504, f'query timed out after {timeout}s')
+    except Exception:
+        if request_id in cancelled:
+            info(f'execute {request_id}: cancelled')
+            return _error(409, 'query cancelled')
+        raise
+    finally:
+        with running_lock:
+            del running[request_id]
+            cancelled.discard(request_id)
+
+    if encoded:
+        n_bytes = result.nBytes()
+        compress = ('gzip' in flask.request.headers.get('Accept-Encoding', '')
+                    and n_bytes > compress_threshold)
+        headers = {'Content-Encoding': 'gzip'} if compress else {}
+        info(f'execute {request_id}: {typ}, {n_bytes} bytes')
+        return flask.Response(_stream(_encoded_chunks(typ, result), compress),
+                              mimetype=_encoded_result_mime_type,
+                              headers=headers)
+
+    info(f'execute {request_id}: {typ}, {len(result)} characters')
+    log.debug(f'result: {result}')
+    # the value is already JSON text, so splice it in rather than reparsing it
+    data = f'{{"type": {json.dumps(str(typ))}, "value": {result}}}'.encode('utf-8')
+    return flask.Response(_slices(data), mimetype='application/json')
+
+
+@app.route('/execute/<request_id>', methods=['DELETE'])
+def cancel(request_id):
+    if not _cancel(request_id):
+        return _error(404, f'no running request {request_id}')
+    return '', 204
+
+
+if __name__ == '__main__':
+    hl.init()
+    app.run(threaded=True, host='0.0.0.0')
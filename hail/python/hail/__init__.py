@@ -31,10 +31,6 @@ from .genetics import *
 from .methods import *
 from . import genetics as genetics
 from . import methods as methods
-from . import stats as stats
-from . import linalg as linalg
-from . import plot as plot
-from . import experimental as experimental
 from . import ir as ir
 from hail.expr import aggregators as agg
 from hail.utils import Struct, Interval, hadoop_copy, hadoop_open, hadoop_ls, \
@@ -92,6 +88,31 @@ del builtins
 
 __version__ = None  # set in hail.init()
 
+# subpackages with heavy dependencies (scipy, pandas, bokeh) are imported on
+# first access, so that `import hail` stays fast
+_lazy_submodules = ('stats', 'linalg', 'plot', 'experimental')
+
+import sys
+import types
+
+
+class _HailModule(types.ModuleType):
+    # a module-level __getattr__ requires Python 3.7. Builtins such as `set`
+    # are shadowed by expression functions in this module, so avoid them.
+    def __getattr__(self, name):
+        if name in _lazy_submodules:
+            import importlib
+            return importlib.import_module(f'{__name__}.{name}')
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    def __dir__(self):
+        names = super().__dir__()
+        return names + [name for name in _lazy_submodules if name not in names]
+
+
+sys.modules[__name__].__class__ = _HailModule
+del sys, types
+
 import warnings
 
 warnings.filterwarnings('once', append=True)
@@ -1,19 +1,184 @@
 import abc
+import gzip
+import json
+import struct
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 from hail.utils.java import *
-from hail.expr.types import dtype
+from hail.utils import action_metrics
+from hail.expr.types import dtype, tarray
 from hail.expr.table_type import *
 from hail.expr.matrix_type import *
+from hail.ir.base_ir import BaseIR, structurally_equal
+from hail.ir.optimizer import optimize
 from hail.ir.renderer import Renderer
+from hail.backend import events
 from hail.table import Table
 
-import pyspark
+class PlanCache(object):
+    """Bounded LRU cache of parsed backend IR, keyed by Python IR.
+
+    Keys are compared structurally (see :meth:`.BaseIR.__hash__` and
+    :func:`.structurally_equal`), so a query rebuilt with the same shape, such
+    as the same aggregation run repeatedly, is rendered and parsed once. Table
+    and matrix nodes compare by identity, so cached plans never outlive the
+    datasets they read. Keys other than IR compare with ``==``.
+    """
+
+    def __init__(self, max_size=256):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._plans = OrderedDict()
+
+    def get(self, ir):
+        key = _plan_key(ir)
+        jir = self._plans.get(key)
+        if jir is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._plans.move_to_end(key)
+        return jir
+
+    def put(self, ir, jir):
+        if self.max_size <= 0:
+            return
+        key = _plan_key(ir)
+        self._plans[key] = jir
+        self._plans.move_to_end(key)
+        while len(self._plans) > self.max_size:
+            self._plans.popitem(last=False)
+
+    def clear(self):
+        self._plans.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._plans), 'max_size': self.max_size}
+
+    def __len__(self):
+        return len(self._plans)
+
+
+def _plan_key(x):
+    # IR's __eq__ is recursive, so IR keys are wrapped to compare iteratively
+    return _PlanKey(x) if isinstance(x, BaseIR) else x
+
+
+class _PlanKey(object):
+    __slots__ = ['ir', '_hash']
+
+    def __init__(self, ir):
+        self.ir = ir
+        self._hash = hash(ir)
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        return isinstance(other, _PlanKey) and structurally_equal(self.ir, other.ir)
+
+
+class EncodedLiteralCache(object):
+    """Bounded LRU cache of large literals sent to the backend in binary.
+
+    Keys are the type and the digest of the encoded value, memoized on the
+    :class:`.Literal`, so a literal used by many queries, such as a set of
+    variant IDs to filter to, crosses the gateway and is decoded once.
+    """
+
+    def __init__(self, max_size=32):
+        self.max_size = max_size
+        self._literals = OrderedDict()
+
+    def get(self, literal):
+        key = (literal.dtype, literal._encoded_digest())
+        jir = self._literals.get(key)
+        if jir is None:
+            encoding = literal.dtype._to_encoding(literal.value)
+            jir = Env.hail().backend.EncodedLiteral.apply(literal.dtype._parsable_string(), encoding)
+            self._literals[key] = jir
+            while len(self._literals) > self.max_size:
+                self._literals.popitem(last=False)
+        self._literals.move_to_end(key)
+        return jir
+
+    def clear(self):
+        self._literals.clear()
+
+    def __len__(self):
+        return len(self._literals)
+
 
 class Backend(object):
+    # number of actions submitted with execute_async that may run at once
+    max_concurrent_actions = 8
+
+    # whether to simplify IR with hail.ir.optimize before rendering it
+    optimize_ir = True
+
+    def __init__(self):
+        self.plan_cache = PlanCache()
+        self.literal_cache = EncodedLiteralCache()
+        self._executor = None
+
+    def _to_java_ir(self, ir):
+        if not hasattr(ir, '_jir'):
+            jir = self.plan_cache.get(ir)
+            if jir is None:
+                x = ir
+                if self.optimize_ir:
+                    with events.span('optimize'):
+                        x = optimize(ir)
+                with events.span('render') as span:
+                    r = Renderer(stop_at_jir=True, literal_cache=self.literal_cache)
+                    code = r(x)
+                    span.attrs['ir_size'] = len(code)
+                with events.span('parse'):
+                    # FIXME parse should be static
+                    jir = ir.parse(code, ir_map=r.jirs)
+                self.plan_cache.put(ir, jir)
+            ir._jir = jir
+        return ir._jir
+
+    def _decode(self, typ, encoding, decoder=None):
+        with events.span('decode', result_size=len(encoding)):
+            return _decode_value(typ, encoding, decoder)
+
     @abc.abstractmethod
-    def execute(self, ir):
+    def execute(self, ir, decoder=None):
+        """Execute `ir` and return its value.
+
+        The result is decoded from Hail's binary encoding with
+        ``decoder(typ, encoding)`` if given, for instance to decode columns
+        straight into numpy arrays, and into Python values otherwise.
+        """
         return
 
+    def execute_async(self, ir):
+        """Submit `ir` for execution and return immediately.
+
+        Returns a :class:`concurrent.futures.Future` holding the result of
+        :meth:`execute`. Up to :attr:`max_concurrent_actions` submitted IRs
+        run at once; the rest wait their turn.
+        """
+        return self._submit(self.execute, ir)
+
+    def _submit(self, f, *args):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_concurrent_actions,
+                                                thread_name_prefix='hail-action')
+        return self._executor.submit(action_metrics._bind_call_site(f), *args)
+
+    def stop(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
     @abc.abstractmethod
     def table_read_type(self, table_read_ir):
         return
@@ -24,18 +189,25 @@ class Backend(object):
 
 
 class SparkBackend(Backend):
-    def _to_java_ir(self, ir):
-        if not hasattr(ir, '_jir'):
-            r = Renderer(stop_at_jir=True)
-            code = r(ir)
-            # FIXME parse should be static
-            ir._jir = ir.parse(code, ir_map=r.jirs)
-        return ir._jir
+    def execute(self, ir, decoder=None):
+        with events.span('execute'), action_metrics._call_site():
+            return self._execute(self._to_java_ir(ir), ir.typ, decoder)
+
+    def execute_async(self, ir):
+        # render, parse and type on the calling thread, so only the JVM call
+        # runs on the pool; each pool thread has its own gateway connection
+        # and Spark schedules the resulting jobs concurrently
+        return self._submit(self._execute, self._to_java_ir(ir), ir.typ)
 
-    def execute(self, ir):
-        return ir.typ._from_json(
-            Env.hail().expr.ir.Interpret.interpretJSON(
-                self._to_java_ir(ir)))
+    def _execute(self, jir, typ, decoder=None):
+        interpret = Env.hail().expr.ir.Interpret
+        if not events.active():
+            return _decode_value(typ, interpret.interpretEncoded(jir), decoder)
+        with events.span('jvm') as span:
+            result = interpret.interpretEncodedTimed(jir)
+            encoding = result.value()
+        events.emit_jvm_timings(span.start, result.timings())
+        return self._decode(typ, encoding, decoder)
 
     def table_read_type(self, tir):
         jir = self._to_java_ir(tir)
@@ -45,55 +217,194 @@ class SparkBackend(Backend):
         jir = self._to_java_ir(mir)
         return tmatrix._from_java(jir.typ())
 
+    def iter_batches(self, t, batch_size, decoder=None):
+        batch_type = tarray(t.row.dtype)
+        it = Env.hail().backend.EncodedRowIterator(self._to_java_ir(t._tir), batch_size)
+        while it.hasNext():
+            yield self._decode(batch_type, it.next(), decoder)
+
     def from_spark(self, df, key):
         return Table._from_java(Env.hail().table.Table.fromDF(Env.hc()._jhc, df._jdf, key))
 
     def to_spark(self, t, flatten):
+        import pyspark
         t = t.expand_types()
         if flatten:
             t = t.flatten()
         return pyspark.sql.DataFrame(t._jt.toDF(Env.hc()._jsql_context), Env.sql_context())
 
-    def to_pandas(self, t, flatten):
-        return self.to_spark(t, flatten).toPandas()
-
-    def from_pandas(self, df, key):
-        return Table.from_spark(Env.sql_context().createDataFrame(df), key)
-
 class LocalBackend(Backend):
+    """Experimental backend that runs queries in the JVM without Spark jobs
+    where it can. Table operations are lowered to array operations; queries
+    using operations that cannot be lowered yet, such as reading or writing
+    datasets, run on Spark as with :class:`.SparkBackend`. A SparkContext is
+    still required.
+    """
+
     def __init__(self):
-        pass
+        super().__init__()
 
-    def _to_java_ir(self, ir):
-        if not hasattr(ir, '_jir'):
-            r = Renderer(stop_at_jir=True)
-            code = r(ir)
-            # FIXME parse should be static
-            ir._jir = ir.parse(code, ir_map=r.jirs)
-        return ir._jir
+    def execute(self, ir, decoder=None):
+        with events.span('execute'):
+            return self._execute(self._to_java_ir(ir), ir.typ, decoder)
+
+    def execute_async(self, ir):
+        return self._submit(self._execute, self._to_java_ir(ir), ir.typ)
+
+    def _execute(self, jir, typ, decoder=None):
+        with events.span('jvm'):
+            encoding = Env.hail().backend.local.LocalBackend.executeEncoded(jir)
+        return self._decode(typ, encoding, decoder)
+
+    def table_read_type(self, tir):
+        jir = self._to_java_ir(tir)
+        return ttable._from_java(jir.typ())
 
-    def execute(self, ir):
-        return ir.typ._from_json(
-            Env.hail().expr.ir.LocalBackend.executeJSON(
-                self._to_java_ir(ir)))
+    def matrix_read_type(self, mir):
+        jir = self._to_java_ir(mir)
+        return tmatrix._from_java(jir.typ())
 
 class ServiceBackend(Backend):
-    def __init__(self, host, port=80, scheme='http'):
+    """Backend that sends queries to a Hail API server over HTTP.
+
+    Requests reuse pooled keep-alive connections. Query text larger than
+    `compress_threshold` bytes is sent gzip-compressed. Results come back in
+    Hail's binary value encoding rather than JSON, and are read in chunks as
+    they arrive, with the encoding's block framing stripped on the way, so the
+    encoded result is held once. The server compresses them when they are
+    large.
+
+    The server cancels a query that runs longer than `timeout` seconds, or
+    its own default if `timeout` is ``None``. A query interrupted on the
+    client, for instance with Ctrl-C, is cancelled on the server too.
+    """
+
+    def __init__(self, host, port=80, scheme='http', pool_size=10, compress_threshold=1024, timeout=None):
+        import requests
+        import requests.adapters
+
+        super().__init__()
         self.scheme = scheme
         self.host = host
         self.port = port
+        self.compress_threshold = compress_threshold
+        self.timeout = timeout
+        self.url = f'{scheme}://{host}:{port}'
+
+        self._session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self._session.mount(f'{scheme}://', adapter)
+        self._session.headers.update({'Accept': f'{_encoded_result_mime_type}, application/json',
+                                      'Accept-Encoding': 'gzip'})
+
+    def execute(self, ir, decoder=None):
+        with events.span('execute'):
+            return self._execute(ir, decoder)
+
+    def _execute(self, ir, decoder=None):
+        if self.optimize_ir:
+            with events.span('optimize'):
+                ir = optimize(ir)
+        with events.span('render') as span:
+            r = Renderer(stop_at_jir=True)
+            code = r(ir)
+            assert len(r.jirs) == 0
+            span.attrs['ir_size'] = len(code)
+
+        body = json.dumps(code).encode('utf-8')
+        request_id = uuid.uuid4().hex
+        headers = {'Content-Type': 'application/json', 'X-Hail-Request-Id': request_id}
+        if self.timeout is not None:
+            headers['X-Hail-Timeout'] = str(self.timeout)
+        if len(body) > self.compress_threshold:
+            body = gzip.compress(body)
+            headers['Content-Encoding'] = 'gzip'
+
+        try:
+            with events.span('request', request_size=len(body)):
+                resp = self._session.post(f'{self.url}/execute', data=body, headers=headers, stream=True)
+        except KeyboardInterrupt:
+            self._session.delete(f'{self.url}/execute/{request_id}')
+            raise
+
+        with resp, events.span('decode'):
+            resp.raise_for_status()
+            if resp.headers.get('Content-Type', '').startswith(_encoded_result_mime_type):
+                return _decode_encoded_result(resp.iter_content(chunk_size=_chunk_size), decoder)
+
+            # servers predating the binary encoding answer with JSON
+            resp_json = resp.json()
+            value = dtype(resp_json['type'])._from_json(resp_json['value'])
+            if decoder is not None:
+                typ = dtype(resp_json['type'])
+                value = decoder(typ, typ._to_encoding(value))
+            return value
+
+    def stop(self):
+        super().stop()
+        self._session.close()
+
+
+_encoded_result_mime_type = 'application/vnd.hail.encoded-result'
+_chunk_size = 64 * 1024
+
+
+def _encode_result(typ, encoding):
+    """Frame a result for transfer: the length of the type string as a
+    4-byte little-endian integer, the UTF-8 type string, then the value in
+    Hail's binary encoding."""
+    t = str(typ).encode('utf-8')
+    return struct.pack('<i', len(t)) + t + encoding
+
+
+def _decode_value(typ, encoding, decoder):
+    if decoder is None:
+        return typ._from_encoding(encoding)
+    return decoder(typ, encoding)
+
+
+def _decode_encoded_result(chunks, decoder=None):
+    """Decode a result framed by :func:`_encode_result` from the chunks of a
+    response. The length-prefixed blocks of the encoding are copied into one
+    buffer as the chunks arrive, framed as a single block, so the decoder
+    reads them in place rather than joining them into a second copy."""
+    stream = _ChunkStream(chunks)
+    n = struct.unpack('<i', stream.read(4))[0]
+    typ = dtype(stream.read(n).decode('utf-8'))
+    # the first 4 bytes are the length of the single block, filled in below
+    buf = bytearray(4)
+    while not stream.at_end():
+        stream.read_into(buf, struct.unpack('<i', stream.read(4))[0])
+    struct.pack_into('<i', buf, 0, len(buf) - 4)
+    return _decode_value(typ, memoryview(buf), decoder)
+
+
+class _ChunkStream(object):
+    """Reads byte strings of any length from an iterator of chunks."""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._chunk = memoryview(b'')
+
+    def at_end(self):
+        while not self._chunk:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return True
+            self._chunk = memoryview(chunk)
+        return False
+
+    def read_into(self, buf, n):
+        """Append the next `n` bytes to the :obj:`bytearray` `buf`."""
+        while n > 0:
+            if self.at_end():
+                raise EOFError('truncated result')
+            k = min(n, len(self._chunk))
+            buf += self._chunk[:k]
+            self._chunk = self._chunk[k:]
+            n -= k
 
-    def execute(self, ir):
-        r = Renderer(stop_at_jir=True)
-        code = r(ir)
-        assert len(r.jirs) == 0
-        
-        resp = requests.post(f'http://hail-apiserver:5000/execute', json=code)
-        resp.raise_for_status()
-        
-        resp_json = resp.json()
-        
-        typ = dtype(resp_json['type'])
-        result = resp_json['value']
-        
-        return typ._from_json(result)
+    def read(self, n):
+        buf = bytearray()
+        self.read_into(buf, n)
+        return bytes(buf)
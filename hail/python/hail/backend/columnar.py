@@ -0,0 +1,279 @@
+"""Columnar conversion between tables and pandas DataFrames.
+
+Rows are collected as a struct of arrays, one array per field, so each column
+arrives contiguously in Hail's binary encoding. Columns of fixed-width values
+are decoded by :func:`numpy.frombuffer` in one step rather than value by
+value. In the other direction, each column is sent to the backend as a binary
+encoded literal and the columns are zipped into rows there. Neither direction
+goes through Spark SQL.
+"""
+
+import math
+
+import hail as hl
+from hail.expr.expressions import construct_expr, impute_type
+from hail.expr.types import tarray, tbool, tfloat32, tfloat64, tint32, tint64, tstr, tstruct, ttuple
+from hail.ir import ArrayMap, GetField, Let, Literal, MakeStruct, Ref, TableCollect
+from hail.utils.byte_reader import ByteReader
+from hail.utils.java import Env
+
+_numpy_dtypes = {'i': '<i4', 'q': '<i8', 'f': '<f4', 'd': '<f8', '?': '?'}
+
+_numpy_types = (tint32, tint64, tfloat32, tfloat64, tbool)
+
+
+def collect_columns(t):
+    """Collect the rows of `t` as a :obj:`dict` from each row field to a
+    :class:`numpy.ndarray` of its values, or a :obj:`list` for fields that
+    are not numeric or boolean."""
+    return _collect(t, _read_column)
+
+
+def expr_columns(expr):
+    """Collect the fields of the struct expression `expr`, as by
+    :func:`collect_columns`."""
+    return collect_columns(_fields_table(expr))
+
+
+def _fields_table(expr):
+    uid = Env.get_uid()
+    t = expr._to_table(uid).key_by()
+    return t.select(**{f: t[uid][f] for f in expr.dtype})
+
+
+def _collect(t, read_column):
+    rows = Env.get_uid()
+    row = Env.get_uid()
+    ir = Let(rows, GetField(TableCollect(t._tir), 'rows'),
+             MakeStruct([(f, ArrayMap(Ref(rows), row, GetField(Ref(row), f))) for f in t.row]))
+
+    def decode(typ, encoding):
+        reader = ByteReader.from_encoding(encoding)
+        # the result tuple and the struct of columns are never missing
+        reader.read_missing_bits(1)
+        reader.read_missing_bits(len(typ))
+        return {f: read_column(reader, ct.element_type) for f, ct in typ.items()}
+
+    return Env.backend().execute(ir, decoder=decode)
+
+
+def _read_missing(reader, n):
+    import numpy as np
+
+    bits = np.frombuffer(reader.read_bytes((n + 7) >> 3), dtype=np.uint8)
+    # missing bits are little-endian within each byte
+    return np.unpackbits(bits).reshape(-1, 8)[:, ::-1].ravel()[:n].astype(bool)
+
+
+def _read_packed(reader, element_type, n):
+    import numpy as np
+
+    fmt, size = element_type._packed_format
+    return np.frombuffer(reader.read_bytes(size * n), dtype=_numpy_dtypes[fmt])
+
+
+def _read_column(reader, element_type):
+    import numpy as np
+
+    if element_type._packed_format is None:
+        n = reader.read_int32()
+        missing = _read_missing(reader, n)
+        return [None if m else element_type._convert_from_encoding(reader) for m in missing.tolist()]
+
+    values, missing = _read_packed_column(reader, element_type)
+    if not missing.any():
+        return values
+    if values.dtype == np.bool_:
+        column = values.astype(object)
+        column[missing] = None
+        return column
+    # as in pandas, missing integers make the column floating point
+    column = values.astype(np.float32 if values.dtype == np.float32 else np.float64)
+    column[missing] = np.nan
+    return column
+
+
+def _read_packed_column(reader, element_type):
+    """Read an array of fixed-width values. Returns the values, zero where
+    missing, and the missing mask."""
+    import numpy as np
+
+    n = reader.read_int32()
+    missing = _read_missing(reader, n)
+    n_defined = n - int(missing.sum())
+    defined = _read_packed(reader, element_type, n_defined)
+    if n_defined == n:
+        return defined.copy(), missing
+    values = np.zeros(n, dtype=defined.dtype)
+    values[~missing] = defined
+    return values, missing
+
+
+def collect_numpy(expr):
+    """See :meth:`.Expression.collect_numpy`."""
+    import numpy as np
+
+    if isinstance(expr.dtype, tstruct):
+        fields = list(expr.dtype)
+        struct = expr
+    elif isinstance(expr.dtype, ttuple):
+        fields = [f'f{i}' for i in range(len(expr.dtype))]
+        struct = hl.struct(**{f: expr[i] for i, f in enumerate(fields)})
+    else:
+        fields = None
+        struct = hl.struct(value=expr)
+    for f, t in struct.dtype.items():
+        if t not in _numpy_types:
+            field = '' if fields is None else f" of field '{f}'"
+            raise TypeError(f"'collect_numpy': expected a numeric or boolean expression, or a struct or tuple "
+                            f"of them, found type '{t}'{field}")
+
+    columns = _collect(_fields_table(struct), _read_packed_column)
+    for f, (values, missing) in columns.items():
+        if missing.any():
+            if values.dtype.kind != 'f':
+                field = '' if fields is None else f" of field '{f}'"
+                raise ValueError(f"'collect_numpy': missing value{field} at index {int(np.argmax(missing))}; "
+                                 f"only floating-point values may be missing")
+            values[missing] = np.nan
+
+    if fields is None:
+        return columns['value'][0]
+    n = len(columns[fields[0]][0]) if fields else 0
+    a = np.empty(n, dtype=[(f, columns[f][0].dtype) for f in fields])
+    for f in fields:
+        a[f] = columns[f][0]
+    return a
+
+
+def to_pandas(t, flatten):
+    import pandas as pd
+
+    if flatten:
+        t = t.expand_types().flatten()
+    else:
+        t = t.key_by()
+    columns = collect_columns(t)
+    return pd.DataFrame(columns, columns=list(t.row))
+
+
+def _is_missing(x):
+    return x is None or (isinstance(x, float) and math.isnan(x))
+
+
+def _column_type(name, column):
+    dtype = column.dtype
+    if dtype.kind == 'b':
+        return tbool
+    if dtype.kind == 'i' and dtype.itemsize <= 4 or dtype.kind == 'u' and dtype.itemsize <= 2:
+        return tint32
+    if dtype.kind == 'i' or dtype.kind == 'u' and dtype.itemsize <= 4:
+        return tint64
+    if dtype.kind == 'f':
+        return tfloat32 if dtype.itemsize <= 4 else tfloat64
+    if dtype.kind == 'O':
+        values = [x for x in column if not _is_missing(x)]
+        if all(isinstance(x, str) for x in values):
+            return tstr
+        try:
+            return impute_type(values).element_type
+        except Exception as e:
+            raise TypeError(f"'from_pandas': cannot impute the type of column '{name}'") from e
+    raise TypeError(f"'from_pandas': column '{name}' has unsupported type '{dtype}'")
+
+
+def _column_expr(name, column):
+    t = _column_type(name, column)
+    if column.dtype.kind != 'O':
+        values = column.tolist()
+    elif t == tstr:
+        values = [None if _is_missing(x) else x for x in column]
+    else:
+        return hl.literal([None if _is_missing(x) else x for x in column], tarray(t))
+    # the values already have the column's type, so skip literal's checks
+    return construct_expr(Literal(tarray(t), values), tarray(t))
+
+
+def from_pandas(df, key):
+    columns = [(str(name), _column_expr(name, df[name])) for name in df.columns]
+    rows = hl.range(0, len(df)).map(lambda i: hl.struct(**{f: c[i] for f, c in columns}))
+    t = hl.Table.parallelize(rows)
+    if isinstance(key, str):
+        key = [key]
+    if key:
+        t = t.key_by(*key)
+    return t
+
+
+_entry_types = {'int8': tint32, 'int32': tint32, 'int64': tint64, 'float32': tfloat32, 'float64': tfloat64}
+
+
+def entry_blocks(mt, entry_expr, block_size, dtype, missing):
+    """Iterate over blocks of at most `block_size` rows of the entries of
+    `entry_expr`, as 2-dimensional numpy arrays. See
+    :meth:`.MatrixTable.iter_numpy_blocks`."""
+    import numpy as np
+
+    dtype = np.dtype(dtype).name
+    if dtype not in _entry_types:
+        raise ValueError(f"'dtype' must be one of {', '.join(_entry_types)}, found '{dtype}'")
+    if missing in ('nan', 'mean') and np.dtype(dtype).kind != 'f':
+        raise ValueError(f"missing='{missing}' requires a floating point 'dtype', found '{dtype}'; use missing='mask'")
+
+    if entry_expr.dtype == hl.tcall:
+        entry_expr = entry_expr.n_alt_alleles()
+    t = _entry_types[dtype]
+    entry_expr = hl.int32(entry_expr) if t == tint32 else hl.int64(entry_expr) if t == tint64 else \
+        hl.float32(entry_expr) if t == tfloat32 else hl.float64(entry_expr)
+
+    x = Env.get_uid()
+    entries = Env.get_uid()
+    ht = mt.select_entries(**{x: entry_expr})._localize_entries(entries, Env.get_uid())
+    ht = ht.key_by()
+    ht = ht.select(**{x: ht[entries].map(lambda e: e[x])})
+
+    def decode(typ, encoding):
+        return _read_entry_block(encoding, t, dtype, missing)
+
+    return Env.spark_backend('iter_numpy_blocks').iter_batches(ht, block_size, decode)
+
+
+def _read_entry_block(encoding, element_type, dtype, missing):
+    import numpy as np
+
+    reader = ByteReader.from_encoding(encoding)
+    # the result tuple, the batch's rows and the arrays of entries are never
+    # missing
+    reader.read_missing_bits(1)
+    n_rows = reader.read_int32()
+    _read_missing(reader, n_rows)
+    values = None
+    for i in range(n_rows):
+        reader.read_missing_bits(1)
+        n_cols = reader.read_int32()
+        if values is None:
+            values = np.empty((n_rows, n_cols), dtype=_numpy_dtypes[element_type._packed_format[0]])
+            mask = np.zeros((n_rows, n_cols), dtype=bool)
+        m = _read_missing(reader, n_cols)
+        n_defined = n_cols - int(m.sum())
+        if n_defined == n_cols:
+            values[i] = _read_packed(reader, element_type, n_cols)
+        else:
+            values[i, ~m] = _read_packed(reader, element_type, n_defined)
+            values[i, m] = 0
+            mask[i] = m
+    if values is None:
+        values = np.empty((0, 0), dtype=dtype)
+        mask = np.zeros((0, 0), dtype=bool)
+
+    values = values.astype(dtype, copy=False)
+    if missing == 'mask':
+        return np.ma.masked_array(values, mask=mask)
+    if missing == 'mean':
+        n_defined = (~mask).sum(axis=1, keepdims=True)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = (values.sum(axis=1, keepdims=True) / n_defined).astype(dtype)
+        values = np.where(mask, means, values)
+    else:
+        values[mask] = np.nan
+    return values
@@ -0,0 +1,86 @@
+import json
+import threading
+import time
+
+_hooks = []
+
+
+class Span(object):
+    """A timed phase of query execution.
+
+    Attributes
+    ----------
+    name : :obj:`str`
+        The phase, such as ``'render'`` or ``'decode'``.
+    start : :obj:`float`
+        Start time in seconds, from :func:`time.perf_counter`.
+    duration : :obj:`float`
+        Duration in seconds.
+    attrs : :obj:`dict`
+        Details of the phase, such as the size of the rendered IR.
+    thread : :obj:`int`
+        Identifier of the thread that ran the phase.
+    """
+
+    __slots__ = ['name', 'start', 'duration', 'attrs', 'thread']
+
+    def __init__(self, name, start, duration, attrs, thread):
+        self.name = name
+        self.start = start
+        self.duration = duration
+        self.attrs = attrs
+        self.thread = thread
+
+    def __repr__(self):
+        return f'Span({self.name!r}, duration={self.duration:.6f}, attrs={self.attrs!r})'
+
+
+def add_hook(f):
+    """Call `f` with a :class:`.Span` for every phase of every query the
+    backend executes, until it is removed with :func:`.remove_hook`.
+
+    Hooks are called on the thread that ran the phase, which for actions
+    run with ``_async=True`` is not the main thread.
+    """
+    _hooks.append(f)
+
+
+def remove_hook(f):
+    _hooks.remove(f)
+
+
+def active():
+    return bool(_hooks)
+
+
+def emit(name, start, duration, **attrs):
+    s = Span(name, start, duration, attrs, threading.get_ident())
+    for f in list(_hooks):
+        f(s)
+
+
+class span(object):
+    """Time the enclosed block as the phase `name` if any hooks are
+    registered. Details only known inside the block, such as result sizes,
+    can be added to its `attrs`."""
+
+    __slots__ = ['name', 'attrs', 'start']
+
+    def __init__(self, name, **attrs):
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if _hooks:
+            emit(self.name, self.start, time.perf_counter() - self.start, **self.attrs)
+
+
+def emit_jvm_timings(start, timings):
+    """Emit the phases timed on the JVM, as recorded by ``ExecutionTimings``,
+    offset from `start`, the time the JVM call was made."""
+    for t in json.loads(timings):
+        emit(f'jvm_{t["name"]}', start + t['start'] / 1e9, t['duration'] / 1e9)
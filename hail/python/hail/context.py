@@ -1,20 +1,17 @@
-import pkg_resources
-from pyspark import SparkContext, SparkConf
-from pyspark.sql import SQLContext
-
 import hail
 from hail.genetics.reference_genome import ReferenceGenome
-from hail.typecheck import nullable, typecheck, typecheck_method, enumeration
-from hail.utils import wrap_to_list, get_env_or_default
+from hail.typecheck import nullable, typecheck, typecheck_method, enumeration, lazy_type
+from hail.utils import wrap_to_list, get_env_or_default, action_metrics
 from hail.utils.java import Env, joption, FatalError, connect_logger, install_exception_handler, uninstall_exception_handler
 from hail.backend import Backend, ServiceBackend, SparkBackend
 
+import logging
 import sys
 import os
 
 
 class HailContext(object):
-    @typecheck_method(sc=nullable(SparkContext),
+    @typecheck_method(sc=nullable(lazy_type('pyspark.SparkContext')),
                       app_name=str,
                       master=nullable(str),
                       local=str,
@@ -27,12 +24,20 @@ class HailContext(object):
                       default_reference=str,
                       idempotent=bool,
                       global_seed=nullable(int),
+                      record_action_metrics=bool,
+                      gateway_port=nullable(int),
+                      jvm_log_level=enumeration('DEBUG', 'INFO', 'WARN', 'ERROR'),
+                      jvm_logger=nullable(logging.Logger),
                       _backend=nullable(Backend))
     def __init__(self, sc=None, app_name="Hail", master=None, local='local[*]',
                  log=None, quiet=False, append=False,
                  min_block_size=1, branching_factor=50, tmp_dir=None,
                  default_reference="GRCh37", idempotent=False,
-                 global_seed=6348563392232659379, _backend=None):
+                 global_seed=6348563392232659379, record_action_metrics=False,
+                 gateway_port=None, jvm_log_level='INFO', jvm_logger=None, _backend=None):
+        import pkg_resources
+        from pyspark import SparkContext, SparkConf
+        from pyspark.sql import SQLContext
 
         if Env._hc:
             if idempotent:
@@ -41,7 +46,15 @@ class HailContext(object):
                 raise FatalError('Hail has already been initialized, restart session '
                                  'or stop Hail to change configuration.')
 
-        if pkg_resources.resource_exists(__name__, "hail-all-spark.jar"):
+        if gateway_port is None and 'HAIL_GATEWAY_PORT' in os.environ:
+            gateway_port = int(os.environ['HAIL_GATEWAY_PORT'])
+
+        if gateway_port is not None:
+            if sc is not None:
+                raise ValueError("cannot attach to a Hail gateway with an existing SparkContext 'sc'")
+            from hail.gateway import connect
+            SparkContext._ensure_initialized(gateway=connect(gateway_port))
+        elif pkg_resources.resource_exists(__name__, "hail-all-spark.jar"):
             hail_jar_path = pkg_resources.resource_filename(__name__, "hail-all-spark.jar")
             assert os.path.exists(hail_jar_path), f'{hail_jar_path} does not exist'
             sys.stderr.write(f'using hail jar at {hail_jar_path}\n')
@@ -83,7 +96,17 @@ class HailContext(object):
         # we always pass 'quiet' to the JVM because stderr output needs
         # to be routed through Python separately.
         # if idempotent:
-        if idempotent:
+        self._jsession = None
+        self._log_forwarder = None
+        if gateway_port is not None:
+            # the gateway's context is shared; everything specific to this
+            # process is kept in its session or in Python
+            self._jhc = self._hail.HailContext.get()
+            if self._jhc is None:
+                raise FatalError(f'the JVM on port {gateway_port} is not a Hail gateway')
+            self._jsession = self._hail.backend.HailGateway.openSession()
+            self._log = self._jhc.logFile()
+        elif idempotent:
             self._jhc = self._hail.HailContext.getOrCreate(
                 jsc, app_name, joption(master), local, log, True, append,
                 min_block_size, branching_factor, tmp_dir)
@@ -103,7 +126,11 @@ class HailContext(object):
         Env._hc = self
 
         self._default_ref = None
-        Env.hail().variant.ReferenceGenome.setDefaultReference(self._jhc, default_reference)
+        if self._jsession is None:
+            Env.hail().variant.ReferenceGenome.setDefaultReference(self._jhc, default_reference)
+        else:
+            self._default_ref = ReferenceGenome._from_java(
+                Env.hail().variant.ReferenceGenome.getReference(default_reference))
 
         jar_version = self._jhc.version()
 
@@ -114,12 +141,16 @@ class HailContext(object):
 
 
 
-        if not quiet:
+        if self._jsession is not None:
+            if not quiet:
+                sys.stderr.write(f'Attached to Hail gateway on port {gateway_port}, '
+                                 f'session {self._jsession.id()}\n')
+        elif not quiet:
             sys.stderr.write('Running on Apache Spark version {}\n'.format(self.sc.version))
             if self._jsc.uiWebUrl().isDefined():
                 sys.stderr.write('SparkUI available at {}\n'.format(self._jsc.uiWebUrl().get()))
 
-            connect_logger('localhost', 12888)
+            self._log_forwarder = connect_logger('localhost', 12888, jvm_log_level, jvm_logger)
 
             self._hail.HailContext.startProgressBar(self._jsc)
 
@@ -134,11 +165,14 @@ class HailContext(object):
                 sys.stderr.write('NOTE: This is a beta version. Interfaces may change\n'
                                  '  during the beta period. We recommend pulling\n'
                                  '  the latest changes weekly.\n')
-            sys.stderr.write(f'LOGGING: writing to {log}\n')
+            sys.stderr.write(f'LOGGING: writing to {self._log}\n')
 
         install_exception_handler()
         Env.set_seed(global_seed)
 
+        if record_action_metrics:
+            action_metrics._start(self)
+
     @property
     def default_reference(self):
         if not self._default_ref:
@@ -146,20 +180,45 @@ class HailContext(object):
         return self._default_ref
 
     def stop(self):
-        Env.hail().HailContext.clear()
-        self.sc.stop()
+        action_metrics._stop()
+        self._backend.stop()
+        if self._jsession is None:
+            Env.hail().HailContext.clear()
+            self.sc.stop()
+        else:
+            self._detach()
         self.sc = None
         Env._jvm = None
         Env._gateway = None
+        Env._hail_package = None
+        Env._jutils = None
         Env._hc = None
         uninstall_exception_handler()
         Env._dummy_table = None
         Env._seed_generator = None
 
+    def _detach(self):
+        # the gateway's Spark context keeps running for other processes
+        from pyspark import SparkContext
+
+        self._hail.backend.HailGateway.closeSession(self._jsession.id())
+        self._jsession = None
+        if self.sc._accumulatorServer:
+            self.sc._accumulatorServer.shutdown()
+        with SparkContext._lock:
+            SparkContext._active_spark_context = None
+            SparkContext._gateway = None
+            SparkContext._jvm = None
+        self._gateway.close()
+
+    def _temporary_file(self, n_char, prefix, suffix):
+        jtmp = self._jhc if self._jsession is None else self._jsession
+        return jtmp.getTemporaryFile(n_char, joption(prefix), joption(suffix))
+
     def upload_log(self):
         self._jhc.uploadLog()
 
-@typecheck(sc=nullable(SparkContext),
+@typecheck(sc=nullable(lazy_type('pyspark.SparkContext')),
            app_name=str,
            master=nullable(str),
            local=str,
@@ -172,12 +231,17 @@ class HailContext(object):
            default_reference=enumeration('GRCh37', 'GRCh38'),
            idempotent=bool,
            global_seed=nullable(int),
+           record_action_metrics=bool,
+           gateway_port=nullable(int),
+           jvm_log_level=enumeration('DEBUG', 'INFO', 'WARN', 'ERROR'),
+           jvm_logger=nullable(logging.Logger),
            _backend=nullable(Backend))
 def init(sc=None, app_name='Hail', master=None, local='local[*]',
          log=None, quiet=False, append=False,
          min_block_size=1, branching_factor=50, tmp_dir='/tmp',
          default_reference='GRCh37', idempotent=False,
-         global_seed=6348563392232659379, _backend=None):
+         global_seed=6348563392232659379, record_action_metrics=False,
+         gateway_port=None, jvm_log_level='INFO', jvm_logger=None, _backend=None):
     """Initialize Hail and Spark.
 
     Examples
@@ -243,10 +307,31 @@ def init(sc=None, app_name='Hail', master=None, local='local[*]',
         or ``'GRCm38'``.
     idempotent : :obj:`bool`
         If ``True``, calling this function is a no-op if Hail has already been initialized.
+    record_action_metrics : :obj:`bool`
+        If ``True``, record the Spark metrics of the jobs run by each Hail
+        action, such as the number of tasks and the bytes shuffled. See
+        :func:`.last_action_metrics`.
+    gateway_port : :obj:`int`, optional
+        Attach to the shared Hail JVM started with ``python -m hail.gateway``
+        on this local port, instead of starting a JVM. Defaults to the
+        ``HAIL_GATEWAY_PORT`` environment variable, if set. The gateway's
+        Spark and Hail configuration is used, so `sc`, `app_name`, `master`,
+        `local`, `log`, `append`, `min_block_size`, `branching_factor` and
+        `tmp_dir` are ignored. Temporary files go in a directory of this
+        process's own, removed by :func:`.stop`; the default reference genome
+        and the global seed apply to this process only.
+    jvm_log_level : :obj:`str`
+        Lowest level of the JVM's log messages to print, one of ``'DEBUG'``,
+        ``'INFO'``, ``'WARN'`` and ``'ERROR'``. All messages are still
+        written to the log file. Ignored if `quiet` is ``True``.
+    jvm_logger : :class:`logging.Logger`, optional
+        Send the JVM's log messages to this logger, at their JVM level,
+        instead of printing them. Ignored if `quiet` is ``True``.
     """
     HailContext(sc, app_name, master, local, log, quiet, append,
                 min_block_size, branching_factor, tmp_dir,
-                default_reference, idempotent, global_seed, _backend)
+                default_reference, idempotent, global_seed, record_action_metrics,
+                gateway_port, jvm_log_level, jvm_logger, _backend)
 
 def stop():
     """Stop the currently running Hail session."""
@@ -324,6 +409,7 @@ def set_global_seed(seed):
 
 
 def read_version_info() -> str:
+    import pkg_resources
     # https://stackoverflow.com/questions/6028000/how-to-read-a-static-file-from-inside-a-python-package
     return pkg_resources.resource_string(__name__, 'hail_version').decode().strip()
 
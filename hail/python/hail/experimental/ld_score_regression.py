@@ -375,10 +375,11 @@ def ld_score_regression(weight_expr,
     mt.write(mt_tmp_file)
     mt = hl.read_matrix_table(mt_tmp_file)
 
-    step1_dict = {x['__col_idx']: x['__m_step1'] for x in mt.cols().collect()}
+    cols = mt.cols().collect()
+    step1_dict = {x['__col_idx']: x['__m_step1'] for x in cols}
     step2_dict = {x['__col_idx']: (x['__m_step2'],
                                    x['__step2_maplist'])
-                  for x in mt.cols().collect()}
+                  for x in cols}
 
     step1_separators = {}
     for k, v in step1_dict.items():
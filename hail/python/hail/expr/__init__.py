@@ -1,7 +1,7 @@
 from .types import *
 from .table_type import *
 from .matrix_type import *
-from .expressions import eval, eval_typed
+from .expressions import eval, eval_typed, eval_many, gather
 from .functions import *
 __all__ = ['HailType',
            'dtype',
@@ -28,6 +28,8 @@ __all__ = ['HailType',
            'hts_entry_schema',
            'eval',
            'eval_typed',
+           'eval_many',
+           'gather',
            'literal',
            'chi_squared_test',
            'cond',
@@ -43,6 +43,8 @@ __all__ = ['Indices',
            'extract_refs_by_indices',
            'eval',
            'eval_typed',
+           'eval_many',
+           'gather',
            'expr_any',
            'expr_int32',
            'expr_int64',
@@ -304,6 +304,9 @@ class Expression(object):
 
         self._ir: IR = ir
         self._type = type
+        if type is not None:
+            # the expression language knows the type, so the IR need not infer it
+            ir._assign_type(type)
         self._indices = indices
         self._aggregations = aggregations
 
@@ -764,6 +767,44 @@ class Expression(object):
         t = self._to_table(uid).key_by()
         return [r[uid] for r in t._select("collect", hl.struct(**{uid: t[uid]})).collect()]
 
+    def collect_numpy(self):
+        """Collect all records of a numeric or boolean expression into a
+        numpy array, or of a struct or tuple of them into a structured array.
+
+        Examples
+        --------
+
+        >>> table1.X.collect_numpy()
+        array([5, 6, 7, 8], dtype=int32)
+
+        >>> a = hl.struct(x=table1.X, z=table1.Z).collect_numpy()
+        >>> a['z']
+        array([4, 3, 3, 2], dtype=int32)
+
+        Notes
+        -----
+        Records are in the order of :meth:`collect`. Values are sent as
+        contiguous binary buffers, one per field, and become numpy arrays
+        without being converted one by one to Python objects.
+
+        The dtype of each array or field is ``int32``, ``int64``,
+        ``float32``, ``float64`` or ``bool``, after the Hail type. Fields of a
+        tuple are named ``f0``, ``f1``, and so on.
+
+        Missing floating-point values become ``NaN``. Missing values of other
+        types raise an error; use :func:`.or_else` to replace them first.
+
+        Warning
+        -------
+        The array of records may be very large.
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+        """
+        from hail.backend import columnar
+        return columnar.collect_numpy(self)
+
     def _aggregation_method(self):
         src = self._indices.source
         assert src is not None
@@ -1,3 +1,6 @@
+from concurrent.futures import Future
+
+import hail as hl
 from hail.utils import warn, error, java
 from hail.utils.java import Env
 from .indices import *
@@ -195,6 +198,156 @@ def eval_typed(expression):
         return expression.collect()[0], expression.dtype
 
 
+@typecheck(actions=oneof(Future, expr_any))
+def gather(*actions):
+    """Run several independent actions concurrently and wait for all of
+    their results.
+
+    Examples
+    --------
+    Compute several summaries of a table in parallel:
+
+    >>> n, mean_x, _ = hl.gather(table1.count(_async=True),
+    ...                          table1.aggregate(hl.agg.mean(table1.X), _async=True),
+    ...                          table1.write('output/table1_copy.ht', overwrite=True, _async=True))
+
+    Notes
+    -----
+    Actions such as :meth:`.Table.count`, :meth:`.Table.aggregate`,
+    :meth:`.Table.write`, :meth:`.MatrixTable.aggregate_rows` and
+    :meth:`.MatrixTable.write` normally block until their result is
+    available. Passed ``_async=True``, they instead submit their work and
+    return a :class:`concurrent.futures.Future`, so that independent jobs can
+    share the cluster. Expressions passed to this function are evaluated as
+    by :func:`.eval`, concurrently with the other actions.
+
+    Parameters
+    ----------
+    actions : varargs of :class:`concurrent.futures.Future` or :class:`.Expression`
+        Submitted actions, or expressions to evaluate.
+
+    Returns
+    -------
+    :obj:`list`
+        The result of each action, in order.
+    """
+    futures = [a if isinstance(a, Future) else _eval_async(a) for a in actions]
+    return [f.result() for f in futures]
+
+
+@typecheck(exprs=expr_any)
+def eval_many(*exprs):
+    """Evaluate several Hail expressions at once, returning their results.
+
+    Examples
+    --------
+    Evaluate several expressions in one call to the backend:
+
+    >>> hl.eval_many(hl.len('Hail'), hl.array([1, 2, 3]).map(lambda x: x * 2))
+    [4, [2, 4, 6]]
+
+    Compute two aggregations with a single pass over the table:
+
+    >>> fraction_male, mean_x = hl.eval_many(
+    ...     table1.aggregate(hl.agg.fraction(table1.SEX == 'M'), _localize=False),
+    ...     table1.aggregate(hl.agg.mean(table1.X), _localize=False))
+
+    Notes
+    -----
+    Like :func:`.eval`, the expressions must have no indices, but can refer to
+    the globals of a :class:`.Table` or :class:`.MatrixTable`. All of them are
+    evaluated with a single call to the backend.
+
+    Aggregations built with ``_localize=False`` by :meth:`.Table.aggregate`,
+    :meth:`.MatrixTable.aggregate_rows`, :meth:`.MatrixTable.aggregate_cols`
+    or :meth:`.MatrixTable.aggregate_entries` are merged when they aggregate
+    the same dataset, so that it is scanned once rather than once per
+    aggregation.
+
+    Parameters
+    ----------
+    exprs : varargs of :class:`.Expression`
+
+    Returns
+    -------
+    :obj:`list`
+        The value of each expression, in order.
+    """
+    from hail.ir import MakeTuple, Let
+
+    for e in exprs:
+        analyze('eval_many', e, Indices(e._indices.source))
+    bindings, irs = _merge_aggregates([_eval_ir(e) for e in exprs])
+    ir = MakeTuple(irs)
+    for name, value in reversed(bindings):
+        ir = Let(name, value, ir)
+    return list(Env.backend().execute(ir))
+
+
+def _merge_aggregates(irs):
+    """Merge the top-level aggregations of `irs` that aggregate the same
+    dataset into one aggregation per dataset.
+
+    Returns a list of (name, aggregation) bindings and the rewritten IRs,
+    which refer to the results of the merged aggregations by name."""
+    from hail.ir import (TableAggregate, MatrixAggregate, MatrixRowsTable, MatrixColsTable,
+                         MakeTuple, GetTupleElement, Ref)
+
+    def source(ir):
+        if isinstance(ir, TableAggregate):
+            child = ir.child
+            # MatrixTable.aggregate_rows and aggregate_cols build a new
+            # table node on each call
+            if isinstance(child, (MatrixRowsTable, MatrixColsTable)):
+                return type(child), id(child.child)
+            return TableAggregate, id(child)
+        if isinstance(ir, MatrixAggregate):
+            return MatrixAggregate, id(ir.child)
+        return None
+
+    groups = {}
+    for i, ir in enumerate(irs):
+        key = source(ir)
+        if key is not None:
+            groups.setdefault(key, []).append(i)
+
+    irs = list(irs)
+    bindings = []
+    for indices in groups.values():
+        if len(indices) < 2:
+            continue
+        aggs = [irs[i] for i in indices]
+        query = MakeTuple([a.query for a in aggs])
+        query._assign_type(hl.ttuple(*(a.typ for a in aggs)))
+        merged = aggs[0].copy(aggs[0].child, query)
+        merged._assign_type(query.typ)
+        name = Env.get_uid()
+        bindings.append((name, merged))
+        for j, i in enumerate(indices):
+            irs[i] = GetTupleElement(Ref(name), j)
+    return bindings, irs
+
+
+def _eval_async(expression):
+    analyze('gather', expression, Indices(expression._indices.source))
+    return Env.backend().execute_async(_eval_ir(expression))
+
+
+def _eval_ir(expression):
+    """Value IR computing `expression`, which may refer to the globals of its
+    source but to no other fields."""
+    from hail.ir import Let, TableGetGlobals, MatrixRowsTable
+    source = expression._indices.source
+    if source is None:
+        return expression._ir
+    base, _ = source._process_joins(expression)
+    if isinstance(base, hl.MatrixTable):
+        globals_ir = TableGetGlobals(MatrixRowsTable(base._mir))
+    else:
+        globals_ir = TableGetGlobals(base._tir)
+    return Let('global', globals_ir, expression._ir)
+
+
 def _get_refs(expr: Expression, builder: Dict[str, Indices]) -> None:
     from hail.ir import GetField, TopLevelReference
 
@@ -1,18 +1,17 @@
 from hail.typecheck import *
 from hail.utils.java import escape_parsable
-from hail.expr.types import dtype, tstruct
+from hail.expr.types import dtype, tstruct, tarray
 from hail.utils.java import jiterable_to_list
 
 class tmatrix(object):
     @staticmethod
     def _from_java(jtt):
-        return tmatrix(
+        return tmatrix._from_rv_row_type(
             dtype(jtt.globalType().toString()),
             dtype(jtt.colType().toString()),
             jiterable_to_list(jtt.colKey()),
-            dtype(jtt.rowType().toString()),
-            jiterable_to_list(jtt.rowKey()),
-            dtype(jtt.entryType().toString()))
+            dtype(jtt.rvRowType().toString()),
+            jiterable_to_list(jtt.rowKey()))
 
     @typecheck_method(global_type=tstruct,
                       col_type=tstruct, col_key=sequenceof(str),
@@ -25,9 +24,10 @@ class tmatrix(object):
         self.row_type = row_type
         self.row_key = row_key
         self.entry_type = entry_type
+        self._rv_row = None
 
     def __eq__(self, other):
-        return (isinstance(other, ttable)
+        return (isinstance(other, tmatrix)
                 and self.global_type == other.global_type
                 and self.col_type == other.col_type
                 and self.col_key == other.col_key
@@ -41,6 +41,55 @@ class tmatrix(object):
     def __repr__(self):
         return f'tmatrix(global_type={self.global_type!r}, col_type={self.col_type!r}, col_key={self.col_key!r}, row_type={self.row_type!r}, row_key={self.row_key!r}, entry_type={self.entry_type!r})'
 
+    _entries_field = 'the entries! [877f12a8827e18f61222c6c8c5fb04a8]'
+
+    @staticmethod
+    def _from_rv_row_type(global_type, col_type, col_key, rv_row_type, row_key):
+        entry_type = rv_row_type[tmatrix._entries_field].element_type
+        row_type = rv_row_type._drop_fields({tmatrix._entries_field})
+        t = tmatrix(global_type, col_type, col_key, row_type, row_key, entry_type)
+        t._rv_row = rv_row_type
+        return t
+
+    @property
+    def _rv_row_type(self):
+        """The row type including the entries, as seen by value IR. The
+        entries are last unless an operation placed them elsewhere."""
+        if self._rv_row is None:
+            self._rv_row = self.row_type._insert_fields(**{tmatrix._entries_field: tarray(self.entry_type)})
+        return self._rv_row
+
+    @property
+    def _row_key_type(self):
+        return self.row_type._select_fields(self.row_key)
+
+    @property
+    def _col_key_type(self):
+        return self.col_type._select_fields(self.col_key)
+
+    @property
+    def _col_value_type(self):
+        return self.col_type._drop_fields(set(self.col_key))
+
+    def _ref_map(self):
+        """Types of the variables bound in the value IR children of a matrix
+        IR with this type."""
+        return {'global': self.global_type,
+                'va': self._rv_row_type,
+                'sa': self.col_type,
+                'g': self.entry_type}
+
+    def _copy(self, **kwargs):
+        fields = dict(global_type=self.global_type,
+                      col_type=self.col_type, col_key=self.col_key,
+                      row_type=self.row_type, row_key=self.row_key,
+                      entry_type=self.entry_type)
+        fields.update(kwargs)
+        t = tmatrix(**fields)
+        if 'row_type' not in kwargs and 'entry_type' not in kwargs:
+            t._rv_row = self._rv_row
+        return t
+
     def _row_key_str(self):
         return ', '.join([escape_parsable(k) for k in self.row_key])
 
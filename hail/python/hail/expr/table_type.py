@@ -29,6 +29,24 @@ class ttable(object):
     def __repr__(self):
         return f'ttable(global_type={self.global_type!r}, row_type={self.row_type!r}, row_key={self.row_key!r})'
 
+    @property
+    def _key_type(self):
+        return self.row_type._select_fields(self.row_key)
+
+    @property
+    def _value_type(self):
+        return self.row_type._drop_fields(set(self.row_key))
+
+    def _ref_map(self):
+        """Types of the variables bound in the value IR children of a table
+        IR with this type."""
+        return {'global': self.global_type, 'row': self.row_type}
+
+    def _copy(self, **kwargs):
+        fields = dict(global_type=self.global_type, row_type=self.row_type, row_key=self.row_key)
+        fields.update(kwargs)
+        return ttable(**fields)
+
     def _key_str(self):
         return ', '.join([escape_parsable(k) for k in self.row_key])
 
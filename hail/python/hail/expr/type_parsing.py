@@ -1,124 +1,143 @@
-from parsimonious import Grammar, NodeVisitor
+import re
+
 import hail as hl
 from hail.utils.java import unescape_parsable
 
-type_grammar = Grammar(
-    r"""
-    type = _ (array / ndarray / set / dict / struct / tuple / interval / int64 / int32 / float32 / float64 / bool / str / call / str / locus / void) _
-    void = "void" / "tvoid"
-    int64 = "int64" / "tint64"
-    int32 = "int32" / "tint32" / "int" / "tint"
-    float32 = "float32" / "tfloat32"
-    float64 = "float64" / "tfloat64" / "tfloat" / "float"
-    bool = "tbool" / "bool"
-    call = "tcall" / "call"
-    str = "tstr" / "str"
-    locus = ("tlocus" / "locus") _ "<" identifier ">"
-    array = ("tarray" / "array") _ "<" type ">"
-    ndarray = ("tndarray" / "ndarray") _ "<" type ">"
-    set = ("tset" / "set") _ "<" type ">"
-    dict = ("tdict" / "dict") _ "<" type "," type ">"
-    struct = ("tstruct" / "struct") _ "{" (fields / _) "}"
-    tuple = ("ttuple" / "tuple") _ "(" ((type ("," type)*) / _) ")"
-    fields = field ("," field)*
-    field = identifier ":" type
-    interval = ("tinterval" / "interval") _ "<" type ">"
-    identifier = _ (simple_identifier / escaped_identifier) _
-    simple_identifier = ~"\w+"
-    escaped_identifier = ~"`([^`\\\\]|\\\\.)*`"
-    _ = ~"\s*"
-    """)
-
-
-class TypeConstructor(NodeVisitor):
-    def generic_visit(self, node, visited_children):
-        return visited_children
-
-    def visit_type(self, node, visited_children):
-        _, [t], _ = visited_children
+_whitespace = re.compile(r'\s*')
+_word = re.compile(r'\s*(\w+)\s*')
+_escaped_identifier = re.compile(r'\s*`((?:[^`\\]|\\.)*)`\s*')
+
+_keywords = {}
+
+
+def _init_keywords():
+    primitives = {
+        hl.tvoid: ['void', 'tvoid'],
+        hl.tint64: ['int64', 'tint64'],
+        hl.tint32: ['int32', 'tint32', 'int', 'tint'],
+        hl.tfloat32: ['float32', 'tfloat32'],
+        hl.tfloat64: ['float64', 'tfloat64', 'tfloat', 'float'],
+        hl.tbool: ['bool', 'tbool'],
+        hl.tcall: ['call', 'tcall'],
+        hl.tstr: ['str', 'tstr'],
+    }
+    for t, names in primitives.items():
+        for name in names:
+            _keywords[name] = t
+    for name in ['locus', 'array', 'ndarray', 'set', 'dict', 'struct', 'tuple', 'interval']:
+        _keywords[name] = name
+        _keywords['t' + name] = name
+
+
+class TypeParser(object):
+    """Recursive-descent parser for the type grammar documented in
+    :func:`.dtype`. Runs in time linear in the length of the string."""
+
+    def __init__(self, s):
+        if not _keywords:
+            _init_keywords()
+        self.s = s
+        self.pos = 0
+
+    def parse(self):
+        t = self.type()
+        if self.pos != len(self.s):
+            self.fail('end of type')
         return t
 
-    def visit_void(self, node, visited_children):
-        return hl.tvoid
-
-    def visit_int64(self, node, visited_children):
-        return hl.tint64
-
-    def visit_int32(self, node, visited_children):
-        return hl.tint32
-
-    def visit_float64(self, node, visited_children):
-        return hl.tfloat64
-
-    def visit_float32(self, node, visited_children):
-        return hl.tfloat32
-
-    def visit_bool(self, node, visited_children):
-        return hl.tbool
-
-    def visit_call(self, node, visited_children):
-        return hl.tcall
-
-    def visit_str(self, node, visited_children):
-        return hl.tstr
-
-    def visit_locus(self, node, visited_children):
-        tlocus, _, angle_bracket, gr, angle_bracket = visited_children
-        return hl.tlocus(gr)
-
-    def visit_array(self, node, visited_children):
-        tarray, _, angle_bracket, t, angle_bracket = visited_children
-        return hl.tarray(t)
-
-    def visit_ndarray(self, node, visited_children):
-        tndarray, _, angle_bracket, t, angle_bracket = visited_children
-        return hl.tndarray(t)
-
-    def visit_set(self, node, visited_children):
-        tset, _, angle_bracket, t, angle_bracket = visited_children
-        return hl.tset(t)
-
-    def visit_dict(self, node, visited_children):
-        tdict, _, angle_bracket, kt, comma, vt, angle_bracket = visited_children
-        return hl.tdict(kt, vt)
-
-    def visit_struct(self, node, visited_children):
-        tstruct, _, brace, maybe_fields, brace = visited_children
-        if not maybe_fields:
-            return hl.tstruct()
-        else:
-            fields = maybe_fields[0]
-            return hl.tstruct(**dict(fields))
-
-    def visit_tuple(self, node, visited_children):
-        ttuple, _, paren, [maybe_types], paren = visited_children
-        if not maybe_types:
-            return hl.ttuple()
+    def fail(self, expected):
+        raise ValueError("invalid type string: expected {} at position {}: '{}'".format(
+            expected, self.pos, self.s))
+
+    def skip_whitespace(self):
+        self.pos = _whitespace.match(self.s, self.pos).end()
+
+    def peek(self, c):
+        self.skip_whitespace()
+        return self.s.startswith(c, self.pos)
+
+    def expect(self, c):
+        if not self.peek(c):
+            self.fail(repr(c))
+        self.pos += len(c)
+
+    def word(self):
+        m = _word.match(self.s, self.pos)
+        if m is None:
+            self.fail('identifier')
+        self.pos = m.end()
+        return m.group(1)
+
+    def identifier(self):
+        m = _escaped_identifier.match(self.s, self.pos)
+        if m is not None:
+            self.pos = m.end()
+            return unescape_parsable(m.group(1))
+        return self.word()
+
+    def type(self):
+        start = self.pos
+        kind = _keywords.get(self.word())
+        if kind is None:
+            self.pos = start
+            self.fail('type')
+        if not isinstance(kind, str):
+            return kind
+        if kind == 'struct':
+            return self.struct()
+        if kind == 'tuple':
+            return self.tuple()
+
+        self.expect('<')
+        if kind == 'locus':
+            t = hl.tlocus(self.identifier())
+        elif kind == 'dict':
+            key_type = self.type()
+            self.expect(',')
+            t = hl.tdict(key_type, self.type())
         else:
-            [first, rest] = maybe_types
-            return hl.ttuple(first, *(t for comma, t in rest))
-
-    def visit_fields(self, node, visited_children):
-        first, rest = visited_children
-        return [first] + [field for comma, field in rest]
-
-    def visit_field(self, node, visited_children):
-        name, comma, type = visited_children
-        return (name, type)
-
-    def visit_interval(self, node, visited_children):
-        tinterval, _, angle_bracket, point_t, angle_bracket = visited_children
-        return hl.tinterval(point_t)
-
-    def visit_identifier(self, node, visited_children):
-        _, [id], _ = visited_children
-        return id
-
-    def visit_simple_identifier(self, node, visited_children):
-        return node.text
-
-    def visit_escaped_identifier(self, node, visited_children):
-        return unescape_parsable(node.text[1:-1])
-
+            element_type = self.type()
+            if kind == 'array':
+                t = hl.tarray(element_type)
+            elif kind == 'set':
+                t = hl.tset(element_type)
+            elif kind == 'interval':
+                t = hl.tinterval(element_type)
+            else:
+                assert kind == 'ndarray'
+                t = hl.tndarray(element_type)
+        self.expect('>')
+        self.skip_whitespace()
+        return t
 
-type_node_visitor = TypeConstructor()
+    def struct(self):
+        self.expect('{')
+        fields = []
+        if not self.peek('}'):
+            while True:
+                name = self.identifier()
+                self.expect(':')
+                fields.append((name, self.type()))
+                if not self.peek(','):
+                    break
+                self.pos += 1
+        self.expect('}')
+        self.skip_whitespace()
+        return hl.tstruct._from_fields(fields)
+
+    def tuple(self):
+        self.expect('(')
+        types = []
+        if not self.peek(')'):
+            while True:
+                types.append(self.type())
+                if not self.peek(','):
+                    break
+                self.pos += 1
+        self.expect(')')
+        self.skip_whitespace()
+        return hl.ttuple(*types)
+
+
+def parse_type(s):
+    return TypeParser(s).parse()
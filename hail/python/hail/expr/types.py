@@ -5,10 +5,12 @@ from collections import Mapping, Sequence
 
 import hail as hl
 from hail import genetics
-from hail.expr.type_parsing import type_grammar, type_node_visitor
+from hail.expr.type_parsing import parse_type
 from hail.genetics.reference_genome import reference_genome_type
 from hail.typecheck import *
 from hail.utils import Struct, Interval
+from hail.utils.byte_reader import ByteReader
+from hail.utils.byte_writer import ByteWriter
 from hail.utils.java import scala_object, jset, Env, escape_parsable
 
 __all__ = [
@@ -67,31 +69,31 @@ def dtype(type_str):
     -----
     This function is able to reverse ``str(t)`` on a :class:`.HailType`.
 
-    The grammar is defined as follows:
+    Type strings are read by a recursive-descent parser, in time linear in
+    their length. The accepted syntax is as follows, where each keyword may
+    also be written with a ``t`` prefix (``tint32``, ``tarray``, ...) and
+    whitespace is allowed between any two tokens:
 
     .. code-block:: text
 
-        type = _ (array / set / dict / struct / tuple / interval / int64 / int32 / float32 / float64 / bool / str / call / str / locus) _
-        int64 = "int64" / "tint64"
-        int32 = "int32" / "tint32" / "int" / "tint"
-        float32 = "float32" / "tfloat32"
-        float64 = "float64" / "tfloat64" / "tfloat" / "float"
-        bool = "tbool" / "bool"
-        call = "tcall" / "call"
-        str = "tstr" / "str"
-        locus = ("tlocus" / "locus") _ "[" identifier "]"
-        array = ("tarray" / "array") _ "<" type ">"
-        set = ("tset" / "set") _ "<" type ">"
-        dict = ("tdict" / "dict") _ "<" type "," type ">"
-        struct = ("tstruct" / "struct") _ "{" (fields / _) "}"
-        tuple = ("ttuple" / "tuple") _ "(" ((type ("," type)*) / _) ")"
-        fields = field ("," field)*
-        field = identifier ":" type
-        interval = ("tinterval" / "interval") _ "<" type ">"
-        identifier = _ (simple_identifier / escaped_identifier) _
-        simple_identifier = ~"\w+"
-        escaped_identifier = ~"`([^`\\\\]|\\\\.)*`"
-        _ = ~"\s*"
+        type       = primitive | locus | array | ndarray | set | dict
+                   | interval | struct | tuple
+        primitive  = "int32" | "int" | "int64" | "float32" | "float64"
+                   | "float" | "bool" | "str" | "call" | "void"
+        locus      = "locus" "<" identifier ">"
+        array      = "array" "<" type ">"
+        ndarray    = "ndarray" "<" type ">"
+        set        = "set" "<" type ">"
+        dict       = "dict" "<" type "," type ">"
+        interval   = "interval" "<" type ">"
+        struct     = "struct" "{" [field ("," field)*] "}"
+        field      = identifier ":" type
+        tuple      = "tuple" "(" [type ("," type)*] ")"
+        identifier = word characters (\w+), or a backquoted name in which
+                     backquotes and backslashes are escaped with a backslash
+
+    Parsed types are interned: parsing the same string twice returns the
+    same :class:`.HailType` object.
 
     Parameters
     ----------
@@ -102,18 +104,40 @@ def dtype(type_str):
     -------
     :class:`.HailType`
     """
-    tree = type_grammar.parse(type_str)
-    return type_node_visitor.visit(tree)
+    t = _dtype_cache.get(type_str)
+    if t is None:
+        t = parse_type(type_str)
+        if len(_dtype_cache) >= _dtype_cache_max_size:
+            _dtype_cache.clear()
+        _dtype_cache[type_str] = t
+    return t
+
+
+# interned results of dtype, keyed by type string. Cleared when a reference
+# genome is registered, since locus types refer to the registered object.
+_dtype_cache = {}
+_dtype_cache_max_size = 10_000
 
 
 class HailType(object):
     """
     Hail type superclass.
+
+    Types are immutable. The string representation and hash of each instance
+    are computed once, on first use.
     """
 
+    _cached_str = None
+    _cached_hash = None
+
     def __init__(self):
         super(HailType, self).__init__()
 
+    def __setattr__(self, key, value):
+        if key in self.__dict__:
+            raise AttributeError(f"'{type(self).__name__}' is immutable: cannot set '{key}'")
+        super(HailType, self).__setattr__(key, value)
+
     def __repr__(self):
         s = str(self).replace("'", "\\'")
         return "dtype('{}')".format(s)
@@ -123,15 +147,34 @@ class HailType(object):
         return
 
     def __eq__(self, other):
-        return isinstance(other, HailType) and self._eq(other)
+        if self is other:
+            return True
+        if not isinstance(other, HailType):
+            return False
+        # hashes are cached, so unequal types are usually told apart in
+        # constant time
+        if hash(self) != hash(other):
+            return False
+        return self._eq(other)
 
-    @abc.abstractmethod
     def __str__(self):
+        s = self._cached_str
+        if s is None:
+            s = self._str()
+            object.__setattr__(self, '_cached_str', s)
+        return s
+
+    @abc.abstractmethod
+    def _str(self):
         return
 
     def __hash__(self):
-        # FIXME this is a bit weird
-        return 43 + hash(str(self))
+        h = self._cached_hash
+        if h is None:
+            # FIXME this is a bit weird
+            h = 43 + hash(str(self))
+            object.__setattr__(self, '_cached_hash', h)
+        return h
 
     def pretty(self, indent=0, increment=4):
         """Returns a prettily formatted string representation of the type.
@@ -204,6 +247,28 @@ class HailType(object):
     def _convert_from_json(self, x):
         return x
 
+    def _from_encoding(self, encoding):
+        # the JVM wraps the result in a one-field tuple, see EncodedResult
+        reader = ByteReader.from_encoding(encoding)
+        if reader.read_missing_bits(1)[0]:
+            return None
+        return self._convert_from_encoding(reader)
+
+    def _convert_from_encoding(self, reader):
+        raise NotImplementedError(f'binary decoding of {self}')
+
+    def _to_encoding(self, value):
+        # wrapped in a one-field tuple, like results, see EncodedResult
+        writer = ByteWriter()
+        writer.write_missing_bits([value is None])
+        if value is not None:
+            self._convert_to_encoding(writer, value)
+        return writer.to_encoding()
+
+    def _convert_to_encoding(self, writer, x):
+        raise NotImplementedError(f'binary encoding of {self}')
+
+    _packed_format = None
 
     def _traverse(self, obj, f):
         """Traverse a nested type and object.
@@ -224,7 +289,7 @@ class _tvoid(HailType):
     def __init__(self):
         super(_tvoid, self).__init__()
 
-    def __str__(self):
+    def _str(self):
         return "void"
 
     def _eq(self, other):
@@ -233,6 +298,9 @@ class _tvoid(HailType):
     def _parsable_string(self):
         return "Void"
 
+    def _from_encoding(self, encoding):
+        return None
+
 
 class _tint32(HailType):
     """Hail type for signed 32-bit integers.
@@ -263,7 +331,7 @@ class _tint32(HailType):
                 raise TypeError(f"Value out of range for 32-bit integer: "
                                 f"expected [{self.min_value}, {self.max_value}], found {annotation}")
 
-    def __str__(self):
+    def _str(self):
         return "int32"
 
     def _eq(self, other):
@@ -272,6 +340,14 @@ class _tint32(HailType):
     def _parsable_string(self):
         return "Int32"
 
+    def _convert_from_encoding(self, reader):
+        return reader.read_int32()
+
+    def _convert_to_encoding(self, writer, x):
+        writer.write_int32(x)
+
+    _packed_format = ('i', 4)
+
     @property
     def min_value(self):
         return -(1 << 31)
@@ -306,7 +382,7 @@ class _tint64(HailType):
                 raise TypeError(f"Value out of range for 64-bit integer: "
                                 f"expected [{self.min_value}, {self.max_value}], found {annotation}")
 
-    def __str__(self):
+    def _str(self):
         return "int64"
 
     def _eq(self, other):
@@ -315,6 +391,14 @@ class _tint64(HailType):
     def _parsable_string(self):
         return "Int64"
 
+    def _convert_from_encoding(self, reader):
+        return reader.read_int64()
+
+    def _convert_to_encoding(self, writer, x):
+        writer.write_int64(x)
+
+    _packed_format = ('q', 8)
+
     @property
     def min_value(self):
         return -(1 << 63)
@@ -349,7 +433,7 @@ class _tfloat32(HailType):
         if annotation is not None and not isinstance(annotation, (float, int)):
             raise TypeError("type 'float32' expected Python 'float', but found type '%s'" % type(annotation))
 
-    def __str__(self):
+    def _str(self):
         return "float32"
 
     def _eq(self, other):
@@ -361,6 +445,14 @@ class _tfloat32(HailType):
     def _convert_from_json(self, x):
         return float(x)
 
+    def _convert_from_encoding(self, reader):
+        return reader.read_float32()
+
+    def _convert_to_encoding(self, writer, x):
+        writer.write_float32(x)
+
+    _packed_format = ('f', 4)
+
     def _convert_to_json(self, x):
         if math.isfinite(x):
             return x
@@ -389,7 +481,7 @@ class _tfloat64(HailType):
     def _typecheck_one_level(self, annotation):
         if annotation is not None and not isinstance(annotation, (float, int)):
             raise TypeError("type 'float64' expected Python 'float', but found type '%s'" % type(annotation))
-    def __str__(self):
+    def _str(self):
         return "float64"
 
     def _eq(self, other):
@@ -401,6 +493,14 @@ class _tfloat64(HailType):
     def _convert_from_json(self, x):
         return float(x)
 
+    def _convert_from_encoding(self, reader):
+        return reader.read_float64()
+
+    def _convert_to_encoding(self, writer, x):
+        writer.write_float64(x)
+
+    _packed_format = ('d', 8)
+
     def _convert_to_json(self, x):
         if math.isfinite(x):
             return x
@@ -427,7 +527,7 @@ class _tstr(HailType):
         if annotation and not isinstance(annotation, str):
             raise TypeError("type 'str' expected Python 'str', but found type '%s'" % type(annotation))
 
-    def __str__(self):
+    def _str(self):
         return "str"
 
     def _eq(self, other):
@@ -436,6 +536,12 @@ class _tstr(HailType):
     def _parsable_string(self):
         return "String"
 
+    def _convert_from_encoding(self, reader):
+        return reader.read_str()
+
+    def _convert_to_encoding(self, writer, x):
+        writer.write_str(x)
+
 
 class _tbool(HailType):
     """Hail type for Boolean (``True`` or ``False``) values.
@@ -456,7 +562,7 @@ class _tbool(HailType):
         if annotation is not None and not isinstance(annotation, bool):
             raise TypeError("type 'bool' expected Python 'bool', but found type '%s'" % type(annotation))
 
-    def __str__(self):
+    def _str(self):
         return "bool"
 
     def _eq(self, other):
@@ -465,6 +571,14 @@ class _tbool(HailType):
     def _parsable_string(self):
         return "Boolean"
 
+    def _convert_from_encoding(self, reader):
+        return reader.read_bool()
+
+    def _convert_to_encoding(self, writer, x):
+        writer.write_bool(x)
+
+    _packed_format = ('?', 1)
+
 
 class tndarray(HailType):
     """Hail type for n-dimensional arrays.
@@ -519,7 +633,7 @@ class tndarray(HailType):
     def _typecheck_one_level(self, annotation):
         raise NotImplementedError
 
-    def __str__(self):
+    def _str(self):
         return "ndarray<{}>".format(self.element_type)
 
     def _eq(self, other):
@@ -602,7 +716,7 @@ class tarray(HailType):
             if not isinstance(annotation, Sequence):
                 raise TypeError("type 'array' expected Python 'list', but found type '%s'" % type(annotation))
 
-    def __str__(self):
+    def _str(self):
         return "array<{}>".format(self.element_type)
 
     def _eq(self, other):
@@ -619,6 +733,12 @@ class tarray(HailType):
     def _convert_from_json(self, x):
         return [self.element_type._convert_from_json_na(elt) for elt in x]
 
+    def _convert_from_encoding(self, reader):
+        return _read_elements(reader, self.element_type)
+
+    def _convert_to_encoding(self, writer, x):
+        _write_elements(writer, self.element_type, x)
+
     def _convert_to_json(self, x):
         return [self.element_type._convert_to_json_na(elt) for elt in x]
 
@@ -688,7 +808,7 @@ class tset(HailType):
             if not isinstance(annotation, set):
                 raise TypeError("type 'set' expected Python 'set', but found type '%s'" % type(annotation))
 
-    def __str__(self):
+    def _str(self):
         return "set<{}>".format(self.element_type)
 
     def _eq(self, other):
@@ -705,6 +825,12 @@ class tset(HailType):
     def _convert_from_json(self, x):
         return {self.element_type._convert_from_json_na(elt) for elt in x}
 
+    def _convert_from_encoding(self, reader):
+        return set(_read_elements(reader, self.element_type))
+
+    def _convert_to_encoding(self, writer, x):
+        _write_elements(writer, self.element_type, list(x))
+
     def _convert_to_json(self, x):
         return [self.element_type._convert_to_json_na(elt) for elt in x]
 
@@ -791,7 +917,7 @@ class tdict(HailType):
             if not isinstance(annotation, dict):
                 raise TypeError("type 'dict' expected Python 'dict', but found type '%s'" % type(annotation))
 
-    def __str__(self):
+    def _str(self):
         return "dict<{}, {}>".format(self.key_type, self.value_type)
 
     def _eq(self, other):
@@ -811,6 +937,29 @@ class tdict(HailType):
         return {self.key_type._convert_from_json_na(elt['key']): self.value_type._convert_from_json_na(elt['value']) for
                 elt in x}
 
+    def _convert_from_encoding(self, reader):
+        # dicts are encoded as arrays of struct{key, value}
+        n = reader.read_int32()
+        missing = reader.read_missing_bits(n)
+        d = {}
+        for m in missing:
+            if not m:
+                key_missing, value_missing = reader.read_missing_bits(2)
+                k = None if key_missing else self.key_type._convert_from_encoding(reader)
+                v = None if value_missing else self.value_type._convert_from_encoding(reader)
+                d[k] = v
+        return d
+
+    def _convert_to_encoding(self, writer, x):
+        writer.write_int32(len(x))
+        writer.write_missing_bits([False] * len(x))
+        for k, v in x.items():
+            writer.write_missing_bits([k is None, v is None])
+            if k is not None:
+                self.key_type._convert_to_encoding(writer, k)
+            if v is not None:
+                self.value_type._convert_to_encoding(writer, v)
+
     def _convert_to_json(self, x):
         return [{'key': self.key_type._convert_to_json(k),
                  'value':self.value_type._convert_to_json(v)} for k, v in x.items()]
@@ -840,6 +989,16 @@ class tstruct(HailType, Mapping):
         self._fields = tuple(field_types)
         super(tstruct, self).__init__()
 
+    @classmethod
+    def _from_fields(cls, fields):
+        """Build a struct from a list of (name, type) pairs, without
+        checking the field types."""
+        t = tstruct.__new__(cls)
+        t._field_types = dict(fields)
+        t._fields = tuple(t._field_types)
+        HailType.__init__(t)
+        return t
+
     @property
     def fields(self):
         """Struct fields.
@@ -898,14 +1057,23 @@ class tstruct(HailType, Mapping):
     def __len__(self):
         return len(self._fields)
 
-    def __str__(self):
+    def __contains__(self, item):
+        return item in self._field_types
+
+    def items(self):
+        return self._field_types.items()
+
+    def values(self):
+        return self._field_types.values()
+
+    def _str(self):
         return "struct{{{}}}".format(
             ', '.join('{}: {}'.format(escape_parsable(f), str(t)) for f, t in self.items()))
 
     def _eq(self, other):
         return (isinstance(other, tstruct)
                 and self._fields == other._fields
-                and all(self[f] == other[f] for f in self._fields))
+                and all(self._field_types[f] == other._field_types[f] for f in self._fields))
 
     def _pretty(self, l, indent, increment):
         if not self._fields:
@@ -933,6 +1101,18 @@ class tstruct(HailType, Mapping):
     def _convert_from_json(self, x):
         return Struct(**{f: t._convert_from_json_na(x.get(f)) for f, t in self.items()})
 
+    def _convert_from_encoding(self, reader):
+        missing = reader.read_missing_bits(len(self._fields))
+        return Struct(**{f: None if m else t._convert_from_encoding(reader)
+                         for (f, t), m in zip(self.items(), missing)})
+
+    def _convert_to_encoding(self, writer, x):
+        values = [x[f] for f in self._fields]
+        writer.write_missing_bits([v is None for v in values])
+        for t, v in zip(self._field_types.values(), values):
+            if v is not None:
+                t._convert_to_encoding(writer, v)
+
     def _convert_to_json(self, x):
         return {f: t._convert_to_json_na(x[f]) for f, t in self.items()}
 
@@ -941,6 +1121,35 @@ class tstruct(HailType, Mapping):
                 len(self._fields) <= len(other._fields) and
                 all(x == y for x, y in zip(self._field_types.values(), other._field_types.values())))
 
+    def _concat(self, other):
+        new_field_types = dict(self._field_types)
+        new_field_types.update(other._field_types)
+        return tstruct(**new_field_types)
+
+    def _insert_fields(self, **new_fields):
+        # existing fields keep their position; new fields are appended
+        new_field_types = dict(self._field_types)
+        new_field_types.update(new_fields)
+        return tstruct(**new_field_types)
+
+    def _insert(self, path, t):
+        if not path:
+            return t
+        key = path[0]
+        keyt = self._field_types.get(key)
+        if not isinstance(keyt, tstruct):
+            keyt = tstruct()
+        return self._insert_fields(**{key: keyt._insert(path[1:], t)})
+
+    def _select_fields(self, fields):
+        return tstruct(**{f: self._field_types[f] for f in fields})
+
+    def _drop_fields(self, fields):
+        return tstruct(**{f: t for f, t in self._field_types.items() if f not in fields})
+
+    def _rename(self, map):
+        return tstruct(**{map.get(f, f): t for f, t in self._field_types.items()})
+
 
 class ttuple(HailType):
     """Hail type for tuples.
@@ -1000,7 +1209,7 @@ class ttuple(HailType):
                 raise TypeError("%s expected tuple of size '%i', but found '%s'" %
                                 (self, len(self.types), annotation))
 
-    def __str__(self):
+    def _str(self):
         return "tuple({})".format(", ".join([str(t) for t in self.types]))
 
     def _eq(self, other):
@@ -1028,6 +1237,16 @@ class ttuple(HailType):
     def _convert_from_json(self, x):
         return tuple(self.types[i]._convert_from_json_na(x[i]) for i in range(len(self.types)))
 
+    def _convert_from_encoding(self, reader):
+        missing = reader.read_missing_bits(len(self.types))
+        return tuple(None if m else t._convert_from_encoding(reader) for t, m in zip(self.types, missing))
+
+    def _convert_to_encoding(self, writer, x):
+        writer.write_missing_bits([v is None for v in x])
+        for t, v in zip(self.types, x):
+            if v is not None:
+                t._convert_to_encoding(writer, v)
+
     def _convert_to_json(self, x):
         return [self.types[i]._convert_to_json_na(x[i]) for i in range(len(self.types))]
 
@@ -1060,7 +1279,7 @@ class _tcall(HailType):
             raise TypeError("type 'call' expected Python hail.genetics.Call, but found %s'" %
                             type(annotation))
 
-    def __str__(self):
+    def _str(self):
         return "call"
 
     def _eq(self, other):
@@ -1070,7 +1289,13 @@ class _tcall(HailType):
         return "Call"
 
     def _convert_from_json(self, x):
-        return hl.Call._from_java(hl.Call._call_jobject().parse(x))
+        return genetics.Call._parse(x)
+
+    def _convert_from_encoding(self, reader):
+        return genetics.Call._from_java(reader.read_int32())
+
+    def _convert_to_encoding(self, writer, x):
+        writer.write_int32(x._call)
 
     def _convert_to_json(self, x):
         return str(x)
@@ -1118,7 +1343,7 @@ class tlocus(HailType):
                 raise TypeError("type '{}' encountered Locus with reference genome {}"
                                 .format(self, repr(annotation.reference_genome)))
 
-    def __str__(self):
+    def _str(self):
         return "locus<{}>".format(escape_parsable(str(self.reference_genome)))
 
     def _parsable_string(self):
@@ -1137,14 +1362,24 @@ class tlocus(HailType):
             Reference genome.
         """
         if self._rg is None:
-            self._rg = hl.default_reference()
+            object.__setattr__(self, '_rg', hl.default_reference())
         return self._rg
 
     def _pretty(self, l, indent, increment):
         l.append('locus<{}>'.format(escape_parsable(self.reference_genome.name)))
 
     def _convert_from_json(self, x):
-        return genetics.Locus(x['contig'], x['position'], reference_genome=self.reference_genome)
+        return genetics.Locus._from_fields(x['contig'], x['position'], self.reference_genome)
+
+    def _convert_from_encoding(self, reader):
+        # contig and position are required, so there are no missing bits
+        contig = reader.read_str()
+        position = reader.read_int32()
+        return genetics.Locus._from_fields(contig, position, self.reference_genome)
+
+    def _convert_to_encoding(self, writer, x):
+        writer.write_str(x.contig)
+        writer.write_int32(x.position)
 
     def _convert_to_json(self, x):
         return {'contig': x.contig, 'position': x.position}
@@ -1208,7 +1443,7 @@ class tinterval(HailType):
                 raise TypeError("type '{}' encountered Interval with point type {}"
                                 .format(self, repr(annotation.point_type)))
 
-    def __str__(self):
+    def _str(self):
         return "interval<{}>".format(str(self.point_type))
 
     def _eq(self, other):
@@ -1223,10 +1458,29 @@ class tinterval(HailType):
         return "Interval[{}]".format(self.point_type._parsable_string())
 
     def _convert_from_json(self, x):
-        return Interval(self.point_type._convert_from_json_na(x['start']),
-                        self.point_type._convert_from_json_na(x['end']),
-                        x['includeStart'],
-                        x['includeEnd'])
+        return Interval._from_fields(self.point_type._convert_from_json_na(x['start']),
+                                     self.point_type._convert_from_json_na(x['end']),
+                                     x['includeStart'],
+                                     x['includeEnd'],
+                                     self.point_type)
+
+    def _convert_from_encoding(self, reader):
+        # only start and end are optional; includesStart and includesEnd are required
+        start_missing, end_missing = reader.read_missing_bits(2)
+        start = None if start_missing else self.point_type._convert_from_encoding(reader)
+        end = None if end_missing else self.point_type._convert_from_encoding(reader)
+        includes_start = reader.read_bool()
+        includes_end = reader.read_bool()
+        return Interval._from_fields(start, end, includes_start, includes_end, self.point_type)
+
+    def _convert_to_encoding(self, writer, x):
+        writer.write_missing_bits([x.start is None, x.end is None])
+        if x.start is not None:
+            self.point_type._convert_to_encoding(writer, x.start)
+        if x.end is not None:
+            self.point_type._convert_to_encoding(writer, x.end)
+        writer.write_bool(x.includes_start)
+        writer.write_bool(x.includes_end)
 
     def _convert_to_json(self, x):
         return {'start': self.point_type._convert_to_json_na(x.start),
@@ -1235,6 +1489,28 @@ class tinterval(HailType):
                 'includeEnd': x.includes_end}
 
 
+def _read_elements(reader, element_type):
+    n = reader.read_int32()
+    missing = reader.read_missing_bits(n)
+    if element_type._packed_format is not None:
+        fmt, size = element_type._packed_format
+        defined = iter(reader.read_packed(fmt, size, n - sum(missing)))
+        return [None if m else next(defined) for m in missing]
+    return [None if m else element_type._convert_from_encoding(reader) for m in missing]
+
+
+def _write_elements(writer, element_type, x):
+    writer.write_int32(len(x))
+    missing = [v is None for v in x]
+    writer.write_missing_bits(missing)
+    if element_type._packed_format is not None:
+        writer.write_packed(element_type._packed_format[0], [v for v in x if v is not None])
+    else:
+        for v in x:
+            if v is not None:
+                element_type._convert_to_encoding(writer, v)
+
+
 tvoid = _tvoid()
 
 
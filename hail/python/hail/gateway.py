@@ -0,0 +1,95 @@
+"""Run a long-lived Hail JVM that Python processes attach to.
+
+Starting the JVM, Spark and Hail takes tens of seconds, which dominates short
+jobs. Instead, start a gateway once per machine::
+
+    python -m hail.gateway --port 25333 --tmp-dir /tmp
+
+and have each process attach to it::
+
+    >>> hl.init(gateway_port=25333)  # doctest: +SKIP
+
+or set the ``HAIL_GATEWAY_PORT`` environment variable, which is used when
+`gateway_port` is not given, including by the implicit :func:`.init` on first
+use of Hail.
+
+Options other than ``--port`` configure the gateway's Hail context, as the
+parameters of :func:`.init` of the same names do. Further arguments after
+``--`` are passed to ``spark-submit``. The gateway only accepts connections
+from the local host.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+_pyspark_imports = [
+    'org.apache.spark.SparkConf',
+    'org.apache.spark.api.java.*',
+    'org.apache.spark.api.python.*',
+    'org.apache.spark.ml.python.*',
+    'org.apache.spark.mllib.api.python.*',
+    'org.apache.spark.sql.*',
+    'org.apache.spark.sql.hive.*',
+    'scala.Tuple2'
+]
+
+
+def connect(port):
+    """Connect to the gateway on `port`, as :func:`pyspark.java_gateway.launch_gateway`
+    connects to the JVM it launches."""
+    from py4j.java_gateway import JavaGateway, GatewayParameters, java_import
+
+    gateway = JavaGateway(gateway_parameters=GatewayParameters(port=port, auto_convert=True))
+    for name in _pyspark_imports:
+        java_import(gateway.jvm, name)
+    return gateway
+
+
+def _spark_submit():
+    from pyspark.find_spark_home import _find_spark_home
+    return os.path.join(_find_spark_home(), 'bin', 'spark-submit')
+
+
+def main(argv=None):
+    import pkg_resources
+
+    parser = argparse.ArgumentParser(prog='python -m hail.gateway', description='Run a shared Hail JVM.')
+    parser.add_argument('--port', type=int, default=25333)
+    parser.add_argument('--app-name', default='Hail gateway')
+    parser.add_argument('--master')
+    parser.add_argument('--log', default='hail-gateway.log')
+    parser.add_argument('--min-block-size', type=int, default=1)
+    parser.add_argument('--branching-factor', type=int, default=50)
+    parser.add_argument('--tmp-dir', default=os.environ.get('TMPDIR', '/tmp'))
+    parser.add_argument('--jar', help='Hail jar, by default the one installed with this package')
+    parser.add_argument('spark_args', nargs=argparse.REMAINDER)
+    args = parser.parse_args(argv)
+
+    jar = args.jar or pkg_resources.resource_filename('hail', 'hail-all-spark.jar')
+    if not os.path.exists(jar):
+        raise FileNotFoundError(f'Hail jar not found at {jar}; use --jar')
+
+    gateway_args = ['--port', str(args.port),
+                    '--app-name', args.app_name,
+                    '--log', args.log,
+                    '--min-block-size', str(args.min_block_size),
+                    '--branching-factor', str(args.branching_factor),
+                    '--tmp-dir', args.tmp_dir]
+    if args.master is not None:
+        gateway_args += ['--master', args.master]
+    spark_args = [a for a in args.spark_args if a != '--']
+
+    command = [_spark_submit(),
+               '--class', 'is.hail.backend.HailGateway',
+               '--conf', f'spark.driver.extraClassPath={jar}',
+               '--conf', f'spark.executor.extraClassPath={jar}',
+               *spark_args,
+               jar,
+               *gateway_args]
+    return subprocess.call(command)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
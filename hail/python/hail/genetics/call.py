@@ -1,3 +1,5 @@
+import math
+
 from hail.typecheck import *
 from hail.utils.java import *
 
@@ -15,36 +17,73 @@ class Call(object):
         `alleles`.
     """
 
-    _cached_jobject = None
-
-    @staticmethod
-    def _call_jobject():
-        if not Call._cached_jobject:
-            Call._cached_jobject = scala_object(Env.hail().variant, 'Call')
-        return Call._cached_jobject
+    __slots__ = ['_call', '_alleles']
 
     @typecheck_method(alleles=sequenceof(int),
                       phased=bool)
     def __init__(self, alleles, phased=False):
-        if len(alleles) > 2:
+        ploidy = len(alleles)
+        if ploidy > 2:
             raise NotImplementedError("Calls with greater than 2 alleles are not supported.")
-        self._phased = phased
-        self._alleles = alleles
-        self._ploidy = len(alleles)
-        self._call = scala_object(Env.hail().variant, 'CallN').apply(alleles, phased)
+        if ploidy == 0:
+            ar = 0
+        elif ploidy == 1:
+            ar = alleles[0]
+            if ar < 0:
+                raise FatalError("allele index must be >= 0. Found {}.".format(ar))
+        else:
+            j, k = alleles
+            if j < 0 or k < 0:
+                raise FatalError("allele indices must be >= 0. Found j={} and k={}.".format(j, k))
+            if phased:
+                ar = _diploid_gt_index(j, j + k)
+            elif k < j:
+                ar = _diploid_gt_index(k, j)
+            else:
+                ar = _diploid_gt_index(j, k)
+        if ar >> 29 != 0:
+            raise FatalError("invalid allele representation: {}. Max value is 2^29 - 1".format(ar))
+        self._call = (ar << 3) | (ploidy << 1) | int(phased)
+        self._alleles = list(alleles)
 
     @classmethod
     def _from_java(cls, jc):
         c = Call.__new__(cls)
         c._call = jc
         c._alleles = None
-        c._phased = None
-        c._ploidy = None
-        super(Call, c).__init__()
         return c
 
+    @classmethod
+    def _parse(cls, s):
+        phased = s.startswith('|')
+        if s == '-' or s == '|-':
+            return Call([], phased)
+        sep = '|' if phased or '|' in s else '/'
+        try:
+            alleles = [int(a) for a in (s[1:] if phased else s).split(sep)]
+        except ValueError:
+            raise FatalError("invalid call expression: `{}'".format(s)) from None
+        return Call(alleles, phased or sep == '|')
+
+    def _allele_repr(self):
+        return self._call >> 3
+
+    def _allele_pair(self):
+        j, k = _allele_pair(self._call >> 3)
+        if self._call & 0x1:
+            return j, k - j
+        return j, k
+
     def __str__(self):
-        return Call._call_jobject().toString(self._call)
+        ploidy = self.ploidy
+        phased = self.phased
+        if ploidy == 0:
+            return '|-' if phased else '-'
+        elif ploidy == 1:
+            return '|{}'.format(self._allele_repr()) if phased else str(self._allele_repr())
+        else:
+            j, k = self._allele_pair()
+            return '{}{}{}'.format(j, '|' if phased else '/', k)
 
     def __repr__(self):
         return 'Call(alleles=%s, phased=%s)' % (self.alleles, self.phased)
@@ -75,7 +114,13 @@ class Call(object):
         """
 
         if self._alleles is None:
-            self._alleles = jarray_to_list(Call._call_jobject().alleles(self._call))
+            ploidy = self.ploidy
+            if ploidy == 0:
+                self._alleles = []
+            elif ploidy == 1:
+                self._alleles = [self._allele_repr()]
+            else:
+                self._alleles = list(self._allele_pair())
         return self._alleles
 
     @property
@@ -87,9 +132,7 @@ class Call(object):
         :obj:`int`
         """
 
-        if not self._ploidy:
-            self._ploidy = Call._call_jobject().ploidy(self._call)
-        return self._ploidy
+        return (self._call >> 1) & 0x3
 
     @property
     def phased(self):
@@ -100,9 +143,7 @@ class Call(object):
         :obj:`bool`
         """
 
-        if not self._phased:
-            self._phased = Call._call_jobject().isPhased(self._call)
-        return self._phased
+        return (self._call & 0x1) == 1
 
     def is_haploid(self):
         """True if the ploidy == 1.
@@ -110,7 +151,7 @@ class Call(object):
         :rtype: bool
         """
 
-        return Call._call_jobject().isHaploid(self._call)
+        return self.ploidy == 1
 
     def is_diploid(self):
         """True if the ploidy == 2.
@@ -118,7 +159,7 @@ class Call(object):
         :rtype: bool
         """
 
-        return Call._call_jobject().isDiploid(self._call)
+        return self.ploidy == 2
 
     def is_hom_ref(self):
         """True if the call has no alternate alleles.
@@ -126,7 +167,7 @@ class Call(object):
         :rtype: bool
         """
 
-        return Call._call_jobject().isHomRef(self._call)
+        return self.ploidy > 0 and self._allele_repr() == 0
 
     def is_het(self):
         """True if the call contains two different alleles.
@@ -134,7 +175,10 @@ class Call(object):
         :rtype: bool
         """
 
-        return Call._call_jobject().isHet(self._call)
+        if self.ploidy != 2 or self._allele_repr() == 0:
+            return False
+        j, k = self._allele_pair()
+        return j != k
 
     def is_hom_var(self):
         """True if the call contains two identical alternate alleles.
@@ -142,7 +186,13 @@ class Call(object):
         :rtype: bool
         """
 
-        return Call._call_jobject().isHomVar(self._call)
+        ploidy = self.ploidy
+        if ploidy == 0 or self._allele_repr() == 0:
+            return False
+        if ploidy == 1:
+            return True
+        j, k = self._allele_pair()
+        return j == k
 
     def is_non_ref(self):
         """True if the call contains any non-reference alleles.
@@ -150,7 +200,7 @@ class Call(object):
         :rtype: bool
         """
 
-        return Call._call_jobject().isNonRef(self._call)
+        return self.ploidy > 0 and self._allele_repr() > 0
 
     def is_het_non_ref(self):
         """True if the call contains two different alternate alleles.
@@ -158,7 +208,10 @@ class Call(object):
         :rtype: bool
         """
 
-        return Call._call_jobject().isHetNonRef(self._call)
+        if self.ploidy != 2 or self._allele_repr() == 0:
+            return False
+        j, k = self._allele_pair()
+        return j > 0 and k > 0 and j != k
 
     def is_het_ref(self):
         """True if the call contains one reference and one alternate allele.
@@ -166,7 +219,10 @@ class Call(object):
         :rtype: bool
         """
 
-        return Call._call_jobject().isHetRef(self._call)
+        if self.ploidy != 2 or self._allele_repr() == 0:
+            return False
+        j, k = self._allele_pair()
+        return (j == 0 and k > 0) or (k == 0 and j > 0)
 
     def n_alt_alleles(self):
         """Returns the count of non-reference alleles.
@@ -174,7 +230,7 @@ class Call(object):
         :rtype: int
         """
 
-        return Call._call_jobject().nNonRefAlleles(self._call)
+        return sum(1 for a in self.alleles if a != 0)
 
     @typecheck_method(n_alleles=int)
     def one_hot_alleles(self, n_alleles):
@@ -211,7 +267,11 @@ class Call(object):
         -------
         :obj:`list` of :obj:`int`
         """
-        return jiterable_to_list(Call._call_jobject().oneHotAlleles(self._call, n_alleles))
+        one_hot = [0] * n_alleles
+        for a in self.alleles:
+            if a < n_alleles:
+                one_hot[a] += 1
+        return one_hot
 
     def unphased_diploid_gt_index(self):
         """Return the genotype index for unphased, diploid calls.
@@ -224,4 +284,14 @@ class Call(object):
         if self.ploidy != 2 or self.phased:
             raise FatalError(
                 "'unphased_diploid_gt_index' is only valid for unphased, diploid calls. Found {}.".format(repr(self)))
-        return Call._call_jobject().unphasedDiploidGtIndex(self._call)
+        return self._allele_repr()
+
+
+def _diploid_gt_index(j, k):
+    return k * (k + 1) // 2 + j
+
+
+def _allele_pair(i):
+    k = int(math.sqrt(8 * i + 1) / 2 - 0.5)
+    j = i - k * (k + 1) // 2
+    return j, k
@@ -1,6 +1,6 @@
 from hail.genetics.reference_genome import ReferenceGenome, reference_genome_type
 from hail.typecheck import *
-from hail.utils.java import scala_object, Env
+from hail.utils.java import scala_object, Env, FatalError
 import hail as hl
 
 class Locus(object):
@@ -14,6 +14,8 @@ class Locus(object):
     :type reference_genome: :obj:`str` or :class:`.ReferenceGenome`
     """
 
+    __slots__ = ['_contig', '_position', '_rg', '_jlocus']
+
     @typecheck_method(contig=oneof(str, int),
                       position=int,
                       reference_genome=reference_genome_type)
@@ -21,37 +23,51 @@ class Locus(object):
         if isinstance(contig, int):
             contig = str(contig)
 
+        reference_genome._check_locus(contig, position)
         self._rg = reference_genome
-
-        jrep = scala_object(Env.hail().variant, 'Locus').apply(contig, position, self._rg._jrep)
-        self._init_from_java(jrep)
         self._contig = contig
         self._position = position
+        self._jlocus = None
+
+    @property
+    def _jrep(self):
+        if self._jlocus is None:
+            self._jlocus = scala_object(Env.hail().variant, 'Locus').apply(self._contig, self._position, self._rg._jrep)
+        return self._jlocus
 
     def __str__(self):
-        return self._jrep.toString()
+        return '{}:{}'.format(self._contig, self._position)
 
     def __repr__(self):
         return 'Locus(contig=%s, position=%s, reference_genome=%s)' % (self.contig, self.position, self._rg)
 
     def __eq__(self, other):
-        return isinstance(other, Locus) and self._jrep.equals(other._jrep) and self._rg._jrep == other._rg._jrep
+        return (isinstance(other, Locus)
+                and self._position == other._position
+                and self._contig == other._contig
+                and self._rg == other._rg)
 
     def __hash__(self):
-        return self._jrep.hashCode()
-
-    def _init_from_java(self, jrep):
-        self._jrep = jrep
+        return hash((self._contig, self._position))
 
     @classmethod
-    def _from_java(cls, jrep, reference_genome):
+    def _from_fields(cls, contig, position, reference_genome):
+        """Build a locus from fields already validated against
+        `reference_genome`, e.g. values decoded from the backend."""
         l = Locus.__new__(cls)
-        l._init_from_java(jrep)
-        l._contig = jrep.contig()
-        l._position = jrep.position()
+        l._contig = contig
+        l._position = position
         l._rg = reference_genome
-        reference_genome._check_locus(jrep)
-        super(Locus, l).__init__()
+        l._jlocus = None
+        return l
+
+    @classmethod
+    def _from_java(cls, jrep, reference_genome):
+        contig = jrep.contig()
+        position = jrep.position()
+        reference_genome._check_locus(contig, position)
+        l = Locus._from_fields(contig, position, reference_genome)
+        l._jlocus = jrep
         return l
 
     @classmethod
@@ -72,7 +88,15 @@ class Locus(object):
         :rtype: :class:`.Locus`
         """
 
-        return Locus._from_java(scala_object(Env.hail().variant, 'Locus').parse(string, reference_genome._jrep), reference_genome)
+        elements = string.split(':')
+        if len(elements) < 2:
+            raise FatalError("Invalid string for Locus. Expecting contig:pos -- found `{}'.".format(string))
+        contig = ':'.join(elements[:-1])
+        try:
+            position = int(elements[-1])
+        except ValueError:
+            raise FatalError("Invalid string for Locus. Expecting contig:pos -- found `{}'.".format(string)) from None
+        return Locus(contig, position, reference_genome)
 
     @property
     def contig(self):
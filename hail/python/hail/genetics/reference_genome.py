@@ -1,6 +1,6 @@
 from hail.typecheck import *
 from hail.utils import wrap_to_list
-from hail.utils.java import jiterable_to_list, Env, joption
+from hail.utils.java import jiterable_to_list, Env, joption, FatalError
 from hail.typecheck import oneof, transformed
 import hail as hl
 
@@ -96,9 +96,11 @@ class ReferenceGenome(object):
         self._mt_contigs = mt_contigs
         self._par = None
         self._par_tuple = par
+        self._contig_indices = None
 
         super(ReferenceGenome, self).__init__()
         ReferenceGenome._references[name] = self
+        hl.expr.types._dtype_cache.clear()
 
     def __str__(self):
         return self._jrep.toString()
@@ -110,7 +112,7 @@ class ReferenceGenome(object):
                (self.name, self.contigs, self.lengths, self.x_contigs, self.y_contigs, self.mt_contigs, self._par_tuple)
 
     def __eq__(self, other):
-        return isinstance(other, ReferenceGenome) and self._jrep.equals(other._jrep)
+        return self is other or (isinstance(other, ReferenceGenome) and self._jrep.equals(other._jrep))
 
     def __hash__(self):
         return self._jrep.hashCode()
@@ -478,12 +480,25 @@ class ReferenceGenome(object):
         gr._mt_contigs = None
         gr._par = None
         gr._par_tuple = None
+        gr._contig_indices = None
         super(ReferenceGenome, gr).__init__()
         ReferenceGenome._references[gr.name] = gr
+        hl.expr.types._dtype_cache.clear()
         return gr
 
-    def _check_locus(self, l_jrep):
-        self._jrep.checkLocus(l_jrep)
+    def _contig_index(self, contig):
+        if self._contig_indices is None:
+            self._contig_indices = {c: i for i, c in enumerate(self.contigs)}
+        return self._contig_indices[contig]
+
+    def _check_locus(self, contig, position):
+        length = self.lengths.get(contig)
+        if length is None:
+            raise FatalError("Invalid locus `{}:{}' found. Contig `{}' is not in the reference genome `{}'."
+                             .format(contig, position, contig, self.name))
+        if not 1 <= position <= length:
+            raise FatalError("Invalid locus `{}:{}' found. Position `{}' is not within the range [1-{}] for reference genome `{}'."
+                             .format(contig, position, position, length, self.name))
 
     def _check_interval(self, interval_jrep):
         self._jrep.checkInterval(interval_jrep)
@@ -4,3 +4,4 @@ from .matrix_ir import *
 from .utils import *
 from .matrix_reader import *
 from .matrix_writer import *
+from .optimizer import optimize
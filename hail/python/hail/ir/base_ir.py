@@ -1,14 +1,43 @@
 import abc
+import os
+
 from .renderer import Renderer
 from hail.expr.matrix_type import *
 from hail.expr.table_type import *
 from hail.utils.java import Env
 
+# When set, every type inferred in Python is checked against the type the
+# backend infers for the same IR. This costs a round trip per relational node
+# and untyped value node, so it is meant for debugging only.
+_check_types = bool(os.environ.get('HAIL_CHECK_IR_TYPES'))
+
 
 class BaseIR(object):
     def __init__(self):
         super().__init__()
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # a class defining __eq__ without __hash__ gets __hash__ = None; keep
+        # the structural hash instead
+        if '__hash__' in cls.__dict__ and cls.__dict__['__hash__'] is None:
+            cls.__hash__ = BaseIR.__hash__
+
+    def __hash__(self):
+        """Structural hash, consistent with ``__eq__``: structurally equal IRs
+        have equal hashes. Computed once per node and memoized."""
+        h = getattr(self, '_hash', None)
+        if h is None:
+            h = _structural_hash(self)
+        return h
+
+    def _structural_parts(self):
+        """The parts of this node compared by the structural hash and
+        :func:`.structurally_equal`, and its children: by default, its
+        rendering split around its children, with strings at even indices and
+        children at odd ones."""
+        return Renderer(stop_at_jir=False)._render_node(self)
+
     def __str__(self):
         r = Renderer(stop_at_jir = False)
         return r(self)
@@ -26,6 +55,7 @@ class IR(BaseIR):
     def __init__(self, *children):
         super().__init__()
         self._aggregations = None
+        self._type = None
         self.children = children
 
     @property
@@ -63,7 +93,36 @@ class IR(BaseIR):
 
     @property
     def typ(self):
-        jir = Env.hc()._backend._to_java_ir(self)
+        if self._type is None:
+            self.compute_type({})
+        return self._type
+
+    def compute_type(self, env):
+        """Infer the type of this IR, given the types of its free variables in
+        `env`, a dict from name to type. Types are memoized on each node, so
+        each subexpression is typed at most once."""
+        if self._type is None:
+            self._type = self._compute_type(env)
+            if _check_types:
+                _check_type(self, self._backend_type(env))
+        return self._type
+
+    def _assign_type(self, typ):
+        """Record the type of this IR, already known to the caller, e.g. the
+        dtype of the expression it was built for."""
+        if self._type is None:
+            self._type = typ
+
+    def _compute_type(self, env):
+        # nodes without a Python typing rule, such as function applications
+        # built outside the expression language, are typed by the backend
+        return self._backend_type(env)
+
+    def _backend_type(self, env):
+        r = Renderer(stop_at_jir=True)
+        code = r(self)
+        ref_map = {name: t._parsable_string() for name, t in env.items()}
+        jir = self.parse(code, ref_map=ref_map, ir_map=r.jirs)
         return dtype(jir.typ().toString())
 
     def parse(self, code, ref_map={}, ir_map={}):
@@ -73,10 +132,21 @@ class IR(BaseIR):
 class TableIR(BaseIR):
     def __init__(self):
         super().__init__()
+        self._type = None
 
     @property
     def typ(self):
-        jtir = Env.hc()._backend._to_java_ir(self)
+        if self._type is None:
+            self._type = self._compute_type()
+            if _check_types:
+                _check_type(self, self._backend_type())
+        return self._type
+
+    def _compute_type(self):
+        return self._backend_type()
+
+    def _backend_type(self):
+        jtir = Env.backend()._to_java_ir(self)
         return ttable._from_java(jtir.typ())
 
     def parse(self, code, ref_map={}, ir_map={}):
@@ -86,11 +156,70 @@ class TableIR(BaseIR):
 class MatrixIR(BaseIR):
     def __init__(self):
         super().__init__()
+        self._type = None
 
     @property
     def typ(self):
-        jmir = Env.hc()._backend._to_java_ir(self)
+        if self._type is None:
+            self._type = self._compute_type()
+            if _check_types:
+                _check_type(self, self._backend_type())
+        return self._type
+
+    def _compute_type(self):
+        return self._backend_type()
+
+    def _backend_type(self):
+        jmir = Env.backend()._to_java_ir(self)
         return tmatrix._from_java(jmir.typ())
 
     def parse(self, code, ref_map={}, ir_map={}):
         return Env.hail().expr.ir.IRParser.parse_matrix_ir(code, ref_map, ir_map)
+
+
+def _check_type(x, expected):
+    if x._type != expected:
+        raise AssertionError(f'{type(x).__name__}: inferred type {x._type} does not match the '
+                             f'type inferred by the backend, {expected}:\n{x}')
+
+
+def _structural_hash(root):
+    # iterative post-order, so deep IRs do not hit the recursion limit; each
+    # node is hashed from its own parts and the hashes of its children
+    pending = {}
+    stack = [root]
+    while stack:
+        x = stack[-1]
+        if getattr(x, '_hash', None) is not None:
+            stack.pop()
+            continue
+        parts = pending.pop(id(x), None)
+        if parts is None:
+            parts, children = x._structural_parts()
+            pending[id(x)] = parts
+            stack.extend(c for c in children if getattr(c, '_hash', None) is None)
+        else:
+            x._hash = hash((type(x).__name__,) + tuple(p if i % 2 == 0 else p._hash for i, p in enumerate(parts)))
+            stack.pop()
+    return root._hash
+
+
+def structurally_equal(left, right):
+    """Whether `left` and `right` render the same, like ``left == right`` for
+    value IR but iterative, so deep IRs do not hit the recursion limit. Table
+    and matrix nodes are equal only if identical."""
+    compared = set()
+    stack = [(left, right)]
+    while stack:
+        x, y = stack.pop()
+        if x is y or (id(x), id(y)) in compared:
+            continue
+        if type(x) is not type(y) or not isinstance(x, IR) or hash(x) != hash(y):
+            return False
+        x_parts, _ = x._structural_parts()
+        y_parts, _ = y._structural_parts()
+        if len(x_parts) != len(y_parts) or x_parts[::2] != y_parts[::2]:
+            return False
+        compared.add((id(x), id(y)))
+        stack.extend(zip(x_parts[1::2], y_parts[1::2]))
+    return True
@@ -1,7 +1,9 @@
 import copy
+import hashlib
 
 import hail
-from hail.expr.types import hail_type
+from hail.expr.types import hail_type, tint32, tint64, tfloat32, tfloat64, tstr, tbool, tvoid, \
+    tarray, tset, tdict, tstruct, ttuple
 from hail.utils.java import escape_str, escape_id, dump_json, parsable_strings
 from .base_ir import *
 from .matrix_writer import MatrixWriter, MatrixNativeMultiWriter
@@ -20,6 +22,9 @@ class I32(IR):
     def render(self, r):
         return '(I32 {})'.format(self.x)
 
+    def _compute_type(self, env):
+        return tint32
+
     def __eq__(self, other):
         return isinstance(other, I32) and \
                other.x == self.x
@@ -38,6 +43,9 @@ class I64(IR):
     def render(self, r):
         return '(I64 {})'.format(self.x)
 
+    def _compute_type(self, env):
+        return tint64
+
     def __eq__(self, other):
         return isinstance(other, I64) and \
                other.x == self.x
@@ -56,6 +64,9 @@ class F32(IR):
     def render(self, r):
         return '(F32 {})'.format(self.x)
 
+    def _compute_type(self, env):
+        return tfloat32
+
     def __eq__(self, other):
         return isinstance(other, F32) and \
                other.x == self.x
@@ -74,6 +85,9 @@ class F64(IR):
     def render(self, r):
         return '(F64 {})'.format(self.x)
 
+    def _compute_type(self, env):
+        return tfloat64
+
     def __eq__(self, other):
         return isinstance(other, F64) and \
                other.x == self.x
@@ -92,6 +106,9 @@ class Str(IR):
     def render(self, r):
         return '(Str "{}")'.format(escape_str(self.x))
 
+    def _compute_type(self, env):
+        return tstr
+
     def __eq__(self, other):
         return isinstance(other, Str) and \
                other.x == self.x
@@ -108,6 +125,9 @@ class FalseIR(IR):
     def render(self, r):
         return '(False)'
 
+    def _compute_type(self, env):
+        return tbool
+
     def __eq__(self, other):
         return isinstance(other, FalseIR)
 
@@ -123,6 +143,9 @@ class TrueIR(IR):
     def render(self, r):
         return '(True)'
 
+    def _compute_type(self, env):
+        return tbool
+
     def __eq__(self, other):
         return isinstance(other, TrueIR)
 
@@ -138,6 +161,9 @@ class Void(IR):
     def render(self, r):
         return '(Void)'
 
+    def _compute_type(self, env):
+        return tvoid
+
     def __eq__(self, other):
         return isinstance(other, Void)
 
@@ -149,10 +175,6 @@ class Cast(IR):
         self.v = v
         self._typ = typ
 
-    @property
-    def typ(self):
-        return self._typ
-
     @typecheck_method(v=IR)
     def copy(self, v):
         new_instance = self.__class__
@@ -161,6 +183,9 @@ class Cast(IR):
     def render(self, r):
         return '(Cast {} {})'.format(self._typ._parsable_string(), r(self.v))
 
+    def _compute_type(self, env):
+        return self._typ
+
     def __eq__(self, other):
         return isinstance(other, Cast) and \
         other.v == self.v and \
@@ -173,10 +198,6 @@ class NA(IR):
         super().__init__()
         self._typ = typ
 
-    @property
-    def typ(self):
-        return self._typ
-
     def copy(self):
         new_instance = self.__class__
         return new_instance(self._typ)
@@ -184,6 +205,9 @@ class NA(IR):
     def render(self, r):
         return '(NA {})'.format(self._typ._parsable_string())
 
+    def _compute_type(self, env):
+        return self._typ
+
     def __eq__(self, other):
         return isinstance(other, NA) and \
                other._typ == self._typ
@@ -203,6 +227,9 @@ class IsNA(IR):
     def render(self, r):
         return '(IsNA {})'.format(r(self.value))
 
+    def _compute_type(self, env):
+        return tbool
+
     def __eq__(self, other):
         return isinstance(other, IsNA) and \
                other.value == self.value
@@ -224,6 +251,9 @@ class If(IR):
     def render(self, r):
         return '(If {} {} {})'.format(r(self.cond), r(self.cnsq), r(self.altr))
 
+    def _compute_type(self, env):
+        return self.cnsq.compute_type(env)
+
     def __eq__(self, other):
         return isinstance(other, If) and \
                other.cond == self.cond and \
@@ -250,6 +280,9 @@ class Let(IR):
     def bound_variables(self):
         return {self.name} | super().bound_variables
 
+    def _compute_type(self, env):
+        return self.body.compute_type(_bind(env, self.name, self.value.compute_type(env)))
+
     def __eq__(self, other):
         return isinstance(other, Let) and \
                other.name == self.name and \
@@ -270,6 +303,12 @@ class Ref(IR):
     def render(self, r):
         return '(Ref {})'.format(escape_id(self.name))
 
+    def _compute_type(self, env):
+        t = env.get(self.name)
+        if t is None:
+            raise KeyError(f"unbound variable '{self.name}'")
+        return t
+
     def __eq__(self, other):
         return isinstance(other, Ref) and \
                other.name == self.name
@@ -309,6 +348,12 @@ class ApplyBinaryOp(IR):
     def render(self, r):
         return '(ApplyBinaryPrimOp {} {} {})'.format(escape_id(self.op), r(self.l), r(self.r))
 
+    def _compute_type(self, env):
+        t = self.l.compute_type(env)
+        if self.op == '/':
+            return tfloat64 if t == tfloat64 else tfloat32
+        return t
+
     def __eq__(self, other):
         return isinstance(other, ApplyBinaryOp) and \
                other.op == self.op and \
@@ -331,6 +376,9 @@ class ApplyUnaryOp(IR):
     def render(self, r):
         return '(ApplyUnaryPrimOp {} {})'.format(escape_id(self.op), r(self.x))
 
+    def _compute_type(self, env):
+        return self.x.compute_type(env)
+
     def __eq__(self, other):
         return isinstance(other, ApplyUnaryOp) and \
                other.op == self.op and \
@@ -353,6 +401,9 @@ class ApplyComparisonOp(IR):
     def render(self, r):
         return '(ApplyComparisonOp {} {} {})'.format(escape_id(self.op), r(self.l), r(self.r))
 
+    def _compute_type(self, env):
+        return tint32 if self.op in ('compare', 'Compare') else tbool
+
     def __eq__(self, other):
         return isinstance(other, ApplyComparisonOp) and \
                other.op == self.op and \
@@ -376,6 +427,11 @@ class MakeArray(IR):
             self._element_type._parsable_string() if self._element_type is not None else 'None',
             ' '.join([r(x) for x in self.args]))
 
+    def _compute_type(self, env):
+        if self._element_type is not None:
+            return self._element_type
+        return tarray(self.args[0].compute_type(env))
+
     def __eq__(self, other):
         return isinstance(other, MakeArray) and \
                other.args == self.args and \
@@ -397,6 +453,9 @@ class ArrayRef(IR):
     def render(self, r):
         return '(ArrayRef {} {})'.format(r(self.a), r(self.i))
 
+    def _compute_type(self, env):
+        return self.a.compute_type(env).element_type
+
     def __eq__(self, other):
         return isinstance(other, ArrayRef) and \
                other.a == self.a and \
@@ -417,6 +476,9 @@ class ArrayLen(IR):
     def render(self, r):
         return '(ArrayLen {})'.format(r(self.a))
 
+    def _compute_type(self, env):
+        return tint32
+
     def __eq__(self, other):
         return isinstance(other, ArrayLen) and \
                other.a == self.a
@@ -438,6 +500,9 @@ class ArrayRange(IR):
     def render(self, r):
         return '(ArrayRange {} {} {})'.format(r(self.start), r(self.stop), r(self.step))
 
+    def _compute_type(self, env):
+        return tarray(tint32)
+
     def __eq__(self, other):
         return isinstance(other, ArrayRange) and \
                other.start == self.start and \
@@ -461,6 +526,9 @@ class ArraySort(IR):
     def render(self, r):
         return '(ArraySort {} {} {})'.format(self.on_key, r(self.a), r(self.ascending))
 
+    def _compute_type(self, env):
+        return tarray(self.a.compute_type(env).element_type)
+
     def __eq__(self, other):
         return isinstance(other, ArraySort) and \
                other.a == self.a and \
@@ -482,6 +550,9 @@ class ToSet(IR):
     def render(self, r):
         return '(ToSet {})'.format(r(self.a))
 
+    def _compute_type(self, env):
+        return tset(self.a.compute_type(env).element_type)
+
     def __eq__(self, other):
         return isinstance(other, ToSet) and \
                other.a == self.a
@@ -501,6 +572,10 @@ class ToDict(IR):
     def render(self, r):
         return '(ToDict {})'.format(r(self.a))
 
+    def _compute_type(self, env):
+        t = self.a.compute_type(env).element_type
+        return tdict(*_element_types(t))
+
     def __eq__(self, other):
         return isinstance(other, ToDict) and \
                other.a == self.a
@@ -520,6 +595,9 @@ class ToArray(IR):
     def render(self, r):
         return '(ToArray {})'.format(r(self.a))
 
+    def _compute_type(self, env):
+        return tarray(self.a.compute_type(env).element_type)
+
     def __eq__(self, other):
         return isinstance(other, ToArray) and \
                other.a == self.a
@@ -541,6 +619,9 @@ class LowerBoundOnOrderedCollection(IR):
     def render(self, r):
         return '(LowerBoundOnOrderedCollection {} {} {})'.format(self.on_key, r(self.ordered_collection), r(self.elem))
 
+    def _compute_type(self, env):
+        return tint32
+
     def __eq__(self, other):
         return isinstance(other, LowerBoundOnOrderedCollection) and \
                other.ordered_collection == self.ordered_collection and \
@@ -562,6 +643,10 @@ class GroupByKey(IR):
     def render(self, r):
         return '(GroupByKey {})'.format(r(self.collection))
 
+    def _compute_type(self, env):
+        k, v = _element_types(self.collection.compute_type(env).element_type)
+        return tdict(k, tarray(v))
+
     def __eq__(self, other):
         return isinstance(other, GroupByKey) and \
                other.collection == self.collection
@@ -587,6 +672,10 @@ class ArrayMap(IR):
     def bound_variables(self):
         return {self.name} | super().bound_variables
 
+    def _compute_type(self, env):
+        t = self.a.compute_type(env).element_type
+        return tarray(self.body.compute_type(_bind(env, self.name, t)))
+
     def __eq__(self, other):
         return isinstance(other, ArrayMap) and \
                other.a == self.a and \
@@ -614,6 +703,9 @@ class ArrayFilter(IR):
     def bound_variables(self):
         return {self.name} | super().bound_variables
 
+    def _compute_type(self, env):
+        return tarray(self.a.compute_type(env).element_type)
+
     def __eq__(self, other):
         return isinstance(other, ArrayFilter) and \
                other.a == self.a and \
@@ -641,6 +733,10 @@ class ArrayFlatMap(IR):
     def bound_variables(self):
         return {self.name} | super().bound_variables
 
+    def _compute_type(self, env):
+        t = self.a.compute_type(env).element_type
+        return tarray(self.body.compute_type(_bind(env, self.name, t)).element_type)
+
     def __eq__(self, other):
         return isinstance(other, ArrayFlatMap) and \
                other.a == self.a and \
@@ -672,6 +768,9 @@ class ArrayFold(IR):
     def bound_variables(self):
         return {self.accum_name, self.value_name} | super().bound_variables
 
+    def _compute_type(self, env):
+        return self.zero.compute_type(env)
+
     def __eq__(self, other):
         return isinstance(other, ArrayFold) and \
                other.a == self.a and \
@@ -705,6 +804,9 @@ class ArrayScan(IR):
     def bound_variables(self):
         return {self.accum_name, self.value_name} | super().bound_variables
 
+    def _compute_type(self, env):
+        return tarray(self.zero.compute_type(env))
+
     def __eq__(self, other):
         return isinstance(other, ArrayScan) and \
                other.a == self.a and \
@@ -739,6 +841,11 @@ class ArrayLeftJoinDistinct(IR):
     def bound_variables(self):
         return {self.l_name, self.r_name} | super().bound_variables
 
+    def _compute_type(self, env):
+        env = _bind(env, self.l_name, self.left.compute_type(env).element_type)
+        env = _bind(env, self.r_name, self.right.compute_type(env).element_type)
+        return tarray(self.join.compute_type(env))
+
     def __eq__(self, other):
         return isinstance(other, ArrayLeftJoinDistinct) and \
                other.left == self.left and \
@@ -769,6 +876,9 @@ class ArrayFor(IR):
     def bound_variables(self):
         return {self.value_name} | super().bound_variables
 
+    def _compute_type(self, env):
+        return tvoid
+
     def __eq__(self, other):
         return isinstance(other, ArrayFor) and \
                other.a == self.a and \
@@ -791,6 +901,9 @@ class AggFilter(IR):
     def render(self, r):
         return '(AggFilter {} {})'.format(r(self.cond), r(self.agg_ir))
 
+    def _compute_type(self, env):
+        return self.agg_ir.compute_type(env)
+
     def __eq__(self, other):
         return isinstance(other, AggFilter) and \
                other.cond == self.cond and \
@@ -817,6 +930,10 @@ class AggExplode(IR):
     def bound_variables(self):
         return {self.name} | super().bound_variables
 
+    def _compute_type(self, env):
+        t = self.array.compute_type(env).element_type
+        return self.agg_body.compute_type(_bind(env, self.name, t))
+
     def __eq__(self, other):
         return isinstance(other, AggExplode) and \
                other.array == self.array and \
@@ -839,6 +956,9 @@ class AggGroupBy(IR):
     def render(self, r):
         return '(AggGroupBy {} {})'.format(r(self.key), r(self.agg_ir))
 
+    def _compute_type(self, env):
+        return tdict(self.key.compute_type(env), self.agg_ir.compute_type(env))
+
     def __eq__(self, other):
         return isinstance(other, AggGroupBy) and \
                other.key == self.key and \
@@ -919,6 +1039,9 @@ class Begin(IR):
     def render(self, r):
         return '(Begin {})'.format(' '.join([r(x) for x in self.xs]))
 
+    def _compute_type(self, env):
+        return tvoid
+
     def __eq__(self, other):
         return isinstance(other, Begin) \
                and other.xs == self.xs
@@ -938,6 +1061,9 @@ class MakeStruct(IR):
     def render(self, r):
         return '(MakeStruct {})'.format(' '.join(['({} {})'.format(escape_id(f), r(x)) for (f, x) in self.fields]))
 
+    def _compute_type(self, env):
+        return tstruct(**{f: x.compute_type(env) for f, x in self.fields})
+
     def __eq__(self, other):
         return isinstance(other, MakeStruct) \
                and other.fields == self.fields
@@ -958,6 +1084,9 @@ class SelectFields(IR):
     def render(self, r):
         return '(SelectFields ({}) {})'.format(' '.join(map(escape_id, self.fields)), r(self.old))
 
+    def _compute_type(self, env):
+        return self.old.compute_type(env)._select_fields(self.fields)
+
     def __eq__(self, other):
         return isinstance(other, SelectFields) and \
                other.old == self.old and \
@@ -979,10 +1108,16 @@ class InsertFields(IR):
 
     def render(self, r):
         return '(InsertFields {} {} {})'.format(
-            self.old,
+            r(self.old),
             'None' if self.field_order is None else parsable_strings(self.field_order),
             ' '.join(['({} {})'.format(escape_id(f), r(x)) for (f, x) in self.fields]))
 
+    def _compute_type(self, env):
+        t = self.old.compute_type(env)._insert_fields(**{f: x.compute_type(env) for f, x in self.fields})
+        if self.field_order is not None:
+            t = t._select_fields(self.field_order)
+        return t
+
     def __eq__(self, other):
         return isinstance(other, InsertFields) and \
                other.old == self.old and \
@@ -1009,6 +1144,9 @@ class GetField(IR):
     def is_nested_field(self):
         return self.o.is_nested_field
 
+    def _compute_type(self, env):
+        return self.o.compute_type(env)[self.name]
+
     def __eq__(self, other):
         return isinstance(other, GetField) and \
                other.o == self.o and \
@@ -1028,6 +1166,9 @@ class MakeTuple(IR):
     def render(self, r):
         return '(MakeTuple {})'.format(' '.join([r(x) for x in self.elements]))
 
+    def _compute_type(self, env):
+        return ttuple(*[x.compute_type(env) for x in self.elements])
+
     def __eq__(self, other):
         return isinstance(other, MakeTuple) and \
                other.elements == self.elements
@@ -1048,6 +1189,9 @@ class GetTupleElement(IR):
     def render(self, r):
         return '(GetTupleElement {} {})'.format(self.idx, r(self.o))
 
+    def _compute_type(self, env):
+        return self.o.compute_type(env).types[self.idx]
+
     def __eq__(self, other):
         return isinstance(other, GetTupleElement) and \
                other.o == self.o and \
@@ -1070,6 +1214,9 @@ class StringSlice(IR):
     def render(self, r):
         return '(StringSlice {} {} {})'.format(r(self.s), r(self.start), r(self.end))
 
+    def _compute_type(self, env):
+        return tstr
+
     def __eq__(self, other):
         return isinstance(other, StringSlice) and \
                other.s == self.s and \
@@ -1091,6 +1238,9 @@ class StringLength(IR):
     def render(self, r):
         return '(StringLength {})'.format(r(self.s))
 
+    def _compute_type(self, env):
+        return tint32
+
     def __eq__(self, other):
         return isinstance(other, StringLength) and \
                other.s == self.s
@@ -1103,10 +1253,6 @@ class In(IR):
         self.i = i
         self._typ = typ
 
-    @property
-    def typ(self):
-        return self._typ
-
     def copy(self):
         new_instance = self.__class__
         return new_instance(self.i, self._typ)
@@ -1114,6 +1260,9 @@ class In(IR):
     def render(self, r):
         return '(In {} {})'.format(self._typ._parsable_string(), self.i)
 
+    def _compute_type(self, env):
+        return self._typ
+
     def __eq__(self, other):
         return isinstance(other, In) and \
                other.i == self.i and \
@@ -1127,10 +1276,6 @@ class Die(IR):
         self.message = message
         self._typ = typ
 
-    @property
-    def typ(self):
-        return self._typ
-
     def copy(self):
         new_instance = self.__class__
         return new_instance(self.message, self._typ)
@@ -1138,6 +1283,9 @@ class Die(IR):
     def render(self, r):
         return '(Die {} {})'.format(self._typ._parsable_string(), r(self.message))
 
+    def _compute_type(self, env):
+        return self._typ
+
     def __eq__(self, other):
         return isinstance(other, Die) and \
                other.message == self.message and \
@@ -1183,8 +1331,9 @@ class ApplySeeded(IR):
             ' '.join([r(x) for x in self.args]))
 
     def __eq__(self, other):
-        return isinstance(other, Apply) and \
+        return isinstance(other, ApplySeeded) and \
                other.function == self.function and \
+               other.seed == self.seed and \
                other.args == self.args
 
 
@@ -1210,6 +1359,9 @@ class Uniroot(IR):
     def bound_variables(self):
         return {self.argname} | super().bound_variables
 
+    def _compute_type(self, env):
+        return tfloat64
+
     def __eq__(self, other):
         return isinstance(other, Uniroot) and \
                other.argname == self.argname and \
@@ -1232,6 +1384,9 @@ class TableCount(IR):
     def render(self, r):
         return '(TableCount {})'.format(r(self.child))
 
+    def _compute_type(self, env):
+        return tint64
+
     def __eq__(self, other):
         return isinstance(other, TableCount) and \
                other.child == self.child
@@ -1251,6 +1406,9 @@ class TableGetGlobals(IR):
     def render(self, r):
         return '(TableGetGlobals {})'.format(r(self.child))
 
+    def _compute_type(self, env):
+        return self.child.typ.global_type
+
     def __eq__(self, other):
         return isinstance(other, TableGetGlobals) and \
                other.child == self.child
@@ -1270,6 +1428,10 @@ class TableCollect(IR):
     def render(self, r):
         return '(TableCollect {})'.format(r(self.child))
 
+    def _compute_type(self, env):
+        t = self.child.typ
+        return tstruct(rows=tarray(t.row_type), **{'global': t.global_type})
+
     def __eq__(self, other):
         return isinstance(other, TableCollect) and \
                other.child == self.child
@@ -1290,6 +1452,9 @@ class TableAggregate(IR):
     def render(self, r):
         return '(TableAggregate {} {})'.format(r(self.child), r(self.query))
 
+    def _compute_type(self, env):
+        return self.query.compute_type(self.child.typ._ref_map())
+
     def __eq__(self, other):
         return isinstance(other, TableAggregate) and \
                other.child == self.child and \
@@ -1311,6 +1476,9 @@ class MatrixAggregate(IR):
     def render(self, r):
         return '(MatrixAggregate {} {})'.format(r(self.child), r(self.query))
 
+    def _compute_type(self, env):
+        return self.query.compute_type(self.child.typ._ref_map())
+
     def __eq__(self, other):
         return isinstance(other, MatrixAggregate) and \
                other.child == self.child and \
@@ -1337,6 +1505,9 @@ class TableWrite(IR):
                                                       "\"" + escape_str(self._codec_spec) + "\"" if self._codec_spec else "None",
                                                         r(self.child))
 
+    def _compute_type(self, env):
+        return tvoid
+
     def __eq__(self, other):
         return isinstance(other, TableWrite) and \
                other.child == self.child and \
@@ -1372,6 +1543,9 @@ class TableExport(IR):
             self.header,
             self.export_type)
 
+    def _compute_type(self, env):
+        return tvoid
+
     def __eq__(self, other):
         return isinstance(other, TableExport) and \
                other.child == self.child and \
@@ -1398,6 +1572,9 @@ class MatrixWrite(IR):
             r(self.matrix_writer),
             r(self.child))
 
+    def _compute_type(self, env):
+        return tvoid
+
     def __eq__(self, other):
         return isinstance(other, MatrixWrite) and \
                other.child == self.child and \
@@ -1419,6 +1596,9 @@ class MatrixMultiWrite(IR):
             r(self.writer),
             ' '.join(map(r, self.children)))
 
+    def _compute_type(self, env):
+        return tvoid
+
     def __eq__(self, other):
         return isinstance(other, MatrixMultiWrite) and \
                other.children == self.children and \
@@ -1468,14 +1648,41 @@ class Literal(IR):
         super(Literal, self).__init__()
         self.dtype: 'hail.HailType' = dtype
         self.value = value
+        self._digest = None
 
     def copy(self):
         return Literal(self.dtype, self.value)
 
-    def render(self, r):
+    def _encoded_digest(self):
+        """SHA-256 digest of the binary encoding of the value, or ``None`` if
+        its type has no binary encoding. Computed once; the encoding itself is
+        not kept."""
+        if self._digest is None:
+            try:
+                self._digest = hashlib.sha256(self.dtype._to_encoding(self.value)).digest()
+            except NotImplementedError:
+                # no binary encoding for some nested type, e.g. ndarrays
+                self._digest = b''
+        return self._digest or None
+
+    def _structural_parts(self):
+        # a digest of the encoding, rather than the JSON rendering, which for
+        # a large literal costs as much as sending it
+        digest = self._encoded_digest()
+        if digest is None:
+            return super()._structural_parts()
+        return [('Literal', self.dtype, digest)], []
+
+    def render(self, r):
+        jir_id = r.add_literal(self)
+        if jir_id is not None:
+            return f'(JavaIR {jir_id})'
         return f'(Literal {self.dtype._parsable_string()} ' \
                f'"{escape_str(self.dtype._to_json(self.value))}")'
 
+    def _compute_type(self, env):
+        return self.dtype
+
     def __eq__(self, other):
         return isinstance(other, Literal) and \
                other.dtype == self.dtype and \
@@ -1517,6 +1724,10 @@ class Join(IR):
     def render(self, r):
         return r(self.virtual_ir)
 
+    def _compute_type(self, env):
+        return self.virtual_ir.compute_type(env)
+
+
 
 class JavaIR(IR):
     def __init__(self, jir):
@@ -1527,6 +1738,23 @@ class JavaIR(IR):
     def render(self, r):
         return f'(JavaIR {r.add_jir(self._jir)})'
 
+    def _compute_type(self, env):
+        return dtype(self._jir.typ().toString())
+
+
+
+def _bind(env, name, t):
+    new_env = dict(env)
+    new_env[name] = t
+    return new_env
+
+
+def _element_types(t):
+    # the key and value types of a struct or tuple with two fields
+    if isinstance(t, tstruct):
+        return t[0], t[1]
+    return t.types[0], t.types[1]
+
 
 def subst(ir, env, agg_env):
     def _subst(ir, env2=None, agg_env2=None):
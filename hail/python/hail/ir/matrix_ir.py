@@ -1,5 +1,8 @@
 import json
+from hail.expr.types import tint32, tarray, tstruct
 from hail.ir.base_ir import *
+from hail.ir.matrix_reader import MatrixRangeReader
+from hail.ir.table_ir import _exploded_type
 from hail.utils.java import escape_str, escape_id, parsable_strings, dump_json
 
 class MatrixAggregateRowsByKey(MatrixIR):
@@ -12,6 +15,12 @@ class MatrixAggregateRowsByKey(MatrixIR):
     def render(self, r):
         return f'(MatrixAggregateRowsByKey {r(self.child)} {r(self.entry_expr)} {r(self.row_expr)})'
 
+    def _compute_type(self):
+        t = self.child.typ
+        env = t._ref_map()
+        return t._copy(row_type=t._row_key_type._concat(self.row_expr.compute_type(env)),
+                       entry_type=self.entry_expr.compute_type(env))
+
 
 class MatrixRead(MatrixIR):
     def __init__(self, reader, drop_cols=False, drop_rows=False):
@@ -23,6 +32,14 @@ class MatrixRead(MatrixIR):
     def render(self, r):
         return f'(MatrixRead None {self.drop_cols} {self.drop_rows} "{r(self.reader)}")'
 
+    def _compute_type(self):
+        if isinstance(self.reader, MatrixRangeReader):
+            return tmatrix(tstruct(),
+                           tstruct(col_idx=tint32), ['col_idx'],
+                           tstruct(row_idx=tint32), ['row_idx'],
+                           tstruct())
+        return self._backend_type()
+
 
 class MatrixFilterRows(MatrixIR):
     def __init__(self, child, pred):
@@ -33,6 +50,9 @@ class MatrixFilterRows(MatrixIR):
     def render(self, r):
         return '(MatrixFilterRows {} {})'.format(r(self.child), r(self.pred))
 
+    def _compute_type(self):
+        return self.child.typ
+
 class MatrixChooseCols(MatrixIR):
     def __init__(self, child, old_entries):
         super().__init__()
@@ -43,6 +63,9 @@ class MatrixChooseCols(MatrixIR):
         return '(MatrixChooseCols ({}) {})'.format(
             ' '.join([str(i) for i in self.old_entries]), r(self.child))
 
+    def _compute_type(self):
+        return self.child.typ
+
 class MatrixMapCols(MatrixIR):
     def __init__(self, child, new_col, new_key):
         super().__init__()
@@ -55,14 +78,23 @@ class MatrixMapCols(MatrixIR):
             '(' + ' '.join(f'"{escape_str(f)}"' for f in self.new_key) + ')' if self.new_key is not None else 'None',
             r(self.child), r(self.new_col))
 
+    def _compute_type(self):
+        t = self.child.typ
+        return t._copy(col_type=self.new_col.compute_type(t._ref_map()),
+                       col_key=t.col_key if self.new_key is None else list(self.new_key))
+
 class MatrixUnionCols(MatrixIR):
     def __init__(self, left, right):
+        super().__init__()
         self.left = left
         self.right = right
 
     def render(self, r):
         return f'(MatrixUnionCols {r(self.left)} {r(self.right)})'
 
+    def _compute_type(self):
+        return self.left.typ
+
 class MatrixMapEntries(MatrixIR):
     def __init__(self, child, new_entry):
         super().__init__()
@@ -72,6 +104,14 @@ class MatrixMapEntries(MatrixIR):
     def render(self, r):
         return '(MatrixMapEntries {} {})'.format(r(self.child), r(self.new_entry))
 
+    def _compute_type(self):
+        t = self.child.typ
+        entry_type = self.new_entry.compute_type(t._ref_map())
+        return tmatrix._from_rv_row_type(
+            t.global_type, t.col_type, t.col_key,
+            t._rv_row_type._insert_fields(**{tmatrix._entries_field: tarray(entry_type)}),
+            t.row_key)
+
 class MatrixFilterEntries(MatrixIR):
     def __init__(self, child, pred):
         super().__init__()
@@ -81,6 +121,9 @@ class MatrixFilterEntries(MatrixIR):
     def render(self, r):
         return '(MatrixFilterEntries {} {})'.format(r(self.child), r(self.pred))
 
+    def _compute_type(self):
+        return self.child.typ
+
 class MatrixKeyRowsBy(MatrixIR):
     def __init__(self, child, keys, is_sorted=False):
         super().__init__()
@@ -94,6 +137,9 @@ class MatrixKeyRowsBy(MatrixIR):
             self.is_sorted,
             r(self.child))
 
+    def _compute_type(self):
+        return self.child.typ._copy(row_key=list(self.keys))
+
 class MatrixMapRows(MatrixIR):
     def __init__(self, child, new_row):
         super().__init__()
@@ -103,6 +149,14 @@ class MatrixMapRows(MatrixIR):
     def render(self, r):
         return '(MatrixMapRows {} {})'.format(r(self.child), r(self.new_row))
 
+    def _compute_type(self):
+        t = self.child.typ
+        rv_row_type = self.new_row.compute_type(t._ref_map())
+        if tmatrix._entries_field not in rv_row_type:
+            rv_row_type = rv_row_type._insert_fields(
+                **{tmatrix._entries_field: t._rv_row_type[tmatrix._entries_field]})
+        return tmatrix._from_rv_row_type(t.global_type, t.col_type, t.col_key, rv_row_type, t.row_key)
+
 class MatrixMapGlobals(MatrixIR):
     def __init__(self, child, new_row):
         super().__init__()
@@ -112,6 +166,10 @@ class MatrixMapGlobals(MatrixIR):
     def render(self, r):
         return f'(MatrixMapGlobals {r(self.child)} {r(self.new_row)})'
 
+    def _compute_type(self):
+        t = self.child.typ
+        return t._copy(global_type=self.new_row.compute_type(t._ref_map()))
+
 class MatrixFilterCols(MatrixIR):
     def __init__(self, child, pred):
         super().__init__()
@@ -121,6 +179,9 @@ class MatrixFilterCols(MatrixIR):
     def render(self, r):
         return f'(MatrixFilterCols {r(self.child)} {r(self.pred)})'
 
+    def _compute_type(self):
+        return self.child.typ
+
 class MatrixCollectColsByKey(MatrixIR):
     def __init__(self, child):
         super().__init__()
@@ -129,6 +190,12 @@ class MatrixCollectColsByKey(MatrixIR):
     def render(self, r):
         return f'(MatrixCollectColsByKey {r(self.child)})'
 
+    def _compute_type(self):
+        t = self.child.typ
+        col_values = tstruct(**{f: tarray(ft) for f, ft in t._col_value_type.items()})
+        return t._copy(col_type=t._col_key_type._concat(col_values),
+                       entry_type=tstruct(**{f: tarray(ft) for f, ft in t.entry_type.items()}))
+
 class MatrixAggregateColsByKey(MatrixIR):
     def __init__(self, child, entry_expr, col_expr):
         super().__init__()
@@ -139,6 +206,12 @@ class MatrixAggregateColsByKey(MatrixIR):
     def render(self, r):
         return '(MatrixAggregateColsByKey {} {} {})'.format(r(self.child), r(self.entry_expr), r(self.col_expr))
 
+    def _compute_type(self):
+        t = self.child.typ
+        env = t._ref_map()
+        return t._copy(col_type=t._col_key_type._concat(self.col_expr.compute_type(env)),
+                       entry_type=self.entry_expr.compute_type(env))
+
 
 class TableToMatrixTable(MatrixIR):
     def __init__(self, child, row_key, col_key, row_fields, col_fields, n_partitions):
@@ -159,6 +232,15 @@ class TableToMatrixTable(MatrixIR):
                f'{"None" if self.n_partitions is None else str(self.n_partitions)} ' \
                f'{r(self.child)})'
 
+    def _compute_type(self):
+        t = self.child.typ
+        row_type = t.row_type
+        used = set(self.row_key) | set(self.col_key) | set(self.row_fields) | set(self.col_fields)
+        return tmatrix(t.global_type,
+                       row_type._select_fields(list(self.col_key) + list(self.col_fields)), list(self.col_key),
+                       row_type._select_fields(list(self.row_key) + list(self.row_fields)), list(self.row_key),
+                       row_type._drop_fields(used))
+
 
 class MatrixExplodeRows(MatrixIR):
     def __init__(self, child, path):
@@ -171,6 +253,12 @@ class MatrixExplodeRows(MatrixIR):
             ' '.join([escape_id(id) for id in self.path]),
             r(self.child))
 
+    def _compute_type(self):
+        t = self.child.typ
+        rv_row_type = t._rv_row_type
+        rv_row_type = rv_row_type._insert(self.path, _exploded_type(rv_row_type, self.path))
+        return tmatrix._from_rv_row_type(t.global_type, t.col_type, t.col_key, rv_row_type, t.row_key)
+
 class MatrixRepartition(MatrixIR):
     def __init__(self, child, n, strategy):
         super().__init__()
@@ -181,6 +269,9 @@ class MatrixRepartition(MatrixIR):
     def render(self, r):
         return f'(MatrixRepartition {r(self.child)} {self.n} {self.strategy})'
 
+    def _compute_type(self):
+        return self.child.typ
+
 
 class MatrixUnionRows(MatrixIR):
     def __init__(self, *children):
@@ -190,6 +281,11 @@ class MatrixUnionRows(MatrixIR):
     def render(self, r):
         return '(MatrixUnionRows {})'.format(' '.join(map(r, self.children)))
 
+    def _compute_type(self):
+        # the entries are moved last in every child
+        t = self.children[0].typ
+        return t._copy(row_type=t.row_type)
+
 
 class MatrixDistinctByRow(MatrixIR):
     def __init__(self, child):
@@ -199,6 +295,9 @@ class MatrixDistinctByRow(MatrixIR):
     def render(self, r):
         return f'(MatrixDistinctByRow {r(self.child)})'
 
+    def _compute_type(self):
+        return self.child.typ
+
 
 class MatrixExplodeCols(MatrixIR):
     def __init__(self, child, path):
@@ -211,6 +310,10 @@ class MatrixExplodeCols(MatrixIR):
             ' '.join([escape_id(id) for id in self.path]),
             r(self.child))
 
+    def _compute_type(self):
+        t = self.child.typ
+        return t._copy(col_type=t.col_type._insert(self.path, _exploded_type(t.col_type, self.path)))
+
 
 class CastTableToMatrix(MatrixIR):
     def __init__(self, child, entries_field_name, cols_field_name, col_key):
@@ -227,6 +330,15 @@ class CastTableToMatrix(MatrixIR):
            ' '.join([escape_id(id) for id in self.col_key]),
            r(self.child))
 
+    def _compute_type(self):
+        t = self.child.typ
+        return tmatrix._from_rv_row_type(
+            t.global_type._drop_fields({self.cols_field_name}),
+            t.global_type[self.cols_field_name].element_type,
+            list(self.col_key),
+            t.row_type._rename({self.entries_field_name: tmatrix._entries_field}),
+            t.row_key)
+
 
 class MatrixAnnotateRowsTable(MatrixIR):
     def __init__(self, child, table, root, key):
@@ -245,6 +357,11 @@ class MatrixAnnotateRowsTable(MatrixIR):
             key_strs = ' '.join(str(x) for x in self.key)
         return f'(MatrixAnnotateRowsTable "{self.root}" {key_bool} {r(self.child)} {r(self.table)} {key_strs})'
 
+    def _compute_type(self):
+        t = self.child.typ
+        rv_row_type = t._rv_row_type._insert_fields(**{self.root: self.table.typ._value_type})
+        return tmatrix._from_rv_row_type(t.global_type, t.col_type, t.col_key, rv_row_type, t.row_key)
+
 class MatrixAnnotateColsTable(MatrixIR):
     def __init__(self, child, table, root):
         super().__init__()
@@ -255,9 +372,14 @@ class MatrixAnnotateColsTable(MatrixIR):
     def render(self, r):
         return f'(MatrixAnnotateColsTable "{self.root}" {r(self.child)} {r(self.table)})'
 
+    def _compute_type(self):
+        t = self.child.typ
+        return t._copy(col_type=t.col_type._insert([self.root], self.table.typ._value_type))
+
 
 class MatrixToMatrixApply(MatrixIR):
     def __init__(self, child, config):
+        super().__init__()
         self.child = child
         self.config = config
 
@@ -267,7 +389,11 @@ class MatrixToMatrixApply(MatrixIR):
 
 class JavaMatrix(MatrixIR):
     def __init__(self, jir):
+        super().__init__()
         self._jir = jir
 
     def render(self, r):
         return f'(JavaMatrix {r.add_jir(self._jir)})'
+
+    def _compute_type(self):
+        return tmatrix._from_java(self._jir.typ())
@@ -0,0 +1,372 @@
+import copy
+
+from .base_ir import BaseIR, IR
+from .ir import I32, I64, F32, F64, Str, TrueIR, FalseIR, NA, Literal, IsNA, If, Let, Ref, Cast, \
+    ApplyBinaryOp, ApplyUnaryOp, ApplyComparisonOp, MakeArray, MakeStruct, SelectFields, InsertFields, \
+    GetField, MakeTuple, GetTupleElement, BaseApplyAggOp, AggFilter, AggExplode, AggGroupBy, Begin, \
+    ArrayMap, ArrayFilter, ArrayFlatMap, ArrayFold, ArrayScan, ArrayLeftJoinDistinct, ArrayFor, Uniroot, \
+    Die, TableWrite, TableExport, MatrixWrite, MatrixMultiWrite
+
+
+def optimize(x):
+    """Simplify `x` before it is rendered and sent to the backend.
+
+    Folds constant arithmetic, comparisons and conditionals, fuses nested
+    struct operations such as an :class:`.InsertFields` of an
+    :class:`.InsertFields` or a :class:`.GetField` of a :class:`.MakeStruct`,
+    removes casts to the type a value already has, and drops ``Let``
+    bindings that are never referenced, substituting constant ones.
+    Subexpressions whose value would be dropped are kept if they aggregate or
+    have side effects.
+
+    `x` is not modified; unchanged subtrees are shared with the result, which
+    has the same type as `x`.
+    """
+    lets = _Lets(x)
+    return _transform(x, lambda n: _simplify(n, lets), lets.bind)
+
+
+_enter, _bind, _exit = range(3)
+
+
+def _transform(root, f, bind=None):
+    # iterative post-order, so deep IRs do not hit the recursion limit; each
+    # distinct node is rewritten once, so shared subtrees stay shared.
+    # Children are rewritten in order, and `bind` is called with each Let
+    # and its rewritten value before the body is visited.
+    done = {}
+    stack = [(root, _enter)]
+    while stack:
+        x, state = stack.pop()
+        if state == _bind:
+            bind(x, done[id(x.value)])
+        elif id(x) in done:
+            continue
+        elif state == _exit:
+            done[id(x)] = f(_rebuild(x, [done[id(c)] for c in _children(x)]))
+        else:
+            stack.append((x, _exit))
+            if bind is not None and isinstance(x, Let):
+                stack.extend([(x.body, _enter), (x, _bind), (x.value, _enter)])
+            else:
+                stack.extend((c, _enter) for c in reversed(_children(x)))
+    return done[id(root)]
+
+
+def _children(x):
+    if isinstance(x, IR):
+        return [c for c in x.children if isinstance(c, BaseIR)]
+    return [c for _, v in _relational_fields(x) for c in (v if isinstance(v, list) else [v])]
+
+
+def _relational_fields(x):
+    # table and matrix nodes keep their children in attributes
+    fields = []
+    for k, v in vars(x).items():
+        if isinstance(v, BaseIR):
+            fields.append((k, v))
+        elif isinstance(v, (list, tuple)) and v and all(isinstance(c, BaseIR) for c in v):
+            fields.append((k, list(v)))
+    return fields
+
+
+def _rebuild(x, new_children):
+    if all(n is c for n, c in zip(new_children, _children(x))):
+        return x
+    if isinstance(x, IR):
+        it = iter(new_children)
+        y = x.copy(*[next(it) if isinstance(c, BaseIR) else c for c in x.children])
+        _copy_type(x, y)
+        return y
+    y = copy.copy(x)
+    for attr in ('_jir', '_hash'):
+        y.__dict__.pop(attr, None)
+    it = iter(new_children)
+    for k, v in _relational_fields(x):
+        setattr(y, k, [next(it) for _ in v] if isinstance(v, list) else next(it))
+    return y
+
+
+def _copy_type(x, y):
+    if x._type is not None:
+        y._assign_type(x._type)
+
+
+def _simplify(x, lets):
+    while isinstance(x, IR):
+        if isinstance(x, (Let, Ref)):
+            y = lets.rewrite(x)
+        else:
+            rule = _rules.get(type(x))
+            y = rule(x) if rule is not None else x
+        if y is x:
+            break
+        _copy_type(x, y)
+        x = y
+    return x
+
+
+def _walk(root):
+    stack = [root]
+    seen = set()
+    while stack:
+        x = stack.pop()
+        if id(x) not in seen:
+            seen.add(id(x))
+            yield x
+            stack.extend(_children(x))
+
+
+_effect_classes = (BaseApplyAggOp, AggFilter, AggExplode, AggGroupBy, Begin, ArrayFor, Die,
+                   TableWrite, TableExport, MatrixWrite, MatrixMultiWrite)
+
+
+def _pure(*xs):
+    """Whether the values can be dropped without changing the result: none
+    of them aggregates or has side effects."""
+    return not any(isinstance(n, _effect_classes) for x in xs for n in _walk(x))
+
+
+_constant_classes = (I32, I64, F32, F64, Str, TrueIR, FalseIR)
+_never_missing_classes = _constant_classes + (MakeArray, MakeStruct, MakeTuple)
+
+
+def _is_constant(x):
+    return isinstance(x, _constant_classes) or isinstance(x, NA)
+
+
+def _value(x):
+    return {TrueIR: True, FalseIR: False}.get(type(x), getattr(x, 'x', None))
+
+
+def _bool(b):
+    return TrueIR() if b else FalseIR()
+
+
+def _wrap(cls, v):
+    if cls is I32:
+        return I32((v + 2 ** 31) % 2 ** 32 - 2 ** 31)
+    if cls is I64:
+        return I64((v + 2 ** 63) % 2 ** 64 - 2 ** 63)
+    assert cls is F64
+    # non-finite values have no IR literal syntax
+    if v != v or v in (float('inf'), float('-inf')):
+        return None
+    return F64(v)
+
+
+def _fold_binary(x):
+    l, r = x.l, x.r
+    if type(l) is not type(r) or type(l) not in (I32, I64, F64):
+        return x
+    a, b = l.x, r.x
+    if x.op == '+':
+        v = a + b
+    elif x.op == '-':
+        v = a - b
+    elif x.op == '*':
+        v = a * b
+    elif x.op == '//' and type(l) is not F64 and b != 0:
+        v = a // b
+    elif x.op == '/' and type(l) is F64 and b != 0:
+        v = a / b
+    else:
+        return x
+    return _wrap(type(l), v) or x
+
+
+def _fold_unary(x):
+    if x.op == '!' and isinstance(x.x, (TrueIR, FalseIR)):
+        return _bool(not _value(x.x))
+    if x.op == '-' and type(x.x) in (I32, I64, F64):
+        return _wrap(type(x.x), -x.x.x) or x
+    return x
+
+
+_comparisons = {
+    '==': lambda a, b: a == b,
+    '!=': lambda a, b: a != b,
+    '<': lambda a, b: a < b,
+    '<=': lambda a, b: a <= b,
+    '>': lambda a, b: a > b,
+    '>=': lambda a, b: a >= b,
+}
+
+
+def _fold_comparison(x):
+    l, r = x.l, x.r
+    if type(l) is not type(r) or x.op not in _comparisons:
+        return x
+    if type(l) in (I32, I64, F64) or (x.op in ('==', '!=') and type(l) in (Str, TrueIR, FalseIR)):
+        return _bool(_comparisons[x.op](_value(l), _value(r)))
+    return x
+
+
+def _fold_if(x):
+    if isinstance(x.cond, TrueIR):
+        return x.cnsq
+    if isinstance(x.cond, FalseIR):
+        return x.altr
+    return x
+
+
+def _fold_is_na(x):
+    v = x.value
+    if isinstance(v, NA):
+        return TrueIR()
+    if isinstance(v, _never_missing_classes) or (isinstance(v, Literal) and v.value is not None):
+        return FalseIR()
+    return x
+
+
+def _remove_cast(x):
+    t = x.v._type
+    if t is None and _is_constant(x.v):
+        t = x.v.typ
+    if t == x._typ:
+        return x.v
+    return x
+
+
+def _fuse_get_field(x):
+    o = x.o
+    if isinstance(o, MakeStruct):
+        fields = dict(o.fields)
+        if _pure(*(v for f, v in o.fields if f != x.name)):
+            return fields[x.name]
+    elif isinstance(o, InsertFields):
+        fields = dict(o.fields)
+        if x.name in fields:
+            if _pure(o.old, *(v for f, v in o.fields if f != x.name)):
+                return fields[x.name]
+        elif _pure(*fields.values()):
+            return GetField(o.old, x.name)
+    elif isinstance(o, SelectFields):
+        return GetField(o.old, x.name)
+    return x
+
+
+def _fuse_select_fields(x):
+    o = x.old
+    if isinstance(o, SelectFields):
+        return SelectFields(o.old, x.fields)
+    if isinstance(o, MakeStruct):
+        fields = dict(o.fields)
+        selected = set(x.fields)
+        if _pure(*(v for f, v in o.fields if f not in selected)):
+            return MakeStruct([(f, fields[f]) for f in x.fields])
+    if o._type is not None and list(o._type) == list(x.fields):
+        return o
+    return x
+
+
+def _fuse_insert_fields(x):
+    o = x.old
+    if not x.fields and x.field_order is None:
+        return o
+    new = dict(x.fields)
+    if isinstance(o, InsertFields) and o.field_order is None:
+        if _pure(*(v for f, v in o.fields if f in new)):
+            merged = [(f, new.pop(f, v)) for f, v in o.fields]
+            return InsertFields(o.old, merged + [(f, v) for f, v in x.fields if f in new], x.field_order)
+    elif isinstance(o, MakeStruct):
+        if _pure(*(v for f, v in o.fields if f in new)):
+            merged = [(f, new.pop(f, v)) for f, v in o.fields]
+            merged += [(f, v) for f, v in x.fields if f in new]
+            if x.field_order is not None:
+                fields = dict(merged)
+                merged = [(f, fields[f]) for f in x.field_order]
+            return MakeStruct(merged)
+    return x
+
+
+def _fuse_get_tuple_element(x):
+    o = x.o
+    if isinstance(o, MakeTuple) and _pure(*(v for i, v in enumerate(o.elements) if i != x.idx)):
+        return o.elements[x.idx]
+    return x
+
+
+_binders = {
+    Let: ('name',),
+    ArrayMap: ('name',),
+    ArrayFilter: ('name',),
+    ArrayFlatMap: ('name',),
+    ArrayFold: ('accum_name', 'value_name'),
+    ArrayScan: ('accum_name', 'value_name'),
+    ArrayLeftJoinDistinct: ('l_name', 'r_name'),
+    ArrayFor: ('value_name',),
+    AggExplode: ('name',),
+    Uniroot: ('argname',),
+}
+
+
+class _Lets(object):
+    """Decides which ``Let`` bindings of an IR can be dropped or substituted,
+    from a single pass over the IR before it is rewritten.
+
+    A binding is dropped if its name is never referenced. Rewrites only
+    remove references, so a name unreferenced in the input stays
+    unreferenced. A constant binding is substituted if its name is bound
+    nowhere else and is never referenced under an aggregation, a side
+    effect or a relational node, where references may see a different
+    environment.
+    """
+
+    def __init__(self, root):
+        self.referenced = set()
+        self.constants = {}
+        binds = {}
+        let_names = set()
+        opaque = set()
+        seen = set()
+        stack = [(root, False)]
+        while stack:
+            x, in_opaque = stack.pop()
+            if (id(x), in_opaque) in seen:
+                continue
+            first = (id(x), not in_opaque) not in seen
+            seen.add((id(x), in_opaque))
+            if isinstance(x, Ref):
+                self.referenced.add(x.name)
+                if in_opaque:
+                    opaque.add(x.name)
+            if first:
+                for attr in _binders.get(type(x), ()):
+                    name = getattr(x, attr)
+                    binds[name] = binds.get(name, 0) + 1
+                if isinstance(x, Let):
+                    let_names.add(x.name)
+            in_opaque = in_opaque or not isinstance(x, IR) or isinstance(x, _effect_classes)
+            stack.extend((c, in_opaque) for c in _children(x))
+        self.substitutable = {name for name in let_names if binds[name] == 1 and name not in opaque}
+
+    def bind(self, x, value):
+        if x.name in self.substitutable and _is_constant(value):
+            self.constants[x.name] = value
+
+    def rewrite(self, x):
+        if isinstance(x, Ref):
+            return self.constants.get(x.name, x)
+        # the body has been rewritten, so the binding goes out of scope
+        if self.constants.pop(x.name, None) is not None:
+            return x.body
+        if isinstance(x.body, Ref) and x.body.name == x.name:
+            return x.value
+        if x.name not in self.referenced and _pure(x.value):
+            return x.body
+        return x
+
+
+_rules = {
+    ApplyBinaryOp: _fold_binary,
+    ApplyUnaryOp: _fold_unary,
+    ApplyComparisonOp: _fold_comparison,
+    If: _fold_if,
+    IsNA: _fold_is_na,
+    Cast: _remove_cast,
+    GetField: _fuse_get_field,
+    SelectFields: _fuse_select_fields,
+    InsertFields: _fuse_insert_fields,
+    GetTupleElement: _fuse_get_tuple_element,
+}
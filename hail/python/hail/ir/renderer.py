@@ -1,10 +1,41 @@
+import heapq
+import re
+
 from hail import ir
 
+_placeholder = re.compile('\x00([0-9]+)\x00')
+
+# Shared subtrees whose rendered text is shorter than this are left inline:
+# binding them costs about as much text as it saves.
+_MIN_SHARED_SIZE = 32
+
+# Collection literals with fewer elements than this are rendered as JSON in
+# the IR text.
+_MIN_ENCODED_LITERAL_LENGTH = 1024
+
+_no_names = frozenset()
+
+
 class Renderer(object):
-    def __init__(self, stop_at_jir):
+    """Renders IR to the text parsed by the backend.
+
+    Rendering is iterative, so arbitrarily deep trees do not hit the Python
+    recursion limit. The IR is hash-consed into a DAG of structurally distinct
+    subtrees, and a subtree occurring more than once is bound by a ``Let``
+    above its occurrences and referenced by name, so the rendered text grows
+    with the size of the expression DAG rather than the size of the tree.
+
+    If `literal_cache` is given, large literals are sent to the backend in
+    binary through the cache and rendered as a reference to the resulting
+    Java IR, like subtrees that already have one.
+    """
+
+    def __init__(self, stop_at_jir, literal_cache=None):
         self.stop_at_jir = stop_at_jir
+        self.literal_cache = literal_cache
         self.count = 0
         self.jirs = {}
+        self._children = None
 
     def add_jir(self, jir):
         jir_id = f'm{self.count}'
@@ -12,15 +43,268 @@ class Renderer(object):
         self.jirs[jir_id] = jir
         return jir_id
 
+    def add_literal(self, literal):
+        """Returns the id of the Java IR for the :class:`.Literal` `literal`,
+        or ``None`` if it is small enough, or has no binary encoding, to render
+        inline."""
+        value = literal.value
+        if (self.literal_cache is None
+                or not isinstance(value, (list, set, frozenset, dict))
+                or len(value) < _MIN_ENCODED_LITERAL_LENGTH
+                or literal._encoded_digest() is None):
+            return None
+        return self.add_jir(self.literal_cache.get(literal))
+
     def __call__(self, x):
+        if not isinstance(x, ir.BaseIR):
+            # readers and writers render inline
+            return x.render(self)
+        if self._children is not None:
+            # called from a node's render method: leave a placeholder for the
+            # child, which is rendered separately
+            self._children.append(x)
+            return f'\x00{len(self._children) - 1}\x00'
+        return self._render(x)
+
+    def _render_node(self, x):
         if self.stop_at_jir and hasattr(x, '_jir'):
             jir_id = self.add_jir(x._jir)
             if isinstance(x, ir.MatrixIR):
-                return f'(JavaMatrix {jir_id})'
+                return [f'(JavaMatrix {jir_id})'], []
             elif isinstance(x, ir.TableIR):
-                return f'(JavaTable {jir_id})'
+                return [f'(JavaTable {jir_id})'], []
             else:
                 assert isinstance(x, ir.IR)
-                return f'(JavaIR {jir_id})'
-        else:
-            return x.render(self)
+                return [f'(JavaIR {jir_id})'], []
+
+        self._children = []
+        try:
+            parts = _placeholder.split(x.render(self))
+            children = self._children
+        finally:
+            self._children = None
+        for i in range(1, len(parts), 2):
+            parts[i] = children[int(parts[i])]
+        return parts, children
+
+    def _render(self, root):
+        dag = _DAG()
+        # maps the id of each rendered object to its node in the DAG; the
+        # objects are kept alive in `rendered` so ids are not reused
+        nodes = {}
+        rendered = []
+        pending = {}
+        stack = [(root, False)]
+        while stack:
+            x, children_done = stack.pop()
+            if children_done:
+                nodes[id(x)] = dag.add(x, pending.pop(id(x)), nodes)
+            elif id(x) not in nodes and id(x) not in pending:
+                parts, children = self._render_node(x)
+                rendered.append(x)
+                pending[id(x)] = parts
+                stack.append((x, True))
+                for c in reversed(children):
+                    stack.append((c, False))
+        return dag.emit(nodes[id(root)])
+
+
+class _Node(object):
+    __slots__ = ['parts', 'parents', 'is_value', 'shareable', 'refs', 'size', 'agg_or_effect']
+
+    def __init__(self, parts, is_value):
+        self.parts = parts
+        self.parents = []
+        self.is_value = is_value
+
+
+class _DAG(object):
+    """Hash-consed IR. Nodes are numbered in post-order, so every node's
+    children have smaller numbers than the node itself."""
+
+    def __init__(self):
+        if not _child_scope_rules:
+            _init_rules()
+        self.nodes = []
+        self.index = {}
+
+    def add(self, x, parts, nodes):
+        """Add `x`, whose rendering is `parts`: text alternating with child
+        objects, which must already be in the DAG at ``nodes[id(child)]``."""
+        children = parts[1::2]
+        parts = [p if i % 2 == 0 else nodes[id(p)] for i, p in enumerate(parts)]
+        key = tuple(parts)
+        n = self.index.get(key)
+        if n is not None:
+            return n
+        n = len(self.nodes)
+        self.index[key] = n
+
+        node = _Node(parts, isinstance(x, ir.IR))
+        scope = _child_scopes(x) if node.is_value else lambda c: _opaque
+        refs = {x.name} if isinstance(x, ir.Ref) else set()
+        size = 0
+        agg_or_effect = isinstance(x, _agg_or_effect_classes)
+        for i, p in enumerate(parts):
+            if i % 2 == 0:
+                size += len(p)
+            else:
+                child = self.nodes[p]
+                strict, bound = scope(children[i // 2])
+                child.parents.append((n, strict, bound))
+                refs |= child.refs
+                size += child.size
+                agg_or_effect = agg_or_effect or child.agg_or_effect
+        node.refs = frozenset(refs)
+        node.size = size
+        node.agg_or_effect = agg_or_effect
+        node.shareable = node.is_value and not agg_or_effect and size >= _MIN_SHARED_SIZE
+        self.nodes.append(node)
+        return n
+
+    def _binding_sites(self, n):
+        """Nodes at which to bind the shared node `n` with a ``Let``.
+
+        A site must be a value IR that evaluates `n` whenever it is itself
+        evaluated, contains more than one occurrence of `n`, and sees the same
+        environment as every one of those occurrences: no path from the site
+        to `n` may cross into an aggregation or relational node, or through a
+        binding of one of the variables `n` refers to. Among the nodes
+        satisfying this, the highest ones are chosen."""
+        refs = self.nodes[n].refs
+        clean = {n: True}
+        evaluated = {n: True}
+        occurrences = {n: 1}
+        ancestors = []
+        queue = [n]
+        while queue:
+            m = heapq.heappop(queue)
+            ancestors.append(m)
+            for p, strict, bound in self.nodes[m].parents:
+                if p not in clean:
+                    clean[p] = True
+                    evaluated[p] = False
+                    occurrences[p] = 0
+                    heapq.heappush(queue, p)
+                transparent = bound is not None and refs.isdisjoint(bound)
+                clean[p] = clean[p] and transparent and clean[m]
+                evaluated[p] = evaluated[p] or (strict and evaluated[m])
+                occurrences[p] = min(occurrences[p] + occurrences[m], 2)
+
+        sites = []
+        covered = {}
+        for m in reversed(ancestors):
+            parents = self.nodes[m].parents
+            covered_above = bool(parents) and all(covered[p] for p, _, _ in parents)
+            chosen = (m != n
+                      and not covered_above
+                      and self.nodes[m].is_value
+                      and clean[m]
+                      and evaluated[m]
+                      and occurrences[m] > 1)
+            if chosen:
+                sites.append(m)
+            covered[m] = chosen or covered_above
+        return sites
+
+    def emit(self, root):
+        bindings = {}
+        for n, node in enumerate(self.nodes):
+            if node.shareable and len(node.parents) > 1:
+                for d in self._binding_sites(n):
+                    bindings.setdefault(d, []).append(n)
+
+        names = {}
+        out = []
+        stack = [(root, {})]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, str):
+                out.append(item)
+                continue
+            n, env = item
+            name = env.get(n)
+            if name is not None:
+                out.append(f'(Ref {name})')
+                continue
+
+            work = []
+            bound = [b for b in bindings.get(n, ()) if b not in env]
+            for b in bound:
+                name = names.setdefault(b, f'__cse_{len(names) + 1}')
+                work.extend([f'(Let {name} ', (b, env), ' '])
+                env = dict(env)
+                env[b] = name
+            for i, p in enumerate(self.nodes[n].parts):
+                work.append(p if i % 2 == 0 else (p, env))
+            if bound:
+                work.append(')' * len(bound))
+            stack.extend(reversed(work))
+        return ''.join(out)
+
+
+_agg_or_effect_classes = ()
+_strict_classes = ()
+_child_scope_rules = {}
+
+_opaque = (False, None)
+_strict = (True, _no_names)
+_lazy = (False, _no_names)
+
+
+def _child_scopes(x):
+    """Returns a function mapping each child of `x` to a pair: whether the
+    child is always evaluated when `x` is, and the set of variables `x` binds
+    in the child's environment. The set is ``None`` for children evaluated in
+    an environment unrelated to that of `x`, such as aggregation arguments and
+    relational children."""
+    if isinstance(x, _strict_classes):
+        return lambda c: _strict
+    rule = _child_scope_rules.get(type(x))
+    if rule is None:
+        return lambda c: _opaque
+    scopes, default = rule(x)
+    return lambda c: scopes.get(id(c), default)
+
+
+def _lambda(strict_fields, *name_fields):
+    def rule(x):
+        return {id(getattr(x, f)): _strict for f in strict_fields}, (False, frozenset(getattr(x, f) for f in name_fields))
+    return rule
+
+
+def _apply(x):
+    # the boolean operators only evaluate their second argument if needed
+    if x.function in ('||', '&&'):
+        return {id(x.args[0]): _strict}, _lazy
+    return {}, _strict
+
+
+def _init_rules():
+    global _agg_or_effect_classes, _strict_classes
+
+    _agg_or_effect_classes = (
+        ir.BaseApplyAggOp, ir.AggFilter, ir.AggExplode, ir.AggGroupBy,
+        ir.Begin, ir.ArrayFor, ir.Void,
+        ir.TableWrite, ir.TableExport, ir.MatrixWrite, ir.MatrixMultiWrite)
+
+    _strict_classes = (
+        ir.Cast, ir.IsNA, ir.ApplyBinaryOp, ir.ApplyUnaryOp, ir.ApplyComparisonOp,
+        ir.MakeArray, ir.ArrayRef, ir.ArrayLen, ir.ArrayRange, ir.ArraySort,
+        ir.ToSet, ir.ToDict, ir.ToArray, ir.LowerBoundOnOrderedCollection,
+        ir.GroupByKey, ir.MakeStruct, ir.SelectFields, ir.InsertFields,
+        ir.GetField, ir.MakeTuple, ir.GetTupleElement, ir.StringSlice,
+        ir.StringLength, ir.Die, ir.ApplySeeded, ir.Join)
+
+    _child_scope_rules.update({
+        ir.Apply: _apply,
+        ir.Let: lambda x: ({id(x.value): _strict}, (True, frozenset([x.name]))),
+        ir.If: lambda x: ({id(x.cond): _strict}, _lazy),
+        ir.ArrayMap: _lambda(['a'], 'name'),
+        ir.ArrayFilter: _lambda(['a'], 'name'),
+        ir.ArrayFlatMap: _lambda(['a'], 'name'),
+        ir.ArrayFold: _lambda(['a', 'zero'], 'accum_name', 'value_name'),
+        ir.ArrayScan: _lambda(['a', 'zero'], 'accum_name', 'value_name'),
+        ir.ArrayLeftJoinDistinct: _lambda(['left', 'right'], 'l_name', 'r_name'),
+        ir.Uniroot: _lambda(['min', 'max'], 'argname'),
+    })
@@ -1,5 +1,6 @@
 import json
 
+from hail.expr.types import tint32, tarray, tstruct
 from hail.ir.base_ir import *
 from hail.utils.java import escape_str, escape_id, parsable_strings, dump_json
 
@@ -12,6 +13,10 @@ class MatrixRowsTable(TableIR):
     def render(self, r):
         return '(MatrixRowsTable {})'.format(r(self.child))
 
+    def _compute_type(self):
+        t = self.child.typ
+        return ttable(t.global_type, t.row_type, t.row_key)
+
 
 class TableJoin(TableIR):
     def __init__(self, left, right, join_type, join_key):
@@ -25,8 +30,21 @@ class TableJoin(TableIR):
         return '(TableJoin {} {} {} {})'.format(
             escape_id(self.join_type), self.join_key, r(self.left), r(self.right))
 
+    def _compute_type(self):
+        left = self.left.typ
+        right = self.right.typ
+        join_key = left.row_key[:self.join_key]
+        row_type = (left.row_type._select_fields(join_key)
+                    ._concat(left.row_type._drop_fields(set(join_key)))
+                    ._concat(right.row_type._drop_fields(set(right.row_key[:self.join_key]))))
+        return ttable(left.global_type._concat(right.global_type),
+                      row_type,
+                      left.row_key + right.row_key[self.join_key:])
+
+
 class TableLeftJoinRightDistinct(TableIR):
     def __init__(self, left, right, root):
+        super().__init__()
         self.left = left
         self.right = right
         self.root = root
@@ -35,8 +53,14 @@ class TableLeftJoinRightDistinct(TableIR):
         return '(TableLeftJoinRightDistinct {} {} {})'.format(
             escape_id(self.root), r(self.left), r(self.right))
 
+    def _compute_type(self):
+        left = self.left.typ
+        return left._copy(row_type=left.row_type._insert([self.root], self.right.typ._value_type))
+
+
 class TableIntervalJoin(TableIR):
     def __init__(self, left, right, root):
+        super().__init__()
         self.left = left
         self.right = right
         self.root = root
@@ -45,6 +69,11 @@ class TableIntervalJoin(TableIR):
         return '(TableIntervalJoin {} {} {})'.format(
             escape_id(self.root), r(self.left), r(self.right))
 
+    def _compute_type(self):
+        left = self.left.typ
+        return left._copy(row_type=left.row_type._insert([self.root], self.right.typ._value_type))
+
+
 class TableUnion(TableIR):
     def __init__(self, children):
         super().__init__()
@@ -53,6 +82,9 @@ class TableUnion(TableIR):
     def render(self, r):
         return '(TableUnion {})'.format(' '.join([r(x) for x in self.children]))
 
+    def _compute_type(self):
+        return self.children[0].typ
+
 
 class TableRange(TableIR):
     def __init__(self, n, n_partitions):
@@ -63,6 +95,9 @@ class TableRange(TableIR):
     def render(self, r):
         return '(TableRange {} {})'.format(self.n, self.n_partitions)
 
+    def _compute_type(self):
+        return ttable(tstruct(), tstruct(idx=tint32), ['idx'])
+
 
 class TableMapGlobals(TableIR):
     def __init__(self, child, new_row):
@@ -73,6 +108,10 @@ class TableMapGlobals(TableIR):
     def render(self, r):
         return '(TableMapGlobals {} {})'.format(r(self.child), r(self.new_row))
 
+    def _compute_type(self):
+        t = self.child.typ
+        return t._copy(global_type=self.new_row.compute_type(t._ref_map()))
+
 
 class TableExplode(TableIR):
     def __init__(self, child, path):
@@ -83,6 +122,10 @@ class TableExplode(TableIR):
     def render(self, r):
         return '(TableExplode {} {})'.format(parsable_strings(self.path), r(self.child))
 
+    def _compute_type(self):
+        t = self.child.typ
+        return t._copy(row_type=t.row_type._insert(self.path, _exploded_type(t.row_type, self.path)))
+
 
 class TableKeyBy(TableIR):
     def __init__(self, child, keys, is_sorted=False):
@@ -97,6 +140,9 @@ class TableKeyBy(TableIR):
             self.is_sorted,
             r(self.child))
 
+    def _compute_type(self):
+        return self.child.typ._copy(row_key=list(self.keys))
+
 
 class TableMapRows(TableIR):
     def __init__(self, child, new_row):
@@ -107,6 +153,10 @@ class TableMapRows(TableIR):
     def render(self, r):
         return '(TableMapRows {} {})'.format(r(self.child), r(self.new_row))
 
+    def _compute_type(self):
+        t = self.child.typ
+        return t._copy(row_type=self.new_row.compute_type(t._ref_map()))
+
 
 class TableRead(TableIR):
     def __init__(self, path, drop_rows, typ):
@@ -144,6 +194,12 @@ class MatrixEntriesTable(TableIR):
     def render(self, r):
         return '(MatrixEntriesTable {})'.format(r(self.child))
 
+    def _compute_type(self):
+        t = self.child.typ
+        return ttable(t.global_type,
+                      t.row_type._concat(t.col_type)._concat(t.entry_type),
+                      t.row_key + t.col_key)
+
 
 class TableFilter(TableIR):
     def __init__(self, child, pred):
@@ -154,6 +210,9 @@ class TableFilter(TableIR):
     def render(self, r):
         return '(TableFilter {} {})'.format(r(self.child), r(self.pred))
 
+    def _compute_type(self):
+        return self.child.typ
+
 
 class TableKeyByAndAggregate(TableIR):
     def __init__(self, child, expr, new_key, n_partitions, buffer_size):
@@ -171,6 +230,12 @@ class TableKeyByAndAggregate(TableIR):
                                                                 r(self.expr),
                                                                 self.new_key)
 
+    def _compute_type(self):
+        t = self.child.typ
+        env = t._ref_map()
+        key_type = self.new_key.compute_type(env)
+        return ttable(t.global_type, key_type._concat(self.expr.compute_type(env)), list(key_type))
+
 
 class TableAggregateByKey(TableIR):
     def __init__(self, child, expr):
@@ -181,6 +246,10 @@ class TableAggregateByKey(TableIR):
     def render(self, r):
         return '(TableAggregateByKey {} {})'.format(r(self.child), r(self.expr))
 
+    def _compute_type(self):
+        t = self.child.typ
+        return t._copy(row_type=t._key_type._concat(self.expr.compute_type(t._ref_map())))
+
 
 class MatrixColsTable(TableIR):
     def __init__(self, child):
@@ -190,6 +259,10 @@ class MatrixColsTable(TableIR):
     def render(self, r):
         return '(MatrixColsTable {})'.format(r(self.child))
 
+    def _compute_type(self):
+        t = self.child.typ
+        return ttable(t.global_type, t.col_type, t.col_key)
+
 
 class TableParallelize(TableIR):
     def __init__(self, rows_and_global, n_partitions):
@@ -202,6 +275,10 @@ class TableParallelize(TableIR):
             self.n_partitions,
             r(self.rows_and_global))
 
+    def _compute_type(self):
+        t = self.rows_and_global.compute_type({})
+        return ttable(t['global'], t['rows'].element_type, [])
+
 
 class TableHead(TableIR):
     def __init__(self, child, n):
@@ -212,6 +289,9 @@ class TableHead(TableIR):
     def render(self, r):
         return f'(TableHead {self.n} {r(self.child)})'
 
+    def _compute_type(self):
+        return self.child.typ
+
 
 class TableOrderBy(TableIR):
     def __init__(self, child, sort_fields):
@@ -224,6 +304,9 @@ class TableOrderBy(TableIR):
             ' '.join(['{}{}'.format(order, escape_id(f)) for (f, order) in self.sort_fields]),
             r(self.child))
 
+    def _compute_type(self):
+        return self.child.typ._copy(row_key=[])
+
 
 class TableDistinct(TableIR):
     def __init__(self, child):
@@ -233,6 +316,10 @@ class TableDistinct(TableIR):
     def render(self, r):
         return f'(TableDistinct {r(self.child)})'
 
+    def _compute_type(self):
+        return self.child.typ
+
+
 class RepartitionStrategy:
     SHUFFLE = 0
     COALESCE = 1
@@ -248,6 +335,9 @@ class TableRepartition(TableIR):
     def render(self, r):
         return f'(TableRepartition {self.n} {self.strategy} {r(self.child)})'
 
+    def _compute_type(self):
+        return self.child.typ
+
 
 class CastMatrixToTable(TableIR):
     def __init__(self, child, entries_field_name, cols_field_name):
@@ -262,6 +352,12 @@ class CastMatrixToTable(TableIR):
                f'"{escape_str(self.cols_field_name)}" ' \
                f'{r(self.child)})'
 
+    def _compute_type(self):
+        t = self.child.typ
+        return ttable(t.global_type._insert_fields(**{self.cols_field_name: tarray(t.col_type)}),
+                      t._rv_row_type._rename({tmatrix._entries_field: self.entries_field_name}),
+                      t.row_key)
+
 
 class TableRename(TableIR):
     def __init__(self, child, row_map, global_map):
@@ -278,6 +374,12 @@ class TableRename(TableIR):
                f'{parsable_strings(self.global_map.values())} ' \
                f'{r(self.child)})'
 
+    def _compute_type(self):
+        t = self.child.typ
+        return ttable(t.global_type._rename(self.global_map),
+                      t.row_type._rename(self.row_map),
+                      [self.row_map.get(k, k) for k in t.row_key])
+
 
 class TableMultiWayZipJoin(TableIR):
     def __init__(self, childs, data_name, global_name):
@@ -292,9 +394,16 @@ class TableMultiWayZipJoin(TableIR):
                f'"{escape_str(self.global_name)}" '\
                f'{" ".join([r(child) for child in self.childs])})'
 
+    def _compute_type(self):
+        t = self.childs[0].typ
+        return ttable(tstruct(**{self.global_name: tarray(t.global_type)}),
+                      t._key_type._concat(tstruct(**{self.data_name: tarray(t._value_type)})),
+                      t.row_key)
+
 
 class TableToTableApply(TableIR):
     def __init__(self, child, config):
+        super().__init__()
         self.child = child
         self.config = config
 
@@ -304,6 +413,7 @@ class TableToTableApply(TableIR):
 
 class MatrixToTableApply(TableIR):
     def __init__(self, child, config):
+        super().__init__()
         self.child = child
         self.config = config
 
@@ -313,7 +423,18 @@ class MatrixToTableApply(TableIR):
 
 class JavaTable(TableIR):
     def __init__(self, jir):
+        super().__init__()
         self._jir = jir
 
     def render(self, r):
         return f'(JavaTable {r.add_jir(self._jir)})'
+
+    def _compute_type(self):
+        return ttable._from_java(self._jir.typ())
+
+
+def _exploded_type(row_type, path):
+    t = row_type
+    for f in path:
+        t = t[f]
+    return t.element_type
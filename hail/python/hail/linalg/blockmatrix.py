@@ -5,7 +5,7 @@ from enum import IntEnum
 
 import hail as hl
 import hail.expr.aggregators as agg
-from hail.utils import new_temp_file, new_local_temp_file, local_path_uri, storage_level
+from hail.utils import new_temp_file, storage_level
 from hail.utils.java import Env, jarray, joption
 from hail.typecheck import *
 from hail.table import Table
@@ -334,7 +334,9 @@ class BlockMatrix(object):
         -----
         The ndarray must have two dimensions, each of non-zero size.
 
-        The number of entries must be less than :math:`2^{31}`.
+        The ndarray is sent to the JVM one block at a time, so it may be a
+        :class:`numpy.memmap` larger than memory. Each block is converted to
+        float64 as it is sent.
 
         Parameters
         ----------
@@ -354,13 +356,14 @@ class BlockMatrix(object):
             raise ValueError(f'from_numpy: ndarray dimensions must be non-zero, found shape {ndarray.shape}')
 
         nd = _ndarray_as_2d(ndarray)
-        nd = _ndarray_as_float64(nd)
         n_rows, n_cols = nd.shape
 
-        path = new_local_temp_file()
-        uri = local_path_uri(path)
-        nd.tofile(path)
-        return cls.fromfile(uri, n_rows, n_cols, block_size)
+        builder = Env.hail().linalg.BlockMatrixBuilder(Env.hc()._jhc, n_rows, n_cols, block_size)
+        for i in range((n_rows + block_size - 1) // block_size):
+            for j in range((n_cols + block_size - 1) // block_size):
+                block = nd[i * block_size:(i + 1) * block_size, j * block_size:(j + 1) * block_size]
+                builder.addBlock(i, j, _block_to_bytes(block))
+        return cls(builder.result())
 
     @classmethod
     @typecheck_method(entry_expr=expr_float64,
@@ -1117,7 +1120,8 @@ class BlockMatrix(object):
         row_major = Env.hail().utils.richUtils.RichDenseMatrixDouble.exportToDoubles(Env.hc()._jhc, uri, bdm, True)
         assert row_major
 
-    def to_numpy(self):
+    @typecheck_method(out=nullable(np.ndarray))
+    def to_numpy(self, out=None):
         """Collects the block matrix into a `NumPy ndarray
         <https://docs.scipy.org/doc/numpy/reference/generated/numpy.ndarray.html>`__.
 
@@ -1126,20 +1130,47 @@ class BlockMatrix(object):
         >>> bm = BlockMatrix.random(10, 20)
         >>> a = bm.to_numpy()
 
+        Collect into a memory-mapped file, for a matrix larger than memory:
+
+        >>> import numpy as np
+        >>> out = np.memmap('output/bm.dat', dtype='float64', mode='w+', shape=(10, 20))
+        >>> a = bm.to_numpy(out=out)
+
         Notes
         -----
-        The number of entries must be less than :math:`2^{31}`.
-
         The resulting ndarray will have the same shape as the block matrix.
 
+        Blocks are computed in parallel and copied into the ndarray one at a
+        time, without writing a temporary file. At most about 1 GiB of blocks
+        is held on the driver at once.
+
+        Parameters
+        ----------
+        out: :class:`numpy.ndarray`, optional
+            ndarray of the same shape as the block matrix to fill, such as a
+            :class:`numpy.memmap`. By default, a new float64 ndarray.
+
         Returns
         -------
         :class:`numpy.ndarray`
+            `out`, if given.
         """
-        path = new_local_temp_file()
-        uri = local_path_uri(path)
-        self.tofile(uri)
-        return np.fromfile(path).reshape((self.n_rows, self.n_cols))
+        shape = (self.n_rows, self.n_cols)
+        if out is None:
+            out = np.zeros(shape) if self.is_sparse else np.empty(shape)
+        else:
+            if out.shape != shape:
+                raise ValueError(f'to_numpy: out must have shape {shape}, found {out.shape}')
+            if self.is_sparse:
+                out.fill(0)
+
+        block_size = self.block_size
+        it = Env.hail().linalg.BlockIterator(self._jbm, _max_transfer_bytes)
+        while it.hasNext():
+            i, j, block = _block_from_bytes(it.next())
+            n_rows, n_cols = block.shape
+            out[i * block_size:i * block_size + n_rows, j * block_size:j * block_size + n_cols] = block
+        return out
 
     @property
     def is_sparse(self):
@@ -2176,22 +2207,45 @@ def _ndarray_as_float64(nd):
     return nd
 
 
+# bytes of blocks held on the driver at once while collecting a block matrix,
+# see BlockIterator
+_max_transfer_bytes = 1 << 30
+
+
+def _block_to_bytes(block):
+    # column-major, as breeze stores dense matrices
+    return _ndarray_as_float64(block).astype('<f8', copy=False).tobytes(order='F')
+
+
+def _block_from_bytes(b):
+    i, j, n_rows, n_cols = np.frombuffer(b, dtype='<i4', count=4)
+    block = np.frombuffer(b, dtype='<f8', offset=16).reshape((n_cols, n_rows)).T
+    return int(i), int(j), block
+
+
 def _jarray_from_ndarray(nd):
+    # a JVM array has fewer than 2^31 elements
     if nd.size >= (1 << 31):
         raise ValueError(f'size of ndarray must be less than 2^31, found {nd.size}')
 
-    nd = _ndarray_as_float64(nd)
-    path = new_local_temp_file()
-    uri = local_path_uri(path)
-    nd.tofile(path)
-    return Env.hail().utils.richUtils.RichArray.importFromDoubles(Env.hc()._jhc, uri, nd.size)
+    nd = _ndarray_as_float64(nd).ravel()
+    transfer = Env.hail().linalg.NumpyTransfer
+    chunk_size = transfer.chunkSize()
+    ja = transfer.newArray(nd.size)
+    for start in range(0, nd.size, chunk_size):
+        transfer.copyFromBytes(nd[start:start + chunk_size].astype('<f8', copy=False).tobytes(), ja, start)
+    return ja
 
 
 def _ndarray_from_jarray(ja):
-    path = new_local_temp_file()
-    uri = local_path_uri(path)
-    Env.hail().utils.richUtils.RichArray.exportToDoubles(Env.hc()._jhc, uri, ja)
-    return np.fromfile(path)
+    transfer = Env.hail().linalg.NumpyTransfer
+    chunk_size = transfer.chunkSize()
+    n = len(ja)
+    nd = np.empty(n)
+    for start in range(0, n, chunk_size):
+        end = min(start + chunk_size, n)
+        nd[start:end] = np.frombuffer(transfer.copyToBytes(ja, start, end), dtype='<f8')
+    return nd
 
 
 def _breeze_fromfile(uri, n_rows, n_cols):
@@ -2207,13 +2261,8 @@ def _breeze_from_ndarray(nd):
         raise ValueError(f'from_numpy: ndarray dimensions must be non-zero, found shape {nd.shape}')
 
     nd = _ndarray_as_2d(nd)
-    nd = _ndarray_as_float64(nd)
     n_rows, n_cols = nd.shape
-
-    path = new_local_temp_file()
-    uri = local_path_uri(path)
-    nd.tofile(path)
-    return _breeze_fromfile(uri, n_rows, n_cols)
+    return Env.hail().linalg.NumpyTransfer.denseMatrix(n_rows, n_cols, _jarray_from_ndarray(nd.T))
 
 
 def _svd(a, full_matrices=True, compute_uv=True, overwrite_a=False, check_finite=True):
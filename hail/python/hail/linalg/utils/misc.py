@@ -165,32 +165,28 @@ def locus_windows(locus_expr, radius, coord_expr=None):
     if radius < 0:
         raise ValueError(f"locus_windows: 'radius' must be non-negative, found {radius}")
     check_row_indexed('locus_windows', locus_expr)
+    # global positions are non-negative, so -1 marks a missing locus
+    global_pos_expr = hl.or_else(locus_expr.global_position(), hl.int64(-1))
     if coord_expr is None:
-        global_pos_list = locus_expr.global_position().collect()
-        n_loci = len(global_pos_list)
-        global_pos = np.zeros(n_loci, dtype=np.int64)
-        for i, p in enumerate(global_pos_list):
-            if p is None:
-                raise ValueError(f"locus_windows: missing value for 'locus_expr' global position at row {i}")
-            global_pos[i] = p
+        global_pos = global_pos_expr.collect_numpy()
         coord = global_pos
-        del global_pos_list
     else:
         check_row_indexed('locus_windows', coord_expr)
-        global_pos_and_coord =\
-            hl.tuple([locus_expr.global_position(), coord_expr]).collect()  # raises exception if sources differ
-        n_loci = len(global_pos_and_coord)
-
-        global_pos = np.zeros(n_loci, dtype=np.int64)
-        coord = np.zeros(n_loci, dtype=np.float64)
-        for i, x in enumerate(global_pos_and_coord):
-            if x[0] is None:
-                raise ValueError(f"locus_windows: missing value for 'locus_expr' global position at row {i}")
-            global_pos[i] = x[0]
-            if x[1] is None:
-                raise ValueError(f"locus_windows: missing value for 'coord_expr' at row {i}")
-            coord[i] = x[1]
-        del global_pos_and_coord
+        a = hl.struct(global_pos=global_pos_expr,
+                      coord=coord_expr,
+                      coord_defined=hl.is_defined(coord_expr)).collect_numpy()  # raises exception if sources differ
+        global_pos = np.copy(a['global_pos'])
+        coord = np.copy(a['coord'])
+        coord_missing = ~a['coord_defined']
+        del a
+
+    n_loci = global_pos.size
+    if np.any(global_pos < 0):
+        i = int(np.argmax(global_pos < 0))
+        raise ValueError(f"locus_windows: missing value for 'locus_expr' global position at row {i}")
+    if coord_expr is not None and np.any(coord_missing):
+        i = int(np.argmax(coord_missing))
+        raise ValueError(f"locus_windows: missing value for 'coord_expr' at row {i}")
 
     if n_loci == 0:
         return np.zeros(shape=0, dtype=np.int64), np.zeros(shape=0, dtype=np.int64)
@@ -543,14 +543,17 @@ class MatrixTable(ExprContainer):
 
     @staticmethod
     def _from_java(jmt):
-        return MatrixTable(JavaMatrix(jmt.ast()))
+        mt = MatrixTable(JavaMatrix(jmt.ast()))
+        mt._jmatrix = jmt
+        return mt
 
     def __init__(self, mir):
         super(MatrixTable, self).__init__()
 
         self._mir = mir
-        self._jmt = Env.hail().variant.MatrixTable(
-            Env.hc()._jhc, Env.hc()._backend._to_java_ir(self._mir))
+        # the Java matrix table is built on first use; the schema below comes
+        # from the Python-side type of the IR
+        self._jmatrix = None
 
         self._globals = None
         self._col_values = None
@@ -600,6 +603,13 @@ class MatrixTable(ExprContainer):
                                     self._entry.items()):
             self._set_field(k, v)
 
+    @property
+    def _jmt(self):
+        if self._jmatrix is None:
+            self._jmatrix = Env.hail().variant.MatrixTable(
+                Env.hc()._jhc, Env.hc()._backend._to_java_ir(self._mir))
+        return self._jmatrix
+
     @property
     def _schema(self) -> tmatrix:
         return tmatrix(
@@ -1655,8 +1665,8 @@ class MatrixTable(ExprContainer):
         return self._select_entries(caller,
                                     self.entry.annotate(**named_exprs).drop(*fields_referenced))
 
-    @typecheck_method(expr=expr_any, _localize=bool)
-    def aggregate_rows(self, expr, _localize=True) -> Any:
+    @typecheck_method(expr=expr_any, _localize=bool, _async=bool)
+    def aggregate_rows(self, expr, _localize=True, _async=False) -> Any:
         """Aggregate over rows to a local value.
 
         Examples
@@ -1699,12 +1709,14 @@ class MatrixTable(ExprContainer):
 
         agg_ir = TableAggregate(MatrixRowsTable(base._mir), subst_query)
         if _localize:
+            if _async:
+                return Env.backend().execute_async(agg_ir)
             return Env.backend().execute(agg_ir)
         else:
             return construct_expr(agg_ir, expr.dtype)
 
-    @typecheck_method(expr=expr_any, _localize=bool)
-    def aggregate_cols(self, expr, _localize=True) -> Any:
+    @typecheck_method(expr=expr_any, _localize=bool, _async=bool)
+    def aggregate_cols(self, expr, _localize=True, _async=False) -> Any:
         """Aggregate over columns to a local value.
 
         Examples
@@ -1749,12 +1761,14 @@ class MatrixTable(ExprContainer):
 
         agg_ir = TableAggregate(MatrixColsTable(base._mir), subst_query)
         if _localize:
+            if _async:
+                return Env.backend().execute_async(agg_ir)
             return Env.backend().execute(agg_ir)
         else:
             return construct_expr(agg_ir, expr.dtype)
 
-    @typecheck_method(expr=expr_any, _localize=bool)
-    def aggregate_entries(self, expr, _localize=True) -> Any:
+    @typecheck_method(expr=expr_any, _localize=bool, _async=bool)
+    def aggregate_entries(self, expr, _localize=True, _async=False) -> Any:
         """Aggregate over entries to a local value.
 
         Examples
@@ -1793,6 +1807,8 @@ class MatrixTable(ExprContainer):
         analyze('MatrixTable.aggregate_entries', expr, self._global_indices, {self._row_axis, self._col_axis})
         agg_ir = MatrixAggregate(base._mir, expr._ir)
         if _localize:
+            if _async:
+                return Env.backend().execute_async(agg_ir)
             return Env.backend().execute(agg_ir)
         else:
             return construct_expr(agg_ir, expr.dtype)
@@ -2157,9 +2173,10 @@ class MatrixTable(ExprContainer):
     @typecheck_method(output=str,
                       overwrite=bool,
                       stage_locally=bool,
-                      _codec_spec=nullable(str))
+                      _codec_spec=nullable(str),
+                      _async=bool)
     def write(self, output: str, overwrite: bool = False, stage_locally: bool = False,
-              _codec_spec: Optional[str] = None):
+              _codec_spec: Optional[str] = None, _async: bool = False):
         """Write to disk.
 
         Examples
@@ -2183,7 +2200,10 @@ class MatrixTable(ExprContainer):
         """
 
         writer = MatrixNativeWriter(output, overwrite, stage_locally, _codec_spec)
-        Env.backend().execute(MatrixWrite(self._mir, writer))
+        write_ir = MatrixWrite(self._mir, writer)
+        if _async:
+            return Env.backend().execute_async(write_ir)
+        Env.backend().execute(write_ir)
 
     def globals_table(self) -> Table:
         """Returns a table with a single row with the globals of the matrix table.
@@ -2290,6 +2310,111 @@ class MatrixTable(ExprContainer):
 
         return Table(MatrixEntriesTable(self._mir))
 
+    @typecheck_method(entry_expr=oneof(expr_numeric, expr_bool, expr_call),
+                      dtype=anytype,
+                      missing=enumeration('nan', 'mean', 'mask'))
+    def to_numpy(self, entry_expr, dtype='float64', missing='nan'):
+        """Collect an entry expression into a 2-dimensional numpy array, with
+        one row per row and one column per column of the matrix.
+
+        Examples
+        --------
+        Alternate allele counts, as 8-bit integers with missing calls masked:
+
+        >>> gt = dataset.to_numpy(dataset.GT, dtype='int8', missing='mask')
+
+        Read depths, with missing values set to the mean of their row:
+
+        >>> dp = dataset.to_numpy(dataset.DP, dtype='float32', missing='mean')
+
+        Notes
+        -----
+        Calls are converted to the number of alternate alleles, see
+        :meth:`.CallExpression.n_alt_alleles`, and booleans to 0 and 1.
+
+        Missing values are handled according to `missing`:
+
+        - ``'nan'``: missing values are ``NaN``.
+        - ``'mean'``: missing values are the mean of the defined values in
+          their row, or ``NaN`` if none are defined.
+        - ``'mask'``: returns a :class:`numpy.ma.MaskedArray` in which missing
+          values are masked.
+
+        ``'nan'`` and ``'mean'`` require a floating point `dtype`.
+
+        Entries are streamed in blocks of rows, as by
+        :meth:`iter_numpy_blocks`, without writing a block matrix or
+        temporary files, and without holding all entries in the JVM at once.
+
+        Parameters
+        ----------
+        entry_expr : :class:`.NumericExpression` or :class:`.BooleanExpression` or :class:`.CallExpression`
+            Entry-indexed expression.
+        dtype : :obj:`str` or :class:`numpy.dtype`
+            One of ``int8``, ``int32``, ``int64``, ``float32`` or ``float64``.
+        missing : :obj:`str`
+            One of ``'nan'``, ``'mean'`` or ``'mask'``.
+
+        Returns
+        -------
+        :class:`numpy.ndarray` or :class:`numpy.ma.MaskedArray`
+        """
+        import numpy as np
+
+        blocks = list(self.iter_numpy_blocks(entry_expr, dtype=dtype, missing=missing))
+        if not blocks:
+            a = np.empty((0, self.count_cols()), dtype=dtype)
+            return np.ma.masked_array(a) if missing == 'mask' else a
+        if missing == 'mask':
+            return np.ma.concatenate(blocks)
+        return np.concatenate(blocks)
+
+    @typecheck_method(entry_expr=oneof(expr_numeric, expr_bool, expr_call),
+                      block_size=int,
+                      dtype=anytype,
+                      missing=enumeration('nan', 'mean', 'mask'))
+    def iter_numpy_blocks(self, entry_expr, block_size=4096, dtype='float64', missing='nan'):
+        """Iterate over an entry expression in blocks of rows, as
+        2-dimensional numpy arrays.
+
+        Examples
+        --------
+
+        >>> for block in dataset.iter_numpy_blocks(dataset.GT, block_size=1024, dtype='int8', missing='mask'):
+        ...     assert block.shape[1] == dataset.count_cols()
+
+        Notes
+        -----
+        Each block has at most `block_size` rows and one column per column of
+        the matrix. Values are converted, and missing values handled, as by
+        :meth:`to_numpy`. With ``missing='mean'``, the mean is that of the
+        row, so it does not depend on `block_size`.
+
+        Blocks are computed as the iteration reaches them; see
+        :meth:`.Table.iter_batches`.
+
+        Parameters
+        ----------
+        entry_expr : :class:`.NumericExpression` or :class:`.BooleanExpression` or :class:`.CallExpression`
+            Entry-indexed expression.
+        block_size : :obj:`int`
+            Maximum number of rows in each block.
+        dtype : :obj:`str` or :class:`numpy.dtype`
+            One of ``int8``, ``int32``, ``int64``, ``float32`` or ``float64``.
+        missing : :obj:`str`
+            One of ``'nan'``, ``'mean'`` or ``'mask'``.
+
+        Returns
+        -------
+        iterator of :class:`numpy.ndarray` or :class:`numpy.ma.MaskedArray`
+        """
+        from hail.backend import columnar
+
+        analyze('MatrixTable.iter_numpy_blocks', entry_expr, self._entry_indices)
+        if block_size < 1:
+            raise ValueError(f"'iter_numpy_blocks': 'block_size' must be positive, found {block_size}")
+        return columnar.entry_blocks(self, entry_expr, block_size, dtype, missing)
+
     def index_globals(self) -> Expression:
         """Return this matrix table's global variables for use in another
         expression context.
@@ -1,6 +1,5 @@
 import itertools
 import math
-import numpy as np
 from typing import *
 
 import hail as hl
@@ -9,10 +8,8 @@ from hail.expr.expressions import *
 from hail.expr.types import *
 from hail.ir import *
 from hail.genetics.reference_genome import reference_genome_type
-from hail.linalg import BlockMatrix
 from hail.matrixtable import MatrixTable
 from hail.methods.misc import require_biallelic, require_row_key_variant
-from hail.stats import LinearMixedModel
 from hail.table import Table
 from hail.typecheck import *
 from hail.utils import wrap_to_list, new_temp_file
@@ -773,7 +770,7 @@ def poisson_regression_rows(test, y, x, covariates, pass_through=()) -> Table:
 @typecheck(y=expr_float64,
            x=sequenceof(expr_float64),
            z_t=nullable(expr_float64),
-           k=nullable(np.ndarray),
+           k=nullable(lazy_type('numpy.ndarray')),
            p_path=nullable(str),
            overwrite=bool,
            standardize=bool,
@@ -901,6 +898,9 @@ def linear_mixed_model(y,
         The type is block matrix if the model is low rank (i.e., if `z_t` is set
         and :math:`n > m`).
     """
+    import numpy as np
+    from hail.linalg import BlockMatrix
+    from hail.stats import LinearMixedModel
     source = matrix_table_source('linear_mixed_model/y', y)
 
     if ((z_t is None and k is None) or
@@ -913,11 +913,9 @@ def linear_mixed_model(y,
     _warn_if_no_intercept('linear_mixed_model', x)
 
     # collect x and y in one pass
-    mt = source.select_cols(xy=hl.array(x + [y])).key_cols_by()
-    xy = np.array(mt.xy.collect(), dtype=np.float64)
-    xy = xy.reshape(xy.size // (len(x) + 1), len(x) + 1)
-    x_nd = np.copy(xy[:, :-1])
-    y_nd = np.copy(xy[:, -1])
+    xy = hl.tuple(x + [y]).collect_numpy()
+    x_nd = np.column_stack([xy[f] for f in xy.dtype.names[:-1]])
+    y_nd = np.copy(xy[xy.dtype.names[-1]])
     n = y_nd.size
     del xy
 
@@ -948,7 +946,7 @@ def linear_mixed_model(y,
 
 
 @typecheck(entry_expr=expr_float64,
-           model=LinearMixedModel,
+           model=lazy_type('hail.stats.LinearMixedModel'),
            pa_t_path=nullable(str),
            a_t_path=nullable(str),
            mean_impute=bool,
@@ -1075,6 +1073,7 @@ def linear_mixed_regression_rows(entry_expr,
     -------
     :class:`.Table`
     """
+    from hail.linalg import BlockMatrix
     mt = matrix_table_source('linear_mixed_regression_rows', entry_expr)
     n = mt.count_cols()
 
@@ -1761,6 +1760,7 @@ def pc_relate(call_expr, min_individual_maf, *, k=None, scores_expr=None,
     :class:`.Table`
         A :class:`.Table` mapping pairs of samples to their pair-wise statistics.
     """
+    from hail.linalg import BlockMatrix
     mt = matrix_table_source('pc_relate/call_expr', call_expr)
 
     if k and scores_expr is None:
@@ -2187,7 +2187,7 @@ def split_multi_hts(ds, keep_star=False, left_aligned=False, vep_root='vep'):
 
 
 @typecheck(call_expr=expr_call)
-def genetic_relatedness_matrix(call_expr) -> BlockMatrix:
+def genetic_relatedness_matrix(call_expr) -> 'BlockMatrix':
     r"""Compute the genetic relatedness matrix (GRM).
 
     Examples
@@ -2244,6 +2244,7 @@ def genetic_relatedness_matrix(call_expr) -> BlockMatrix:
         Genetic relatedness matrix for all samples. Row and column indices
         correspond to matrix table column index.
     """
+    from hail.linalg import BlockMatrix
     mt = matrix_table_source('genetic_relatedness_matrix/call_expr', call_expr)
     check_entry_indexed('genetic_relatedness_matrix/call_expr', call_expr)
 
@@ -2262,7 +2263,7 @@ def genetic_relatedness_matrix(call_expr) -> BlockMatrix:
 
 
 @typecheck(call_expr=expr_call)
-def realized_relationship_matrix(call_expr) -> BlockMatrix:
+def realized_relationship_matrix(call_expr) -> 'BlockMatrix':
     r"""Computes the realized relationship matrix (RRM).
 
     Examples
@@ -2317,6 +2318,7 @@ def realized_relationship_matrix(call_expr) -> BlockMatrix:
         Realized relationship matrix for all samples. Row and column indices
         correspond to matrix table column index.
     """
+    from hail.linalg import BlockMatrix
     mt = matrix_table_source('realized_relationship_matrix/call_expr', call_expr)
     check_entry_indexed('realized_relationship_matrix/call_expr', call_expr)
 
@@ -2335,7 +2337,7 @@ def realized_relationship_matrix(call_expr) -> BlockMatrix:
 
 
 @typecheck(entry_expr=expr_float64, block_size=nullable(int))
-def row_correlation(entry_expr, block_size=None) -> BlockMatrix:
+def row_correlation(entry_expr, block_size=None) -> 'BlockMatrix':
     """Computes the correlation matrix between row vectors.
 
     Examples
@@ -2430,6 +2432,7 @@ def row_correlation(entry_expr, block_size=None) -> BlockMatrix:
         Correlation matrix between row vectors. Row and column indices
         correspond to matrix table row index.
     """
+    from hail.linalg import BlockMatrix
     bm = BlockMatrix.from_entry_expr(entry_expr, mean_impute=True, center=True, normalize=True, block_size=block_size)
     return bm @ bm.T
 
@@ -2439,7 +2442,7 @@ def row_correlation(entry_expr, block_size=None) -> BlockMatrix:
            radius=oneof(int, float),
            coord_expr=nullable(expr_float64),
            block_size=nullable(int))
-def ld_matrix(entry_expr, locus_expr, radius, coord_expr=None, block_size=None) -> BlockMatrix:
+def ld_matrix(entry_expr, locus_expr, radius, coord_expr=None, block_size=None) -> 'BlockMatrix':
     """Computes the windowed correlation (linkage disequilibrium) matrix between
     variants.
 
@@ -3271,6 +3274,7 @@ def ld_prune(call_expr, r2=0.2, bp_window_size=1000000, memory_per_core=256, kee
     :class:`.Table`
         Table of a maximal independent set of variants.
     """
+    from hail.linalg import BlockMatrix
     if block_size is None:
         block_size = BlockMatrix.default_block_size()
 
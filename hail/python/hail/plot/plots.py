@@ -9,6 +9,7 @@ from hail.expr import aggregators
 from hail.expr.expressions import *
 from hail.expr.expressions import Expression
 from hail.typecheck import *
+from hail.utils.java import Env
 from hail import Table
 import hail
 
@@ -243,22 +244,28 @@ def qq(pvals, collect_all=False, n_divisions=500):
         source = pvals._indices.source
         if source is not None:
             if collect_all:
-                pvals = pvals.collect()
-                spvals = sorted(filter(lambda x: x and not(isnan(x)), pvals))
-                exp = [-log(float(i) / len(spvals), 10) for i in np.arange(1, len(spvals) + 1, 1)]
-                obs = [-log(p, 10) for p in spvals]
+                pvals = pvals.collect_numpy()
+                spvals = np.sort(pvals[(pvals != 0) & ~np.isnan(pvals)])
+                exp = -np.log10(np.arange(1, len(spvals) + 1) / len(spvals))
+                obs = -np.log10(spvals)
             else:
                 if isinstance(source, Table):
                     ht = source.select(pval=pvals).key_by().persist().key_by('pval')
                 else:
                     ht = source.select_rows(pval=pvals).rows().key_by().select('pval').persist().key_by('pval')
-                n = ht.count()
                 ht = ht.select(idx=hail.scan.count())
-                ht = ht.annotate(expected_p=(ht.idx + 1) / n)
-                pvals = ht.aggregate(
-                    aggregators.downsample(-hail.log10(ht.expected_p), -hail.log10(ht.pval), n_divisions=n_divisions))
-                exp = [point[0] for point in pvals if not isnan(point[1])]
-                obs = [point[1] for point in pvals if not isnan(point[1])]
+                # the expected p-value is (idx + 1) / n, so on the -log10
+                # scale it is -log10(idx + 1) shifted by log10(n). Downsampling
+                # bins points relative to their range, so downsampling the
+                # unshifted values lets the count and the downsampling share
+                # one pass
+                res = ht.aggregate(hail.struct(
+                    n=aggregators.count(),
+                    points=aggregators.downsample(-hail.log10(ht.idx + 1), -hail.log10(ht.pval),
+                                                  n_divisions=n_divisions)))
+                shift = log10(res.n) if res.n > 0 else 0
+                exp = [point[0] + shift for point in res.points if not isnan(point[1])]
+                obs = [point[1] for point in res.points if not isnan(point[1])]
         else:
             return ValueError('Invalid input: expression has no source')
     else:
@@ -330,10 +337,17 @@ def manhattan(pvals, locus=None, title=None, size=4, hover_fields=None, collect_
     pvals = -hail.log10(pvals)
 
     if collect_all:
-        res = hail.tuple([locus.global_position(), pvals, hail.struct(**hover_fields)]).collect()
-        hf_struct = [point[2] for point in res]
-        for key in hover_fields:
-            hover_fields[key] = [item[key] for item in hf_struct]
+        # positions and p-values come back as numpy arrays, the hover
+        # fields as lists, in one pass
+        from hail.backend import columnar
+        uids = [Env.get_uid() for _ in hover_fields]
+        columns = columnar.expr_columns(hail.struct(
+            **{'x': locus.global_position(), 'y': pvals},
+            **{uid: value for uid, value in zip(uids, hover_fields.values())}))
+        x = columns['x']
+        y = columns['y']
+        for key, uid in zip(list(hover_fields), uids):
+            hover_fields[key] = columns[uid]
     else:
         agg_f = pvals._aggregation_method()
         res = agg_f(aggregators.downsample(locus.global_position(), pvals,
@@ -342,9 +356,9 @@ def manhattan(pvals, locus=None, title=None, size=4, hover_fields=None, collect_
         fields = [point[2] for point in res]
         for idx, key in enumerate(list(hover_fields.keys())):
             hover_fields[key] = [field[idx] for field in fields]
+        x = [point[0] for point in res]
+        y = [point[1] for point in res]
 
-    x = [point[0] for point in res]
-    y = [point[1] for point in res]
     y_linear = [10 ** (-p) for p in y]
     hover_fields['p_value'] = y_linear
 
@@ -1,5 +1,3 @@
-import pandas
-import pyspark
 import warnings
 
 from typing import *
@@ -318,14 +316,17 @@ class Table(ExprContainer):
 
     @staticmethod
     def _from_java(jt):
-        return Table(JavaTable(jt.tir()))
+        t = Table(JavaTable(jt.tir()))
+        t._jtable = jt
+        return t
 
     def __init__(self, tir):
         super(Table, self).__init__()
 
         self._tir = tir
-        self._jt = Env.hail().table.Table(
-            Env.hc()._jhc, Env.hc()._backend._to_java_ir(self._tir))
+        # the Java table is built on first use; the schema below comes from
+        # the Python-side type of the IR
+        self._jtable = None
 
         self._type = self._tir.typ
 
@@ -350,6 +351,13 @@ class Table(ExprContainer):
                                     self._row.items()):
             self._set_field(k, v)
 
+    @property
+    def _jt(self):
+        if self._jtable is None:
+            self._jtable = Env.hail().table.Table(
+                Env.hc()._jhc, Env.hc()._backend._to_java_ir(self._tir))
+        return self._jtable
+
     @property
     def _schema(self) -> ttable:
         return ttable(self._global_type, self._row_type, list(self._key))
@@ -398,7 +406,8 @@ class Table(ExprContainer):
         """
         return self._jt.nPartitions()
 
-    def count(self):
+    @typecheck_method(_async=bool)
+    def count(self, _async=False):
         """Count the number of rows in the table.
 
         Examples
@@ -411,7 +420,10 @@ class Table(ExprContainer):
         -------
         :obj:`int`
         """
-        return Env.backend().execute(TableCount(self._tir))
+        count_ir = TableCount(self._tir)
+        if _async:
+            return Env.backend().execute_async(count_ir)
+        return Env.backend().execute(count_ir)
 
     def _force_count(self):
         return Env.backend().execute(TableToValueApply(self._tir, {'name': 'ForceCountTable'}))
@@ -1107,8 +1119,8 @@ class Table(ExprContainer):
 
         return GroupedTable(self, groups)
 
-    @typecheck_method(expr=expr_any, _localize=bool)
-    def aggregate(self, expr, _localize=True):
+    @typecheck_method(expr=expr_any, _localize=bool, _async=bool)
+    def aggregate(self, expr, _localize=True, _async=False):
         """Aggregate over rows into a local value.
 
         Examples
@@ -1140,6 +1152,8 @@ class Table(ExprContainer):
         agg_ir = TableAggregate(base._tir, expr._ir)
 
         if _localize:
+            if _async:
+                return Env.backend().execute_async(agg_ir)
             return Env.backend().execute(agg_ir)
         else:
             return construct_expr(agg_ir, expr.dtype)
@@ -1147,9 +1161,10 @@ class Table(ExprContainer):
     @typecheck_method(output=str,
                       overwrite=bool,
                       stage_locally=bool,
-                      _codec_spec=nullable(str))
+                      _codec_spec=nullable(str),
+                      _async=bool)
     def write(self, output: str, overwrite = False, stage_locally: bool = False,
-              _codec_spec: Optional[str] = None):
+              _codec_spec: Optional[str] = None, _async: bool = False):
         """Write to disk.
 
         Examples
@@ -1172,7 +1187,10 @@ class Table(ExprContainer):
             If ``True``, overwrite an existing file at the destination.
         """
 
-        Env.backend().execute(TableWrite(self._tir, output, overwrite, stage_locally, _codec_spec))
+        write_ir = TableWrite(self._tir, output, overwrite, stage_locally, _codec_spec)
+        if _async:
+            return Env.backend().execute_async(write_ir)
+        Env.backend().execute(write_ir)
 
     def _show(self, n, width, truncate, types):
         width = max(width, 8)
@@ -1663,7 +1681,8 @@ class Table(ExprContainer):
 
         Warning
         -------
-        Using this method can cause out of memory errors. Only collect small tables.
+        Using this method can cause out of memory errors. Only collect small
+        tables, or iterate over large ones with :meth:`iter_rows`.
 
         Returns
         -------
@@ -1672,6 +1691,65 @@ class Table(ExprContainer):
         """
         return Env.backend().execute(GetField(TableCollect(self._tir), 'rows'))
 
+    @typecheck_method(batch_size=int)
+    def iter_rows(self, batch_size=10_000):
+        """Iterate over the rows of the table, without collecting them all.
+
+        Examples
+        --------
+
+        >>> for row in table1.iter_rows():
+        ...     pass
+
+        Notes
+        -----
+        Rows are fetched in batches of `batch_size`, as by
+        :meth:`iter_batches`, when the iteration reaches them.
+
+        Parameters
+        ----------
+        batch_size : :obj:`int`
+            Number of rows to fetch at a time.
+
+        Returns
+        -------
+        iterator of :class:`.Struct`
+        """
+        batches = self.iter_batches(batch_size)
+        return (row for batch in batches for row in batch)
+
+    @typecheck_method(batch_size=int)
+    def iter_batches(self, batch_size=10_000):
+        """Iterate over the rows of the table in lists of at most `batch_size`
+        rows.
+
+        Examples
+        --------
+
+        >>> for batch in table1.iter_batches(batch_size=2):
+        ...     assert len(batch) <= 2
+
+        Notes
+        -----
+        Partitions are computed one at a time, when the iteration reaches
+        them, so the driver holds at most one partition and one batch of rows
+        at once, however large the table. Each partition is computed by its
+        own Spark job, so a table with an expensive pipeline upstream of a
+        shuffle should be written or checkpointed before it is iterated over.
+
+        Parameters
+        ----------
+        batch_size : :obj:`int`
+            Maximum number of rows in each batch.
+
+        Returns
+        -------
+        iterator of :obj:`list` of :class:`.Struct`
+        """
+        if batch_size < 1:
+            raise ValueError(f"'iter_batches': 'batch_size' must be positive, found {batch_size}")
+        return Env.spark_backend('iter_batches').iter_batches(self, batch_size)
+
     def describe(self, handler=print):
         """Print information about the fields in the table."""
 
@@ -2589,7 +2667,7 @@ class Table(ExprContainer):
         return self._row.drop(*self.key.keys())
 
     @staticmethod
-    @typecheck(df=pyspark.sql.DataFrame,
+    @typecheck(df=lazy_type('pyspark.sql.DataFrame'),
                key=table_key_type)
     def from_spark(df, key=[]):
         """Convert PySpark SQL DataFrame to a table.
@@ -2656,9 +2734,26 @@ class Table(ExprContainer):
     def to_pandas(self, flatten=True):
         """Converts this table to a Pandas DataFrame.
 
-        Because conversion to Pandas is done through Spark, and Spark
-        cannot represent complex types, types are expanded before
-        flattening or conversion.
+        Examples
+        --------
+
+        >>> df = table1.to_pandas()
+
+        Notes
+        -----
+        The rows are collected column by column, and numeric and boolean
+        fields become numpy arrays of the corresponding dtype without being
+        converted value by value. As in pandas, integer fields with missing
+        values become floating point, with missing values as ``NaN``; boolean
+        fields with missing values become ``object`` columns holding ``None``.
+        Other fields become ``object`` columns.
+
+        If `flatten` is ``True``, types are expanded as by
+        :meth:`expand_types` and the table is flattened, so that a locus
+        field ``locus`` becomes columns ``locus.contig`` and
+        ``locus.position``, a call field ``GT`` becomes ``GT.alleles`` and
+        ``GT.phased``, and so on. Otherwise, columns hold Python values such
+        as :class:`.Locus`, :class:`.Call` and :class:`.Struct`.
 
         Parameters
         ----------
@@ -2670,10 +2765,11 @@ class Table(ExprContainer):
         :class:`.pandas.DataFrame`
 
         """
-        return Env.spark_backend('to_pandas').to_pandas(self, flatten)
+        from hail.backend import columnar
+        return columnar.to_pandas(self, flatten)
 
     @staticmethod
-    @typecheck(df=pandas.DataFrame,
+    @typecheck(df=lazy_type('pandas.DataFrame'),
                key=oneof(str, sequenceof(str)))
     def from_pandas(df, key=[]):
         """Create table from Pandas DataFrame
@@ -2683,6 +2779,22 @@ class Table(ExprContainer):
 
         >>> t = hl.Table.from_pandas(df) # doctest: +SKIP
 
+        Notes
+        -----
+        Column types are converted to Hail types as follows:
+
+        .. code-block:: text
+
+          bool => :py:data:`.tbool`
+          int8, int16, int32, uint8, uint16 => :py:data:`.tint32`
+          int64, uint32 => :py:data:`.tint64`
+          float16, float32 => :py:data:`.tfloat32`
+          float64 => :py:data:`.tfloat64`
+
+        The type of an ``object`` column is imputed from its values, as by
+        :func:`.literal`; ``None`` and ``NaN`` in ``object`` columns are
+        missing. The index is not kept.
+
         Parameters
         ----------
         df : :class:`.pandas.DataFrame`
@@ -2694,7 +2806,8 @@ class Table(ExprContainer):
         -------
         :class:`.Table`
         """
-        return Env.spark_backend('from_pandas').from_pandas(df, key)
+        from hail.backend import columnar
+        return columnar.from_pandas(df, key)
 
     @typecheck_method(other=table_type, tolerance=nullable(numeric), absolute=bool)
     def _same(self, other, tolerance=1e-6, absolute=False):
@@ -16,6 +16,7 @@ __all__ = ['TypeChecker',
            'numeric',
            'char',
            'lazy',
+           'lazy_type',
            'enumeration',
            'identity',
            'transformed',
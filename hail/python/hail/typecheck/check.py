@@ -2,6 +2,7 @@ import re
 import inspect
 import abc
 import collections
+import importlib
 from decorator import decorator
 
 
@@ -244,6 +245,29 @@ class LazyChecker(TypeChecker):
         return extract(self.t)
 
 
+class LazyImportChecker(TypeChecker):
+    """Checks for instances of the class at the dotted path `name`, which is
+    only imported the first time a value is checked, so that modules with
+    heavy dependencies are not loaded by ``import hail``."""
+
+    def __init__(self, name):
+        self.name = name
+        self.t = None
+        super(LazyImportChecker, self).__init__()
+
+    def check(self, x, caller, param):
+        if self.t is None:
+            module, _, cls = self.name.rpartition('.')
+            self.t = getattr(importlib.import_module(module), cls)
+        if isinstance(x, self.t):
+            return x
+        else:
+            raise TypecheckFailure
+
+    def expects(self):
+        return self.name
+
+
 class ExactlyTypeChecker(TypeChecker):
     def __init__(self, v, reference_equality=False):
         self.v = v
@@ -404,6 +428,10 @@ def lazy():
     return LazyChecker()
 
 
+def lazy_type(name):
+    return LazyImportChecker(name)
+
+
 anytype = AnyChecker()
 
 numeric = oneof(int, float)
@@ -551,12 +579,20 @@ def typecheck(**checkers):
     return _make_dec(checkers, is_method=False)
 
 
+# when set, called with each checked function to get a context manager to
+# run the call in; see hail.utils.action_metrics
+_call_site_hook = None
+
+
 def _make_dec(checkers, is_method):
     checkers = {k: only(v) for k, v in checkers.items()}
 
     @decorator
     def wrapper(__original_func, *args, **kwargs):
         args_, kwargs_ = check_all(__original_func, args, kwargs, checkers, is_method=is_method)
-        return __original_func(*args_, **kwargs_)
+        if _call_site_hook is None:
+            return __original_func(*args_, **kwargs_)
+        with _call_site_hook(__original_func):
+            return __original_func(*args_, **kwargs_)
 
     return wrapper
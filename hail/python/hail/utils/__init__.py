@@ -5,6 +5,8 @@ from .linkedlist import LinkedList
 from .interval import Interval
 from .java import error, warn, info, FatalError
 from .tutorial import get_1kg, get_movie_lens
+from .profile import profile, Profile
+from .action_metrics import last_action_metrics
 
 __all__ = ['hadoop_open',
            'hadoop_copy',
@@ -35,4 +37,7 @@ __all__ = ['hadoop_open',
            'LinkedList',
            'get_1kg',
            'get_movie_lens',
-           'timestamp_path']
+           'timestamp_path',
+           'profile',
+           'Profile',
+           'last_action_metrics']
@@ -0,0 +1,258 @@
+import collections
+import json
+import math
+import sys
+import threading
+import time
+
+from .java import Env, FatalError
+from .struct import Struct
+
+_recorder = None
+
+
+class _ActionMetricsRecorder(object):
+    # calls shorter than this cannot have run a Spark job, and are not
+    # worth remembering
+    min_call_seconds = 1e-3
+    max_calls = 10000
+    max_jobs = 1000
+
+    # seconds to wait for the listener to receive the end of a job that
+    # has already returned to Python
+    completion_timeout = 10
+
+    def __init__(self, jsc):
+        self._jsc = jsc
+        self._jlistener = Env.hail().backend.ActionMetricsListener.register(jsc, self.max_jobs)
+        self._calls = collections.deque(maxlen=self.max_calls)
+        self._local = threading.local()
+
+    def stop(self):
+        Env.hail().backend.ActionMetricsListener.unregister(self._jsc, self._jlistener)
+
+    def _jobs(self, since):
+        return json.loads(self._jlistener.jobsJSON(since))
+
+    def last(self):
+        jobs = self._jobs(0)
+        if not jobs:
+            return None
+        t = max(j['submissionTime'] for j in jobs)
+        containing = [c for c in list(self._calls) if _ms(c[1], math.floor) <= t <= _ms(c[2], math.ceil)]
+        if containing:
+            # actions run concurrently are told apart only by time; the
+            # earliest call still running when the job started submitted it
+            site, start, end = min(containing, key=lambda c: c[1])
+            since, until = _ms(start, math.floor), _ms(end, math.ceil)
+        else:
+            site, start, end = None, t / 1000, None
+            since, until = t, t
+
+        deadline = time.time() + self.completion_timeout
+        while True:
+            jobs = [j for j in self._jobs(since) if j['submissionTime'] <= until]
+            # json4s leaves out the completion time of jobs still running
+            if all(j.get('completionTime') is not None for j in jobs) or time.time() > deadline:
+                break
+            time.sleep(0.05)
+        return _summarize(site, start, end, jobs)
+
+
+def _ms(seconds, rnd):
+    return int(rnd(seconds * 1000))
+
+
+class _CallScope(object):
+    """Records a call to a Hail function as a possible source of Spark jobs,
+    if it is the outermost such call on its thread."""
+
+    __slots__ = ['_recorder', '_site', '_start']
+
+    def __init__(self, recorder, site):
+        self._recorder = recorder
+        self._site = site
+        self._start = None
+
+    def __enter__(self):
+        local = self._recorder._local
+        depth = getattr(local, 'depth', 0)
+        local.depth = depth + 1
+        if depth == 0:
+            if self._site is None:
+                self._site = _stack_call_site()
+            local.site = self._site
+            self._start = time.time()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        local = self._recorder._local
+        local.depth -= 1
+        if self._start is not None:
+            local.site = None
+            end = time.time()
+            if end - self._start >= self._recorder.min_call_seconds:
+                self._recorder._calls.append((self._site, self._start, end))
+
+
+class _NoScope(object):
+    __slots__ = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+_no_scope = _NoScope()
+
+
+def _function_call_site(f):
+    return _CallScope(_recorder, f'{f.__module__}.{f.__qualname__}')
+
+
+def _call_site():
+    """Scope of a backend call. Records the call site from the stack, unless
+    it is already inside a recorded call."""
+    if _recorder is None:
+        return _no_scope
+    return _CallScope(_recorder, None)
+
+
+def _bind_call_site(f):
+    """Attribute the jobs `f` runs on another thread to the current call
+    site."""
+    recorder = _recorder
+    if recorder is None:
+        return f
+    site = getattr(recorder._local, 'site', None) or _stack_call_site()
+
+    def run(*args):
+        with _CallScope(recorder, site):
+            return f(*args)
+    return run
+
+
+def _stack_call_site():
+    # the outermost frame in Hail, below the user's code
+    site = None
+    frame = sys._getframe(1)
+    while frame is not None:
+        module = frame.f_globals.get('__name__', '')
+        if (module.startswith('hail.')
+                and not module.startswith(('hail.backend', 'hail.typecheck', 'hail.utils.action_metrics'))):
+            code = frame.f_code
+            self = frame.f_locals.get('self') if code.co_argcount > 0 and code.co_varnames[0] == 'self' else None
+            name = code.co_name if self is None else f'{type(self).__name__}.{code.co_name}'
+            site = f'{module}.{name}'
+        frame = frame.f_back
+    return site
+
+
+_stage_fields = [
+    ('numTasks', 'n_tasks', 1),
+    ('failedTasks', 'n_failed_tasks', 1),
+    ('inputBytes', 'input_bytes', 1),
+    ('inputRecords', 'input_records', 1),
+    ('outputBytes', 'output_bytes', 1),
+    ('shuffleReadBytes', 'shuffle_read_bytes', 1),
+    ('shuffleReadRecords', 'shuffle_read_records', 1),
+    ('shuffleWriteBytes', 'shuffle_write_bytes', 1),
+    ('shuffleWriteRecords', 'shuffle_write_records', 1),
+    ('memoryBytesSpilled', 'memory_bytes_spilled', 1),
+    ('diskBytesSpilled', 'disk_bytes_spilled', 1),
+    ('executorRunTime', 'executor_run_time', 1e-3),
+    ('executorCpuTime', 'executor_cpu_time', 1e-9),
+    ('jvmGCTime', 'jvm_gc_time', 1e-3),
+]
+
+
+def _summarize(site, start, end, jobs):
+    stages = []
+    for j in sorted(jobs, key=lambda j: j['jobId']):
+        for s in j['stages']:
+            if s['numTasks'] > 0:
+                stages.append(Struct(stage_id=s['stageId'],
+                                     job_id=j['jobId'],
+                                     name=s['name'],
+                                     **{name: s[k] * scale for k, name, scale in _stage_fields}))
+    totals = {name: sum(s[name] for s in stages) for _, name, _ in _stage_fields}
+    return Struct(call_site=site,
+                  start=start,
+                  duration=None if end is None else end - start,
+                  n_jobs=len(jobs),
+                  n_stages=len(stages),
+                  **totals,
+                  stages=stages)
+
+
+def _start(hc):
+    global _recorder
+    from hail.typecheck import check
+    _recorder = _ActionMetricsRecorder(hc._jsc)
+    check._call_site_hook = _function_call_site
+
+
+def _stop():
+    global _recorder
+    from hail.typecheck import check
+    if _recorder is not None:
+        check._call_site_hook = None
+        _recorder.stop()
+        _recorder = None
+
+
+def last_action_metrics():
+    """Spark metrics of the last Hail action, such as :meth:`.Table.write`
+    or :func:`.hwe_normalized_pca`, that ran Spark jobs.
+
+    Examples
+    --------
+
+    >>> hl.init(record_action_metrics=True)  # doctest: +SKIP
+    >>> dataset.write('output/metrics.mt', overwrite=True)  # doctest: +SKIP
+    >>> m = hl.utils.last_action_metrics()  # doctest: +SKIP
+    >>> m.call_site  # doctest: +SKIP
+    'hail.matrixtable.MatrixTable.write'
+
+    Notes
+    -----
+    Hail must be initialized with ``record_action_metrics=True``.
+
+    The result is a :class:`.Struct` with fields:
+
+    - `call_site` (:obj:`str`) -- The Hail function called, or ``None`` if
+      the jobs were not run by Hail.
+    - `start` (:obj:`float`) -- Start of the call, in seconds since the
+      epoch.
+    - `duration` (:obj:`float`) -- Duration of the call in seconds.
+    - `n_jobs`, `n_stages` (:obj:`int`) -- Number of Spark jobs, and of the
+      stages that ran tasks.
+    - `n_tasks`, `n_failed_tasks` (:obj:`int`) -- Number of tasks run, and
+      of those that failed.
+    - `input_bytes`, `input_records`, `output_bytes` (:obj:`int`) -- Data
+      read from and written to storage.
+    - `shuffle_read_bytes`, `shuffle_read_records`, `shuffle_write_bytes`,
+      `shuffle_write_records` (:obj:`int`) -- Data shuffled between stages.
+    - `memory_bytes_spilled`, `disk_bytes_spilled` (:obj:`int`) -- Data
+      spilled while shuffling and sorting.
+    - `executor_run_time`, `executor_cpu_time`, `jvm_gc_time`
+      (:obj:`float`) -- Time in seconds spent running tasks, on the CPU, and
+      collecting garbage, summed over tasks.
+    - `stages` (:obj:`list` of :class:`.Struct`) -- The same metrics for each
+      stage, with its `stage_id`, `job_id` and `name`.
+
+    Jobs are attributed to the outermost Hail call running when they were
+    submitted. Jobs of actions run concurrently on several threads may be
+    attributed to the earliest of them.
+
+    Returns
+    -------
+    :class:`.Struct` or ``None``
+        ``None`` if no Spark jobs have run.
+    """
+    if _recorder is None:
+        raise FatalError('action metrics are not recorded; initialize Hail with '
+                         "'hl.init(record_action_metrics=True)'")
+    return _recorder.last()
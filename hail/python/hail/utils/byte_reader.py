@@ -0,0 +1,87 @@
+import struct
+
+_int32 = struct.Struct('<i')
+_int64 = struct.Struct('<q')
+_float32 = struct.Struct('<f')
+_float64 = struct.Struct('<d')
+
+
+def _unframe_blocks(encoding):
+    """Strip the length-prefixed block framing written by the JVM's
+    ``BlockingBufferSpec(StreamBlockBufferSpec)`` output buffer."""
+    view = memoryview(encoding)
+    blocks = []
+    off = 0
+    end = len(view)
+    while off < end:
+        n = _int32.unpack_from(view, off)[0]
+        off += 4
+        blocks.append(view[off:off + n])
+        off += n
+    if len(blocks) == 1:
+        return blocks[0]
+    return memoryview(b''.join(blocks))
+
+
+class ByteReader(object):
+    """Sequential reader over Hail's packed binary value encoding."""
+
+    __slots__ = ['_buf', '_off']
+
+    def __init__(self, buf, offset=0):
+        self._buf = buf
+        self._off = offset
+
+    @staticmethod
+    def from_encoding(encoding):
+        return ByteReader(_unframe_blocks(encoding))
+
+    def read_byte(self):
+        b = self._buf[self._off]
+        self._off += 1
+        return b
+
+    def read_bool(self):
+        return self.read_byte() != 0
+
+    def read_int32(self):
+        x = _int32.unpack_from(self._buf, self._off)[0]
+        self._off += 4
+        return x
+
+    def read_int64(self):
+        x = _int64.unpack_from(self._buf, self._off)[0]
+        self._off += 8
+        return x
+
+    def read_float32(self):
+        x = _float32.unpack_from(self._buf, self._off)[0]
+        self._off += 4
+        return x
+
+    def read_float64(self):
+        x = _float64.unpack_from(self._buf, self._off)[0]
+        self._off += 8
+        return x
+
+    def read_bytes(self, n):
+        b = self._buf[self._off:self._off + n]
+        self._off += n
+        return b
+
+    def read_str(self):
+        n = self.read_int32()
+        return str(self.read_bytes(n), 'utf-8')
+
+    def read_missing_bits(self, n):
+        """Read the missing bits for `n` optional values. Returns a list of
+        booleans, ``True`` where the value is missing."""
+        n_bytes = (n + 7) >> 3
+        bits = self.read_bytes(n_bytes)
+        return [(bits[i >> 3] >> (i & 7)) & 1 == 1 for i in range(n)]
+
+    def read_packed(self, fmt, size, n):
+        """Read `n` fixed-width values of struct format character `fmt`."""
+        values = struct.unpack_from(f'<{n}{fmt}', self._buf, self._off)
+        self._off += size * n
+        return values
@@ -0,0 +1,71 @@
+import struct
+
+from .byte_reader import _int32, _int64, _float32, _float64
+
+# the JVM reads at most this many bytes per block, see
+# ``BlockingBufferSpec(32 * 1024, StreamBlockBufferSpec)`` in EncodedResult
+_block_size = 32 * 1024
+
+
+def _frame_blocks(data):
+    """Split `data` into the length-prefixed blocks read by the JVM's
+    ``BlockingBufferSpec(StreamBlockBufferSpec)`` input buffer."""
+    view = memoryview(data)
+    out = bytearray()
+    for off in range(0, len(view), _block_size):
+        block = view[off:off + _block_size]
+        out += _int32.pack(len(block))
+        out += block
+    return bytes(out)
+
+
+class ByteWriter(object):
+    """Sequential writer of Hail's packed binary value encoding. The inverse
+    of :class:`.ByteReader`."""
+
+    __slots__ = ['_buf']
+
+    def __init__(self):
+        self._buf = bytearray()
+
+    def to_encoding(self):
+        return _frame_blocks(self._buf)
+
+    def write_byte(self, b):
+        self._buf.append(b)
+
+    def write_bool(self, b):
+        self._buf.append(1 if b else 0)
+
+    def write_int32(self, x):
+        self._buf += _int32.pack(x)
+
+    def write_int64(self, x):
+        self._buf += _int64.pack(x)
+
+    def write_float32(self, x):
+        self._buf += _float32.pack(x)
+
+    def write_float64(self, x):
+        self._buf += _float64.pack(x)
+
+    def write_bytes(self, b):
+        self._buf += b
+
+    def write_str(self, s):
+        b = s.encode('utf-8')
+        self.write_int32(len(b))
+        self._buf += b
+
+    def write_missing_bits(self, missing):
+        """Write the missing bits for a sequence of booleans, ``True`` where
+        the value is missing."""
+        bits = bytearray((len(missing) + 7) >> 3)
+        for i, m in enumerate(missing):
+            if m:
+                bits[i >> 3] |= 1 << (i & 7)
+        self._buf += bits
+
+    def write_packed(self, fmt, values):
+        """Write fixed-width values of struct format character `fmt`."""
+        self._buf += struct.pack(f'<{len(values)}{fmt}', *values)
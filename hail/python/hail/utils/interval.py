@@ -23,6 +23,8 @@ class Interval(object):
         Interval includes end.
     """
 
+    __slots__ = ['_start', '_end', '_includes_start', '_includes_end', '_point_type', '_jinterval']
+
     @typecheck_method(start=anytype,
                       end=anytype,
                       includes_start=bool,
@@ -41,36 +43,62 @@ class Interval(object):
         self._end = end
         self._includes_start = includes_start
         self._includes_end = includes_end
+        self._jinterval = None
 
-        self._jrep = scala_object(Env.hail().utils, 'Interval').apply(
-            point_type._convert_to_j(start),
-            point_type._convert_to_j(end),
-            includes_start,
-            includes_end)
+    @property
+    def _jrep(self):
+        if self._jinterval is None:
+            self._jinterval = scala_object(Env.hail().utils, 'Interval').apply(
+                self._point_type._convert_to_j(self._start),
+                self._point_type._convert_to_j(self._end),
+                self._includes_start,
+                self._includes_end)
+        return self._jinterval
 
     def __str__(self):
-        return self._jrep.toString()
+        return '{}{}-{}{}'.format('[' if self._includes_start else '(',
+                                  _point_str(self._start),
+                                  _point_str(self._end),
+                                  ']' if self._includes_end else ')')
 
     def __repr__(self):
         return 'Interval(start={}, end={}, includes_start={}, includes_end={})'\
             .format(repr(self.start), repr(self.end), repr(self.includes_start), repr(self._includes_end))
 
     def __eq__(self, other):
-        return isinstance(other, Interval) and self._point_type == other._point_type and self._jrep.equals(other._jrep)
+        return (isinstance(other, Interval)
+                and self._point_type == other._point_type
+                and self._start == other._start
+                and self._end == other._end
+                and self._includes_start == other._includes_start
+                and self._includes_end == other._includes_end)
 
     def __hash__(self):
-        return self._jrep.hashCode()
+        return hash((_hashable(self._point_type, self._start),
+                     _hashable(self._point_type, self._end),
+                     self._includes_start,
+                     self._includes_end))
 
     @classmethod
     def _from_java(cls, jrep, point_type):
         interval = Interval.__new__(cls)
-        interval._jrep = jrep
         interval._point_type = point_type
-        interval._start = None
-        interval._end = None
-        interval._includes_start = None
-        interval._includes_end = None
-        super(Interval, interval).__init__()
+        interval._start = point_type._convert_to_py(jrep.start())
+        interval._end = point_type._convert_to_py(jrep.end())
+        interval._includes_start = jrep.includesStart()
+        interval._includes_end = jrep.includesEnd()
+        interval._jinterval = jrep
+        return interval
+
+    @classmethod
+    def _from_fields(cls, start, end, includes_start, includes_end, point_type):
+        interval = Interval.__new__(cls)
+        interval._point_type = point_type
+        interval._start = start
+        interval._end = end
+        interval._includes_start = includes_start
+        interval._includes_end = includes_end
+        interval._jinterval = None
         return interval
 
     @property
@@ -88,8 +116,6 @@ class Interval(object):
         Object with type :meth:`.point_type`
         """
 
-        if self._start is None:
-            self._start = self.point_type._convert_to_py(self._jrep.start())
         return self._start
 
     @property
@@ -107,8 +133,6 @@ class Interval(object):
         Object with type :meth:`.point_type`
         """
 
-        if self._end is None:
-            self._end = self.point_type._convert_to_py(self._jrep.end())
         return self._end
 
     @property
@@ -126,8 +150,6 @@ class Interval(object):
         :obj:`bool`
         """
 
-        if self._includes_start is None:
-            self._includes_start = self._jrep.includesStart()
         return self._includes_start
 
     @property
@@ -145,8 +167,6 @@ class Interval(object):
         :obj:`bool`
         """
 
-        if self._includes_end is None:
-            self._includes_end = self._jrep.includesEnd()
         return self._includes_end
 
     @property
@@ -192,7 +212,12 @@ class Interval(object):
         value_type = impute_type(value)
         if value_type != self.point_type:
             raise TypeError("'value' is incompatible with the interval point type: '{}', '{}'".format(value_type, self.point_type))
-        return self._jrep.contains(self.point_type._parsable_string(), self.point_type._convert_to_j(value))
+        key = _ordering_key(self.point_type, value)
+        if key is _unordered:
+            return self._jrep.contains(self.point_type._parsable_string(), self.point_type._convert_to_j(value))
+        start, end = self._endpoint_keys()
+        point = (key, 0)
+        return start < point < end
 
     @typecheck_method(interval=interval_type)
     def overlaps(self, interval):
@@ -210,6 +235,80 @@ class Interval(object):
 
         if self.point_type != interval.point_type:
             raise TypeError("'interval' must have the point type '{}', but found '{}'".format(self.point_type, interval.point_type))
-        return self._jrep.overlaps(self.point_type._parsable_string(), interval._jrep)
+        start, end = self._endpoint_keys()
+        other_start, other_end = interval._endpoint_keys()
+        if start is _unordered or other_start is _unordered:
+            return self._jrep.overlaps(self.point_type._parsable_string(), interval._jrep)
+        return start < other_end and end > other_start
+
+    def _endpoint_keys(self):
+        start = _ordering_key(self._point_type, self._start)
+        end = _ordering_key(self._point_type, self._end)
+        if start is _unordered or end is _unordered:
+            return _unordered, _unordered
+        return (start, -1 if self._includes_start else 1), (end, 1 if self._includes_end else -1)
+
+
+_unordered = object()
+
+
+def _ordering_key(t, value):
+    """Map `value` of type `t` to a Python value that sorts the same way the
+    backend orders it, with missing values greater than all others. Returns
+    ``_unordered`` for types without a Python-side ordering."""
+    if value is None:
+        return (1,)
+    if t in (hl.tint32, hl.tint64, hl.tbool, hl.tstr):
+        return (0, value)
+    if t in (hl.tfloat32, hl.tfloat64):
+        if value != value:
+            # NaN is greater than every other non-missing value
+            return (0, 1)
+        return (0, 0, value)
+    if isinstance(t, hl.tlocus):
+        return (0, t.reference_genome._contig_index(value.contig), value.position)
+    if isinstance(t, (hl.tstruct, hl.ttuple)):
+        if isinstance(t, hl.tstruct):
+            fields = [(ft, value[f]) for f, ft in t.items()]
+        else:
+            fields = zip(t.types, value)
+        keys = tuple(_ordering_key(ft, v) for ft, v in fields)
+        if any(k is _unordered for k in keys):
+            return _unordered
+        return (0, keys)
+    if isinstance(t, hl.tarray):
+        keys = [_ordering_key(t.element_type, v) for v in value]
+        if any(k is _unordered for k in keys):
+            return _unordered
+        return (0, keys)
+    return _unordered
+
+
+def _hashable(t, value):
+    """Map `value` of type `t` to a hashable Python value that is equal for
+    equal values of `t`."""
+    if value is None:
+        return None
+    if isinstance(t, (hl.tarray, hl.tset)):
+        items = (_hashable(t.element_type, v) for v in value)
+        return tuple(items) if isinstance(t, hl.tarray) else frozenset(items)
+    if isinstance(t, hl.tdict):
+        return frozenset((_hashable(t.key_type, k), _hashable(t.value_type, v)) for k, v in value.items())
+    if isinstance(t, hl.tstruct):
+        return tuple(_hashable(ft, value[f]) for f, ft in t.items())
+    if isinstance(t, hl.ttuple):
+        return tuple(_hashable(ft, v) for ft, v in zip(t.types, value))
+    if isinstance(t, hl.tinterval):
+        return hash(value)
+    return value
+
+
+def _point_str(value):
+    if value is None:
+        return 'null'
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return str(value)
+
 
 interval_type.set(Interval)
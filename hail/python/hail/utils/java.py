@@ -1,8 +1,12 @@
+import atexit
+import collections
 import json
+import logging
 import socketserver
 import socket
 import sys
 import re
+import threading
 from threading import Thread
 
 import py4j
@@ -257,40 +261,145 @@ def uninstall_exception_handler():
         py4j.protocol.get_return_value = _original
 
 
+# levels of HailContext.logFormat, "%d{yyyy-MM-dd HH:mm:ss} %c{1}: %p: %m%n"
+_jvm_log_levels = {
+    'TRACE': 5,
+    'DEBUG': logging.DEBUG,
+    'INFO': logging.INFO,
+    'WARN': logging.WARNING,
+    'ERROR': logging.ERROR,
+    'FATAL': logging.CRITICAL
+}
+_jvm_log_line = re.compile(r'\d{4}-\d\d-\d\d \d\d:\d\d:\d\d [^:]*: ([A-Z]+): ')
+
+
+class LogForwarder(object):
+    """Forwards lines logged by the JVM to stderr, or to a Python logger,
+    in batches from a thread of its own, so that a slow consumer does not
+    hold up the JVM.
+
+    Lines below `level` are discarded as they arrive. Lines that arrive
+    while `max_queued` lines are already waiting are dropped, and counted in
+    :attr:`dropped`; a warning with the count is forwarded in their place.
+    Waiting lines are forwarded when there are `batch_size` of them, or
+    after `flush_interval` seconds.
+
+    With a `logger`, each line is logged to it at its JVM level, with
+    ``WARN`` as :data:`logging.WARNING` and ``FATAL`` as
+    :data:`logging.CRITICAL`. Lines continuing a multi-line message, such as
+    a stack trace, have the level of the line they continue.
+    """
+
+    def __init__(self, level=logging.INFO, logger=None, max_queued=10000, batch_size=1000, flush_interval=0.1):
+        self.level = level
+        self.logger = logger
+        self.max_queued = max_queued
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.forwarded = 0
+        self.dropped = 0
+        self._reported_dropped = 0
+        self._queue = collections.deque()
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+
+    def start(self):
+        t = Thread(target=self._run, daemon=True)
+        t.start()
+        atexit.register(self.flush)
+
+    def put(self, level, line):
+        if level < self.level:
+            return
+        with self._cond:
+            if len(self._queue) >= self.max_queued:
+                self.dropped += 1
+                return
+            self._queue.append((level, line))
+            if len(self._queue) >= self.batch_size:
+                self._cond.notify()
+
+    def flush(self):
+        with self._write_lock:
+            with self._cond:
+                batch = list(self._queue)
+                self._queue.clear()
+                dropped = self.dropped - self._reported_dropped
+                self._reported_dropped = self.dropped
+            if batch or dropped:
+                self._write(batch, dropped)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if len(self._queue) < self.batch_size:
+                    self._cond.wait(self.flush_interval)
+            self.flush()
+
+    def _write(self, batch, dropped):
+        self.forwarded += len(batch)
+        if dropped:
+            msg = f'dropped {dropped} lines of JVM log output, which arrived faster than they could be forwarded'
+        if self.logger is None:
+            text = ''.join(line for _, line in batch)
+            if dropped:
+                text += f'Hail: WARN: {msg}\n'
+            sys.stderr.write(text)
+            sys.stderr.flush()
+        else:
+            for level, line in batch:
+                self.logger.log(level, line.rstrip('\n'))
+            if dropped:
+                self.logger.warning(msg)
+
+
 class LoggingTCPHandler(socketserver.StreamRequestHandler):
     def handle(self):
+        forwarder = self.server.forwarder
+        level = logging.INFO
         for line in self.rfile:
-            sys.stderr.write(line.decode("ISO-8859-1"))
+            line = line.decode("ISO-8859-1")
+            m = _jvm_log_line.match(line)
+            if m:
+                level = _jvm_log_levels.get(m.group(1), logging.INFO)
+            forwarder.put(level, line)
 
 
 class SimpleServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
     daemon_threads = True
     allow_reuse_address = True
 
-    def __init__(self, server_address, handler_class):
+    def __init__(self, server_address, handler_class, forwarder):
         socketserver.TCPServer.__init__(self, server_address, handler_class)
+        self.forwarder = forwarder
 
 
-def connect_logger(host, port):
+def connect_logger(host, port, level='INFO', logger=None, max_queued=10000):
     """
     This method starts a simple server which listens on a port for a
-    client to connect and start writing messages. Whenever a message
-    is received, it is written to sys.stderr. The server is run in
-    a daemon thread from the caller, which is killed when the caller
-    thread dies.
+    client to connect and start writing messages. Messages received are
+    forwarded to sys.stderr, or to `logger`, in batches by a
+    :class:`.LogForwarder`. The server is run in a daemon thread from
+    the caller, which is killed when the caller thread dies.
 
     If the socket is in use, then the server tries to listen on the
     next port (port + 1). After 25 tries, it gives up.
 
     :param str host: Hostname for server.
     :param int port: Port to listen on.
+    :param str level: Lowest JVM log level to forward, such as ``'WARN'``.
+    :param logger: :class:`logging.Logger` to forward to instead of sys.stderr.
+    :param int max_queued: Number of lines that may wait to be forwarded
+        before further lines are dropped.
+    :return: The :class:`.LogForwarder`, or ``None`` if no port was free.
     """
+    forwarder = LogForwarder(_jvm_log_levels[level], logger, max_queued)
     server = None
     tries = 0
     max_tries = 25
     while not server:
         try:
-            server = SimpleServer((host, port), LoggingTCPHandler)
+            server = SimpleServer((host, port), LoggingTCPHandler, forwarder)
         except socket.error:
             port += 1
             tries += 1
@@ -298,7 +407,7 @@ def connect_logger(host, port):
             if tries >= max_tries:
                 sys.stderr.write(
                     'WARNING: Could not find a free port for logger, maximum retries {} exceeded.'.format(max_tries))
-                return
+                return None
 
     t = Thread(target=server.serve_forever, args=())
 
@@ -306,4 +415,6 @@ def connect_logger(host, port):
     t.daemon = True
 
     t.start()
+    forwarder.start()
     Env.jutils().addSocketAppender(host, port)
+    return forwarder
@@ -0,0 +1,117 @@
+import contextlib
+import json
+import os
+import threading
+
+from .hadoop_utils import hadoop_open
+from .struct import Struct
+
+
+class Profile(object):
+    """Timings of the queries executed inside :func:`.profile`.
+
+    Each execution is recorded as a :class:`~hail.backend.events.Span` per
+    phase, in :attr:`spans`. The phases are:
+
+    - ``execute``: the whole query, enclosing the phases below.
+    - ``optimize``: simplifying the Python IR.
+    - ``render``: rendering the IR to text. Records ``ir_size``, the length
+      of the text.
+    - ``parse``: sending the text to the JVM and parsing it there.
+    - ``jvm``: executing the parsed IR on the JVM, enclosing ``jvm_optimize``,
+      ``jvm_compile``, ``jvm_run`` and ``jvm_encode``.
+    - ``decode``: decoding the result in Python. Records ``result_size``, in
+      bytes.
+
+    Queries whose plan is cached skip ``optimize``, ``render`` and ``parse``.
+    """
+
+    def __init__(self):
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def _record(self, span):
+        with self._lock:
+            self.spans.append(span)
+
+    def summary(self):
+        """Total time spent in each phase.
+
+        Returns
+        -------
+        :obj:`dict` of :obj:`str` to :class:`.Struct`
+            For each phase, a struct with the number of times it ran,
+            `count`, and their total duration in seconds, `seconds`.
+        """
+        totals = {}
+        for s in self.spans:
+            count, seconds = totals.get(s.name, (0, 0.0))
+            totals[s.name] = (count + 1, seconds + s.duration)
+        return {name: Struct(count=count, seconds=seconds) for name, (count, seconds) in totals.items()}
+
+    def to_chrome_trace(self, path=None):
+        """Export the spans in the Chrome trace event format, viewable in
+        ``chrome://tracing`` or Perfetto.
+
+        Parameters
+        ----------
+        path : :obj:`str`, optional
+            If given, also write the trace to this file as JSON.
+
+        Returns
+        -------
+        :obj:`dict`
+        """
+        t0 = min((s.start for s in self.spans), default=0.0)
+        pid = os.getpid()
+        trace = {
+            'traceEvents': [{'name': s.name,
+                             'ph': 'X',
+                             'ts': (s.start - t0) * 1e6,
+                             'dur': s.duration * 1e6,
+                             'pid': pid,
+                             'tid': s.thread,
+                             'args': s.attrs}
+                            for s in self.spans],
+            'displayTimeUnit': 'ms'
+        }
+        if path is not None:
+            with hadoop_open(path, 'w') as f:
+                json.dump(trace, f)
+        return trace
+
+    def __repr__(self):
+        lines = [f'{name}: {s.count} x, {s.seconds:.3f}s' for name, s in self.summary().items()]
+        return 'Profile(\n  ' + '\n  '.join(lines) + ')'
+
+
+@contextlib.contextmanager
+def profile():
+    """Record how long each phase of every query takes.
+
+    Examples
+    --------
+
+    >>> with hl.utils.profile() as p:
+    ...     n = hl.utils.range_table(100).count()
+    >>> trace = p.to_chrome_trace('output/trace.json')
+
+    Notes
+    -----
+    Yields a :class:`.Profile`, which collects the timings until the block
+    exits. Only the time spent executing queries is recorded, not the time
+    spent building expressions in Python. Queries run with ``_async=True``
+    are recorded on the threads that ran them.
+
+    Phases are reported to the hooks registered with
+    :func:`hail.backend.events.add_hook`, which can be used directly to
+    collect timings in other ways.
+    """
+    from hail.backend import events
+
+    p = Profile()
+    events.add_hook(p._record)
+    try:
+        yield p
+    finally:
+        events.remove_hook(p._record)
@@ -32,7 +32,6 @@ setup(
         'seaborn<0.9',
         'bokeh<0.14',
         'pyspark>=2.2,<2.3',
-        'parsimonious<0.9',
         'ipykernel<5',
         'decorator<5',
     ]
@@ -3,6 +3,8 @@ import random
 from scipy.stats import pearsonr
 import unittest
 
+import numpy as np
+
 import hail as hl
 import hail.expr.aggregators as agg
 from hail.expr.types import *
@@ -245,6 +247,19 @@ class Tests(unittest.TestCase):
     def test_bind_placement(self):
         self.assertEqual(hl.eval(5 / hl.bind(lambda x: x, 5)), 1.0)
 
+    def test_eval_many(self):
+        ht = hl.utils.range_table(10).annotate_globals(g=5)
+        mt = hl.utils.range_matrix_table(3, 4)
+        self.assertEqual(
+            hl.eval_many(hl.len('Hail'),
+                         ht.aggregate(hl.agg.sum(ht.idx), _localize=False),
+                         ht.g * 2,
+                         ht.aggregate(hl.agg.count(), _localize=False),
+                         mt.aggregate_rows(hl.agg.count(), _localize=False),
+                         mt.aggregate_rows(hl.agg.collect(mt.row_idx), _localize=False),
+                         mt.aggregate_entries(hl.agg.count(), _localize=False)),
+            [4, 45, 10, 10, 3, [0, 1, 2], 12])
+
     def test_matches(self):
         self.assertEqual(hl.eval('\d+'), '\d+')
         string = hl.literal('12345')
@@ -2372,3 +2387,34 @@ class Tests(unittest.TestCase):
         assert hl.eval(hl.reversed(s)) == 'cba'
         assert hl.eval(hl.reversed(es)) == ''
         assert hl.eval(hl.reversed(ns)) is None
+
+    def test_collect_numpy(self):
+        ht = hl.utils.range_table(10, n_partitions=3)
+        ht = ht.annotate(x=hl.float32(ht.idx) / 2,
+                         y=hl.or_missing(ht.idx != 3, hl.float64(ht.idx)),
+                         z=hl.or_missing(ht.idx != 3, ht.idx))
+
+        a = ht.idx.collect_numpy()
+        self.assertEqual(a.dtype, np.int32)
+        self.assertTrue(np.array_equal(a, np.arange(10)))
+        self.assertEqual(hl.int64(ht.idx).collect_numpy().dtype, np.int64)
+        self.assertTrue(np.array_equal((ht.idx % 2 == 0).collect_numpy(), np.arange(10) % 2 == 0))
+
+        y = ht.y.collect_numpy()
+        self.assertTrue(np.isnan(y[3]))
+        self.assertEqual(list(y[4:]), [4.0, 5.0, 6.0, 7.0, 8.0, 9.0])
+        with self.assertRaises(ValueError):
+            ht.z.collect_numpy()
+        with self.assertRaises(TypeError):
+            hl.str(ht.idx).collect_numpy()
+
+        a = hl.struct(x=ht.x, idx=ht.idx).collect_numpy()
+        self.assertEqual(a.dtype.names, ('x', 'idx'))
+        self.assertEqual(a['x'].dtype, np.float32)
+        self.assertTrue(np.array_equal(a['x'], np.arange(10) / 2))
+        a = hl.tuple([ht.idx, ht.y]).collect_numpy()
+        self.assertEqual(a.dtype.names, ('f0', 'f1'))
+
+        mt = hl.utils.range_matrix_table(3, 4)
+        self.assertTrue(np.array_equal(mt.col_idx.collect_numpy(), np.arange(4)))
+        self.assertEqual(ht.filter(False).idx.collect_numpy().size, 0)
@@ -46,6 +46,15 @@ class Tests(unittest.TestCase):
         for t in self.types_to_test():
             self.assertEqual(t, dtype(str(t)))
 
+    def test_parser_interns(self):
+        for t in self.types_to_test():
+            self.assertIs(dtype(str(t)), dtype(str(t)))
+
+    def test_parser_errors(self):
+        for s in ['int32 x', 'array<', 'struct{a int32}', 'foo', 'tuple(,)', 'struct{a: int32,}', 'dict<str>']:
+            with self.assertRaises(ValueError):
+                dtype(s)
+
     def test_eval_roundtrip(self):
         for t in self.types_to_test():
             self.assertEqual(t, eval(repr(t)))
@@ -61,6 +70,24 @@ class Tests(unittest.TestCase):
                 else:
                     self.assertNotEqual(ts[i], ts2[j])
 
+    def test_immutable(self):
+        t = tstruct(x=tint32, y=tarray(tstr))
+        str(t), hash(t)
+        with self.assertRaises(AttributeError):
+            t._fields = ('x',)
+        with self.assertRaises(AttributeError):
+            tarray(tint32)._element_type = tint64
+        self.assertEqual(str(t), 'struct{x: int32, y: array<str>}')
+
+    def test_wide_struct_equality(self):
+        t1 = tstruct(**{f'f{i}': tarray(tint32) for i in range(1000)})
+        t2 = tstruct(**{f'f{i}': tarray(tint32) for i in range(1000)})
+        t3 = tstruct(**{f'f{i}': tarray(tint32) for i in range(999)}, f999=tint64)
+        self.assertEqual(t1, t2)
+        self.assertEqual(hash(t1), hash(t2))
+        self.assertNotEqual(t1, t3)
+        self.assertEqual(len({t1, t2, t3}), 2)
+
     def test_type_jvm_roundtrip(self):
         ts = self.types_to_test()
         for t in ts:
@@ -82,3 +109,32 @@ class Tests(unittest.TestCase):
             c = coercer_from_dtype(t)
             self.assertTrue(c.can_coerce(t))
             self.assertFalse(c.requires_conversion(t))
+
+    def test_from_encoding(self):
+        import struct
+        from hail.utils import Struct
+
+        def block(payload):
+            return struct.pack('<i', len(payload)) + payload
+
+        t = tstruct(a=tint32, b=tarray(tstr), c=tfloat64)
+        payload = (bytes([0])  # top-level tuple missing bits
+                   + bytes([0b100])  # struct missing bits, c is missing
+                   + struct.pack('<i', 5)
+                   + struct.pack('<i', 2) + bytes([0b10])  # array length and missing bits
+                   + struct.pack('<i', 1) + b'x')
+        expected = Struct(a=5, b=['x', None], c=None)
+        self.assertEqual(t._from_encoding(block(payload)), expected)
+        self.assertEqual(t._from_encoding(block(payload[:7]) + block(payload[7:])), expected)
+        self.assertIsNone(t._from_encoding(block(bytes([1]))))
+
+    def test_eval_encoding_roundtrip(self):
+        values = [(tarray(tfloat64), [1.5, None, -2.0]),
+                  (tset(tint64), {1, 2, 10 ** 12}),
+                  (tdict(tstr, tarray(tint32)), {'a': [1, None], 'b': None}),
+                  (ttuple(tbool, tstr), (True, None)),
+                  (tinterval(tint32), hl.Interval(1, 5, includes_end=True)),
+                  (tcall, hl.Call([0, 1], phased=True)),
+                  (tlocus('GRCh37'), hl.Locus('1', 100))]
+        for t, v in values:
+            self.assertEqual(hl.eval(hl.literal(v, t)), v)
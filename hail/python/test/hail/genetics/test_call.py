@@ -1,6 +1,7 @@
 import unittest
 
 from hail.genetics import *
+from hail.utils.java import FatalError
 from ..helpers import *
 
 setUpModule = startTestHailContext
@@ -94,3 +95,18 @@ class Tests(unittest.TestCase):
                                "Calls with greater than 2 alleles are not supported.",
                                Call,
                                [1, 1, 1, 1])
+
+    def test_str_and_parse(self):
+        for c, s in [(Call([]), '-'),
+                     (Call([], phased=True), '|-'),
+                     (Call([2]), '2'),
+                     (Call([2], phased=True), '|2'),
+                     (Call([1, 0]), '0/1'),
+                     (Call([1, 0], phased=True), '1|0'),
+                     (Call([3, 3]), '3/3')]:
+            self.assertEqual(str(c), s)
+            self.assertEqual(Call._parse(s), c)
+            self.assertEqual(Call._from_java(c._call), c)
+
+        self.assertEqual(Call._from_java(Call([1, 0], phased=True)._call).alleles, [1, 0])
+        self.assertRaises(FatalError, Call, [-1, 0])
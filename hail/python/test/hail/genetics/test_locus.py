@@ -2,6 +2,7 @@ import unittest
 
 import hail as hl
 from hail.genetics import *
+from hail.utils.java import FatalError
 from ..helpers import *
 
 setUpModule = startTestHailContext
@@ -15,3 +16,13 @@ class Tests(unittest.TestCase):
         self.assertEqual(l, Locus('1', 100))
         self.assertEqual(l, Locus(1, 100))
         self.assertEqual(l.reference_genome, hl.default_reference())
+
+    def test_str_and_validation(self):
+        l = Locus('X', 12345)
+        self.assertEqual(str(l), 'X:12345')
+        self.assertEqual(hash(l), hash(Locus.parse('X:12345')))
+        self.assertNotEqual(l, Locus('X', 12345, 'GRCm38'))
+
+        self.assertRaises(FatalError, Locus, 'foo', 1)
+        self.assertRaises(FatalError, Locus, '1', 0)
+        self.assertRaises(FatalError, Locus.parse, '1')
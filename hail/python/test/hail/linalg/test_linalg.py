@@ -141,6 +141,29 @@ class Tests(unittest.TestCase):
                 self._assert_eq(at4, at)
                 self._assert_eq(at5, at)
 
+    def test_to_from_numpy_blocks(self):
+        a = np.arange(7 * 9, dtype=np.int32).reshape((7, 9))
+        bm = BlockMatrix.from_numpy(a, block_size=2)
+        self._assert_eq(bm, a)
+        self._assert_eq(BlockMatrix.from_numpy(np.asfortranarray(a), block_size=4), a)
+
+        with tempfile.NamedTemporaryFile() as f:
+            out = np.memmap(f.name, dtype='float64', mode='w+', shape=(7, 9))
+            self.assertIs(bm.to_numpy(out=out), out)
+            self._assert_eq(np.memmap(f.name, dtype='float64', mode='r', shape=(7, 9)), a)
+
+        sparse = bm.sparsify_rectangles([[0, 2, 0, 2]])
+        expected = np.zeros((7, 9))
+        expected[:2, :2] = a[:2, :2]
+        self._assert_eq(sparse, expected)
+        self._assert_eq(sparse.to_numpy(out=np.ones((7, 9))), expected)
+
+        with self.assertRaises(ValueError):
+            bm.to_numpy(out=np.empty((9, 7)))
+
+        v = np.arange(5.0)
+        self.assertTrue(np.array_equal(BlockMatrix.from_numpy(np.diag(v)).diagonal(), v))
+
     def test_promote(self):
         nx = np.matrix([[2.0]])
         nc = np.matrix([[1.0], [2.0]])
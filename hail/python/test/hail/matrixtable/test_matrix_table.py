@@ -3,6 +3,8 @@ import operator
 import random
 import unittest
 
+import numpy as np
+
 import hail as hl
 import hail.expr.aggregators as agg
 from hail.utils.misc import new_temp_file
@@ -513,6 +515,39 @@ class Tests(unittest.TestCase):
         self.assertEqual(et.count(), 100)
         self.assertTrue(et.all(et.x == et.col_idx + et.row_idx))
 
+    def test_to_numpy(self):
+        mt = hl.utils.range_matrix_table(10, 4, n_partitions=3)
+        mt = mt.annotate_entries(x=hl.or_missing((mt.row_idx + mt.col_idx) % 3 != 0, mt.row_idx * mt.col_idx))
+        expected = np.array([[np.nan if (i + j) % 3 == 0 else i * j for j in range(4)] for i in range(10)])
+        missing = np.isnan(expected)
+
+        a = mt.to_numpy(mt.x)
+        self.assertEqual(a.dtype, np.float64)
+        self.assertTrue(np.array_equal(np.isnan(a), missing))
+        self.assertTrue(np.array_equal(a[~missing], expected[~missing]))
+
+        a = mt.to_numpy(mt.x, dtype='int8', missing='mask')
+        self.assertEqual(a.dtype, np.int8)
+        self.assertTrue(np.array_equal(a.mask, missing))
+        self.assertTrue(np.array_equal(a.data[~missing], expected[~missing]))
+
+        a = mt.to_numpy(mt.x, dtype='float32', missing='mean')
+        means = np.nanmean(expected, axis=1)
+        self.assertTrue(np.allclose(a, np.where(missing, means[:, np.newaxis], expected)))
+
+        blocks = list(mt.iter_numpy_blocks(mt.x, block_size=4))
+        self.assertEqual([b.shape for b in blocks], [(4, 4), (4, 4), (2, 4)])
+
+        gt = hl.import_vcf(resource('sample.vcf'))
+        a = gt.to_numpy(gt.GT, dtype='int8', missing='mask')
+        self.assertEqual(a.shape, gt.count())
+        self.assertEqual(a.sum(), gt.aggregate_entries(agg.sum(gt.GT.n_alt_alleles())))
+
+        empty = mt.filter_rows(False)
+        self.assertEqual(empty.to_numpy(empty.x).shape, (0, 4))
+        with self.assertRaises(ValueError):
+            mt.to_numpy(mt.x, dtype='int32', missing='nan')
+
     def test_filter_cols_required_entries(self):
         mt1 = hl.utils.range_matrix_table(10, 10, n_partitions=4)
         mt1 = mt1.filter_cols(mt1.col_idx < 3)
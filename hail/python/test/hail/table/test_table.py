@@ -1,5 +1,6 @@
 import unittest
 
+import numpy as np
 import pandas as pd
 import pyspark.sql
 
@@ -507,6 +508,49 @@ class Tests(unittest.TestCase):
 
         self.assertTrue(t._same(t2))
 
+    def test_iter_rows(self):
+        ht = hl.utils.range_table(25, n_partitions=4)
+        ht = ht.annotate(x=hl.str(ht.idx))
+        self.assertEqual(list(ht.iter_rows(batch_size=3)), ht.collect())
+
+        batches = list(ht.iter_batches(batch_size=10))
+        self.assertEqual([len(b) for b in batches], [10, 10, 5])
+        self.assertEqual([r for b in batches for r in b], ht.collect())
+
+        self.assertEqual(list(ht.filter(False).iter_rows()), [])
+        with self.assertRaises(ValueError):
+            ht.iter_batches(batch_size=0)
+
+    def test_to_pandas(self):
+        ht = hl.utils.range_table(5)
+        ht = ht.annotate(x=hl.or_missing(ht.idx != 2, ht.idx),
+                         f=hl.float32(ht.idx) / 2,
+                         s=hl.str(ht.idx),
+                         b=ht.idx % 2 == 0,
+                         l=hl.locus('1', ht.idx + 1),
+                         gt=hl.call(0, 1),
+                         nested=hl.struct(y=ht.idx * 2))
+
+        df = ht.to_pandas()
+        self.assertEqual(list(df.columns), ['idx', 'x', 'f', 's', 'b', 'l.contig', 'l.position',
+                                            'gt.alleles', 'gt.phased', 'nested.y'])
+        self.assertEqual(df['idx'].dtype, np.int32)
+        self.assertEqual(df['f'].dtype, np.float32)
+        self.assertEqual(df['b'].dtype, np.bool_)
+        self.assertTrue(np.isnan(df['x'][2]))
+        self.assertEqual(list(df['s']), ['0', '1', '2', '3', '4'])
+        self.assertEqual(list(df['l.position']), [1, 2, 3, 4, 5])
+        self.assertEqual(df['gt.alleles'][0], [0, 1])
+        self.assertEqual(list(df['nested.y']), [0, 2, 4, 6, 8])
+
+        df = ht.to_pandas(flatten=False)
+        self.assertEqual(df['l'][0], hl.Locus('1', 1))
+        self.assertEqual(df['gt'][0], hl.Call([0, 1]))
+        self.assertEqual(df['nested'][4], hl.Struct(y=8))
+
+        ht = ht.select('f', 's', 'b')
+        self.assertTrue(hl.Table.from_pandas(ht.to_pandas(), key='idx')._same(ht))
+
     def test_rename(self):
         kt = hl.utils.range_table(10)
         kt = kt.annotate_globals(foo=5, fi=3)
@@ -837,6 +881,24 @@ class Tests(unittest.TestCase):
         ht = ht.annotate(y = ht.idx + ht.aggregate(hl.agg.max(ht.idx), _localize=False))
         assert ht.y.collect() == [x + 9 for x in range(10)]
 
+    def test_async_actions(self):
+        ht = hl.utils.range_table(10).annotate_globals(g=5)
+        path = new_temp_file(suffix='ht')
+        n, total, _, g = hl.gather(ht.count(_async=True),
+                                   ht.aggregate(hl.agg.sum(ht.idx), _async=True),
+                                   ht.write(path, _async=True),
+                                   ht.g * 2)
+        assert (n, total, g) == (10, 45, 10)
+        assert hl.read_table(path)._same(ht)
+
+    def test_java_table_built_lazily(self):
+        ht = hl.utils.range_table(10, n_partitions=3)
+        ht = ht.annotate(x=ht.idx * 2)
+        ht = ht.filter(ht.x < 5).select('x')
+        assert ht._jtable is None
+        assert ht.n_partitions() == 3
+        assert ht._jtable is not None
+
 def test_large_number_of_fields(tmpdir):
     ht = hl.utils.range_table(100)
     ht = ht.annotate(**{
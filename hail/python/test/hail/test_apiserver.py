@@ -0,0 +1,44 @@
+import importlib.util
+import json
+import os
+import unittest
+
+import hail as hl
+import hail.ir as ir
+from .helpers import *
+
+setUpModule = startTestHailContext
+tearDownModule = stopTestHailContext
+
+
+def _load_apiserver():
+    path = os.path.join(os.path.dirname(__file__), '..', '..', 'hail-apiserver', 'hail-apiserver.py')
+    spec = importlib.util.spec_from_file_location('hail_apiserver', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+try:
+    import flask
+    _has_flask = True
+except ImportError:
+    _has_flask = False
+
+
+@unittest.skipUnless(_has_flask, 'requires flask')
+class APIServerTests(unittest.TestCase):
+    def test_repeated_query_hits_plan_cache(self):
+        server = _load_apiserver()
+        client = server.app.test_client()
+        code = str(ir.ApplyBinaryOp('+', ir.I32(1), ir.I32(2)))
+
+        for _ in range(2):
+            resp = client.post('/execute', data=json.dumps(code), headers={'Accept': 'application/json'})
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual(json.loads(resp.get_data()), {'type': 'int32', 'value': 3})
+        self.assertEqual(len(server.plans), 1)
+
+        # an equal query text from a new request is found in the cache
+        _, _, cached = server._plan(''.join(list(code)))
+        self.assertTrue(cached)
@@ -1,8 +1,12 @@
+import struct
 import unittest
 import hail as hl
 import hail.ir as ir
+from hail.backend.backend import PlanCache, _decode_encoded_result, _encode_result
+from hail.ir.renderer import Renderer
 from hail.utils.java import Env
 from hail.utils import new_temp_file
+from hail.utils.byte_reader import _unframe_blocks
 from .helpers import *
 
 setUpModule = startTestHailContext
@@ -115,6 +119,19 @@ class ValueIRTests(unittest.TestCase):
         for x in self.value_irs():
             self.assertEqual(x, x.copy(*x.children))
 
+    def test_types(self):
+        env = {'c': hl.tbool,
+               'a': hl.tarray(hl.tint32),
+               'aa': hl.tarray(hl.tarray(hl.tint32)),
+               'da': hl.tarray(hl.ttuple(hl.tint32, hl.tstr)),
+               'v': hl.tint32,
+               's': hl.tstruct(x=hl.tint32, y=hl.tint64, z=hl.tfloat64),
+               't': hl.ttuple(hl.tint32, hl.tint64, hl.tfloat64),
+               'call': hl.tcall,
+               'x': hl.tint32}
+        for x in self.value_irs():
+            self.assertEqual(x.compute_type(env), x._backend_type(env), str(x))
+
 
 class TableIRTests(unittest.TestCase):
 
@@ -179,6 +196,10 @@ class TableIRTests(unittest.TestCase):
         for x in self.table_irs():
             Env.hail().expr.ir.IRParser.parse_table_ir(str(x))
 
+    def test_types(self):
+        for x in self.table_irs():
+            self.assertEqual(x.typ, x._backend_type(), str(x))
+
     def test_matrix_ir_parses(self):
         hl.index_bgen(resource('example.8bits.bgen'),
                       reference_genome=hl.get_reference('GRCh37'),
@@ -231,6 +252,7 @@ class TableIRTests(unittest.TestCase):
                 Env.hail().expr.ir.IRParser.parse_matrix_ir(str(x))
             except Exception as e:
                 raise ValueError(str(x)) from e
+            self.assertEqual(x.typ, x._backend_type(), str(x))
 
 
 class ValueTests(unittest.TestCase):
@@ -264,3 +286,197 @@ class ValueTests(unittest.TestCase):
                     None))
             new_globals = hl.eval(hl.Table(map_globals_ir).globals)
             self.assertEquals(new_globals, hl.Struct(foo=v))
+
+
+class RendererTests(unittest.TestCase):
+    def test_shared_subtrees_rendered_once(self):
+        s = ir.Ref('s')
+        x = ir.ApplyBinaryOp('+', ir.GetField(s, 'x'), ir.Cast(ir.GetField(s, 'y'), hl.tint32))
+        for _ in range(30):
+            x = ir.ApplyBinaryOp('+', x, x)
+        code = str(x)
+        self.assertLess(len(code), 10000)
+        env = {'s': hl.tstruct(x=hl.tint32, y=hl.tint64)._parsable_string()}
+        Env.hail().expr.ir.IRParser.parse_value_ir(code, env, {})
+
+    def test_shared_subtrees_not_hoisted_out_of_scope(self):
+        s = ir.Ref('s')
+        x = ir.ApplyBinaryOp('+', ir.GetField(s, 'x'), ir.Cast(ir.GetField(s, 'y'), hl.tint32))
+        # `s` is rebound inside the Let, so the two occurrences differ
+        self.assertNotIn('__cse', str(ir.ApplyBinaryOp('+', x, ir.Let('s', ir.Ref('t'), x))))
+        # the second occurrence is only evaluated if the condition holds
+        self.assertNotIn('__cse', str(ir.If(ir.Ref('c'), x, ir.ApplyUnaryOp('-', x))))
+
+    def test_deep_ir(self):
+        x = ir.I32(0)
+        for i in range(10000):
+            x = ir.ApplyBinaryOp('+', x, ir.I32(i))
+        self.assertEqual(str(x).count('(I32 '), 10001)
+
+    def test_shared_subtrees_same_value(self):
+        x = hl.literal([1, 2, 3])
+        y = (x.map(lambda v: v * 2) + x.map(lambda v: v * 2)).map(lambda v: v + hl.len(x))
+        self.assertEqual(hl.eval(hl.struct(a=y, b=y, c=hl.sum(y))),
+                         hl.Struct(a=[7, 11, 15], b=[7, 11, 15], c=33))
+
+
+class PlanCacheTests(unittest.TestCase):
+    def test_structural_hash(self):
+        def build():
+            x = ir.ApplyBinaryOp('+', ir.I32(1), ir.Ref('x'))
+            return ir.Let('x', ir.I32(5), ir.MakeArray([x, x], hl.tarray(hl.tint32)))
+
+        self.assertIsNot(build(), build())
+        self.assertEqual(build(), build())
+        self.assertEqual(hash(build()), hash(build()))
+        self.assertNotEqual(hash(ir.I32(1)), hash(ir.I64(1)))
+        self.assertNotEqual(ir.ApplySeeded('rand_unif', 1, ir.F64(0.0), ir.F64(1.0)),
+                            ir.ApplySeeded('rand_unif', 2, ir.F64(0.0), ir.F64(1.0)))
+
+    def test_hash_deep_ir(self):
+        x = ir.I32(0)
+        for i in range(10000):
+            x = ir.ApplyBinaryOp('+', x, ir.I32(i))
+        hash(x)
+
+    def test_plan_cache_deep_ir(self):
+        def build():
+            x = ir.I32(0)
+            for i in range(10000):
+                x = ir.ApplyBinaryOp('+', x, ir.I32(i))
+            return x
+
+        cache = PlanCache()
+        cache.put(build(), 'plan')
+        self.assertEqual(cache.get(build()), 'plan')
+        self.assertIsNone(cache.get(ir.ApplyBinaryOp('+', build(), ir.I32(0))))
+
+    def test_plan_cache_non_ir_key(self):
+        cache = PlanCache()
+        cache.put(''.join(['ab', 'cd']), 'plan')
+        self.assertEqual(cache.get(''.join(['a', 'bcd'])), 'plan')
+        self.assertEqual((cache.hits, cache.misses), (1, 0))
+
+    def test_execute_deep_ir_twice(self):
+        def query():
+            x = ir.I32(0)
+            for i in range(2000):
+                x = ir.ApplyBinaryOp('+', x, ir.I32(1))
+            return x
+
+        self.assertEqual(Env.backend().execute(query()), 2000)
+        self.assertEqual(Env.backend().execute(query()), 2000)
+
+    def test_plan_cache_hits(self):
+        cache = Env.backend().plan_cache
+        cache.clear()
+
+        def query():
+            return ir.ApplyBinaryOp('*', ir.I32(6), ir.I32(7))
+
+        self.assertEqual(Env.backend().execute(query()), 42)
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+        self.assertEqual(Env.backend().execute(query()), 42)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+
+class EncodedLiteralTests(unittest.TestCase):
+    def test_large_literals_sent_encoded(self):
+        cache = Env.backend().literal_cache
+        cache.clear()
+
+        ids = {f'{i}:{i * 7}:A:T' for i in range(5000)}
+        x = hl.literal(ids)
+        code = Renderer(stop_at_jir=True, literal_cache=cache)(x._ir)
+        self.assertEqual(code, '(JavaIR m0)')
+        self.assertEqual(len(cache), 1)
+
+        self.assertEqual(hl.eval(x), ids)
+        self.assertTrue(hl.eval(x.contains('7:49:A:T')))
+        self.assertEqual(len(cache), 1)
+
+    def test_literal_hashed_by_encoding(self):
+        def build():
+            return ir.Literal(hl.tset(hl.tint32), set(range(5000)))
+
+        x = build()
+        self.assertEqual(hash(x), hash(build()))
+        self.assertTrue(ir.structurally_equal(x, build()))
+        self.assertFalse(ir.structurally_equal(x, ir.Literal(hl.tset(hl.tint32), set(range(5001)))))
+
+        # the digest computed for the hash keys the literal cache
+        cache = Env.backend().literal_cache
+        cache.clear()
+        self.assertEqual(Renderer(stop_at_jir=True, literal_cache=cache)(x), '(JavaIR m0)')
+        self.assertEqual(Renderer(stop_at_jir=True, literal_cache=cache)(build()), '(JavaIR m0)')
+        self.assertEqual(len(cache), 1)
+
+    def test_encoding_round_trips(self):
+        for t, v in ValueTests().values():
+            self.assertEqual(t._from_encoding(t._to_encoding(v)), v)
+
+
+class EncodedResultTests(unittest.TestCase):
+    def test_decode_chunked_result(self):
+        t = hl.tarray(hl.tstruct(a=hl.tint32, b=hl.tstr))
+        v = [hl.Struct(a=i, b=str(i)) for i in range(1000)]
+        payload = bytes(_unframe_blocks(t._to_encoding(v)))
+        # split the encoding into several blocks, as the JVM does
+        blocks = b''.join(struct.pack('<i', len(payload[i:i + 100])) + payload[i:i + 100]
+                          for i in range(0, len(payload), 100))
+        data = _encode_result(t, blocks)
+        for chunk_size in [1, 7, len(data)]:
+            chunks = [data[i:i + chunk_size] for i in range(0, len(data), chunk_size)]
+            self.assertEqual(_decode_encoded_result(chunks), v)
+
+
+class OptimizerTests(unittest.TestCase):
+    def test_constant_folding(self):
+        self.assertEqual(ir.optimize((hl.int32(3) + 4 * hl.int32(5))._ir), ir.I32(23))
+        self.assertEqual(ir.optimize((hl.int32(2 ** 31 - 1) + 1)._ir), ir.I32(-2 ** 31))
+        self.assertEqual(ir.optimize(hl.cond(hl.int32(1) < 2, 'a', 'b')._ir), ir.Str('a'))
+        self.assertEqual(ir.optimize(ir.filter_predicate_with_keep(ir.TrueIR(), False)), ir.FalseIR())
+        self.assertEqual(ir.optimize(ir.Cast(ir.I32(1), hl.tint32)), ir.I32(1))
+
+    def test_struct_fusion(self):
+        s = hl.struct(a=1, b='x').annotate(c=2.0).annotate(d=True, a=5)
+        x = ir.optimize(s._ir)
+        self.assertIsInstance(x, ir.MakeStruct)
+        self.assertEqual(x.typ, s.dtype)
+        self.assertEqual(ir.optimize(s.select('a', 'd')._ir),
+                         ir.MakeStruct([('a', ir.I32(5)), ('d', ir.TrueIR())]))
+        self.assertEqual(ir.optimize(s.a._ir), ir.I32(5))
+
+    def test_keeps_aggregations_and_bindings_in_use(self):
+        count = ir.ApplyAggOp('Count', [], None, [])
+        x = ir.GetField(ir.MakeStruct([('a', ir.I32(1)), ('n', count)]), 'a')
+        self.assertEqual(ir.optimize(x), x)
+        # the inner binding shadows the outer one, which is conservatively kept
+        x = ir.Let('x', ir.I32(1), ir.ArrayMap(ir.Ref('a'), 'x', ir.Ref('x')))
+        self.assertEqual(ir.optimize(x), x)
+        x = ir.Let('x', ir.Ref('y'), ir.I32(1))
+        self.assertEqual(ir.optimize(x), ir.I32(1))
+        x = ir.Let('x', ir.I32(1), ir.ArrayMap(ir.Ref('a'), 'y', ir.Ref('x')))
+        self.assertEqual(ir.optimize(x), ir.ArrayMap(ir.Ref('a'), 'y', ir.I32(1)))
+
+    def test_keeps_side_effects_of_fused_structs(self):
+        die = ir.Die(ir.Str('boom'), hl.tstruct(a=hl.tint32))
+        x = ir.GetField(ir.InsertFields(die, [('b', ir.I32(1))], None), 'b')
+        self.assertEqual(ir.optimize(x), x)
+        x = ir.GetField(ir.InsertFields(ir.Ref('s'), [('b', die)], None), 'a')
+        self.assertEqual(ir.optimize(x), x)
+
+    def test_long_let_chain(self):
+        n = 5000
+        x = ir.Ref('x{}'.format(n - 1))
+        for i in reversed(range(n)):
+            value = ir.I32(1) if i == 0 else ir.ApplyBinaryOp('+', ir.Ref('x{}'.format(i - 1)), ir.I32(1))
+            x = ir.Let('x{}'.format(i), value, x)
+        self.assertEqual(ir.optimize(x), ir.I32(n))
+
+    def test_optimized_table_same_result(self):
+        ht = hl.utils.range_table(10)
+        ht = ht.annotate(x=ht.idx * 2).annotate(y=hl.int32(3) + 4)
+        ht = ht.filter(hl.literal(True) & (ht.x > 4))
+        self.assertEqual(ht.aggregate(hl.agg.collect(ht.y)), [7] * 7)
+        self.assertLess(len(str(ir.optimize(ht._tir))), len(str(ht._tir)))
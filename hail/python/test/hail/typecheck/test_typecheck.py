@@ -1,3 +1,4 @@
+import collections
 import unittest
 
 from hail.typecheck.check import *
@@ -223,6 +224,15 @@ class Tests(unittest.TestCase):
 
         self.assertRaises(TypeError, lambda: foo.bar(2))
 
+    def test_lazy_type(self):
+        @typecheck(x=nullable(lazy_type('collections.OrderedDict')))
+        def f(x):
+            pass
+
+        f(None)
+        f(collections.OrderedDict())
+        self.assertRaises(TypeError, lambda: f({}))
+
     def test_coercion(self):
         @typecheck(a=transformed((int, lambda x: 'int'),
                                  (str, lambda x: 'str')),
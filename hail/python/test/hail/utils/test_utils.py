@@ -160,6 +160,21 @@ class Tests(unittest.TestCase):
         self.assertFalse(interval1.contains(22))
         self.assertTrue(interval1.overlaps(interval2))
 
+        self.assertEqual(str(interval1), '[3-22)')
+        self.assertEqual(interval2, Interval(10, 20))
+        self.assertEqual(hash(interval2), hash(Interval(10, 20)))
+        self.assertEqual(hash(Interval([1, 2], [3, 4])), hash(Interval([1, 2], [3, 4])))
+        self.assertEqual(hash(Interval({1}, {2})), hash(Interval({1}, {2})))
+        self.assertEqual(hash(Interval(hl.Struct(a=[1]), hl.Struct(a=[2]))),
+                         hash(Interval(hl.Struct(a=[1]), hl.Struct(a=[2]))))
+        self.assertFalse(Interval(3, 10).overlaps(Interval(10, 20)))
+        self.assertTrue(Interval(3, 10, includes_end=True).overlaps(Interval(10, 20)))
+
+        locus_interval = Interval(hl.Locus('1', 100), hl.Locus('2', 1))
+        self.assertTrue(locus_interval.contains(hl.Locus('1', 10000)))
+        self.assertFalse(locus_interval.contains(hl.Locus('2', 100)))
+        self.assertFalse(locus_interval.contains(hl.Locus('1', 99)))
+
     def test_range_matrix_table_n_lt_partitions(self):
         hl.utils.range_matrix_table(1, 1)._force_count_rows()
 
@@ -171,3 +186,68 @@ class Tests(unittest.TestCase):
 
         self.assertEqual(len(set(a)), 10)
         self.assertEqual(a, b)
+
+    def test_profile(self):
+        Env.backend().plan_cache.clear()
+        ht = hl.utils.range_table(10)
+        with hl.utils.profile() as p:
+            ht.annotate(x=hl.str(ht.idx)).count()
+        names = {s.name for s in p.spans}
+        for phase in ['execute', 'render', 'parse', 'jvm', 'jvm_run', 'decode']:
+            self.assertIn(phase, names)
+        render = next(s for s in p.spans if s.name == 'render')
+        self.assertGreater(render.attrs['ir_size'], 0)
+        self.assertEqual(p.summary()['execute'].count, 1)
+
+        trace = p.to_chrome_trace(new_temp_file(suffix='json'))
+        self.assertEqual(len(trace['traceEvents']), len(p.spans))
+
+        n_spans = len(p.spans)
+        hl.utils.range_table(10).count()
+        self.assertEqual(len(p.spans), n_spans)
+
+    def test_log_forwarder(self):
+        import logging
+        from hail.utils.java import LogForwarder
+
+        records = []
+
+        class Handler(logging.Handler):
+            def emit(self, record):
+                records.append((record.levelno, record.getMessage()))
+
+        logger = logging.getLogger('hail.test_log_forwarder')
+        logger.propagate = False
+        logger.addHandler(Handler())
+
+        f = LogForwarder(logging.WARNING, logger, max_queued=2)
+        f.put(logging.INFO, 'info\n')
+        f.put(logging.WARNING, 'warn\n')
+        f.put(logging.ERROR, 'error\n')
+        f.put(logging.ERROR, 'dropped\n')
+        f.flush()
+        self.assertEqual(records[:2], [(logging.WARNING, 'warn'), (logging.ERROR, 'error')])
+        self.assertEqual(records[2][0], logging.WARNING)
+        self.assertEqual((f.forwarded, f.dropped), (2, 1))
+
+        f.flush()
+        self.assertEqual(len(records), 3)
+
+    def test_last_action_metrics(self):
+        from hail.utils import action_metrics
+
+        self.assertRaises(FatalError, hl.utils.last_action_metrics)
+        action_metrics._start(Env.hc())
+        try:
+            ht = hl.utils.range_table(100, n_partitions=4)
+            ht.write(new_temp_file(suffix='ht'))
+            m = hl.utils.last_action_metrics()
+            self.assertEqual(m.call_site, 'hail.table.Table.write')
+            self.assertGreaterEqual(m.n_jobs, 1)
+            self.assertGreaterEqual(m.n_tasks, 4)
+            self.assertEqual(m.n_tasks, sum(s.n_tasks for s in m.stages))
+
+            hl.utils.range_table(100).count()
+            self.assertEqual(hl.utils.last_action_metrics().call_site, 'hail.table.Table.count')
+        finally:
+            action_metrics._stop()
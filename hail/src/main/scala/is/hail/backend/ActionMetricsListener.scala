@@ -0,0 +1,105 @@
+package is.hail.backend
+
+import org.apache.spark.SparkContext
+import org.apache.spark.scheduler._
+import org.json4s.DefaultFormats
+import org.json4s.jackson.Serialization
+
+import scala.collection.mutable
+
+case class StageMetrics(
+  stageId: Int,
+  name: String,
+  var numTasks: Int = 0,
+  var failedTasks: Int = 0,
+  var executorRunTime: Long = 0,
+  var executorCpuTime: Long = 0,
+  var jvmGCTime: Long = 0,
+  var inputBytes: Long = 0,
+  var inputRecords: Long = 0,
+  var outputBytes: Long = 0,
+  var shuffleReadBytes: Long = 0,
+  var shuffleReadRecords: Long = 0,
+  var shuffleWriteBytes: Long = 0,
+  var shuffleWriteRecords: Long = 0,
+  var memoryBytesSpilled: Long = 0,
+  var diskBytesSpilled: Long = 0)
+
+case class JobMetrics(
+  jobId: Int,
+  submissionTime: Long,
+  var completionTime: Option[Long] = None,
+  var succeeded: Option[Boolean] = None,
+  stages: mutable.ArrayBuffer[StageMetrics] = mutable.ArrayBuffer.empty)
+
+// Collects the task metrics of each Spark job, by stage, so Python can
+// attribute them to the Hail action that submitted the job. Only the last
+// `maxJobs` jobs are kept. Events arrive on the listener bus thread; the
+// metrics are read from Python on another.
+class ActionMetricsListener(maxJobs: Int) extends SparkListener {
+  private val jobs = mutable.Queue.empty[JobMetrics]
+  private val stages = mutable.Map.empty[Int, StageMetrics]
+
+  override def onJobStart(jobStart: SparkListenerJobStart): Unit = synchronized {
+    val job = JobMetrics(jobStart.jobId, jobStart.time)
+    jobStart.stageInfos.foreach { info =>
+      // a stage computed by an earlier job is skipped, and its tasks stay
+      // with that job
+      if (!stages.contains(info.stageId)) {
+        val s = StageMetrics(info.stageId, info.name)
+        stages(info.stageId) = s
+        job.stages += s
+      }
+    }
+    jobs.enqueue(job)
+    while (jobs.length > maxJobs)
+      jobs.dequeue().stages.foreach(s => stages.remove(s.stageId))
+  }
+
+  override def onJobEnd(jobEnd: SparkListenerJobEnd): Unit = synchronized {
+    jobs.find(_.jobId == jobEnd.jobId).foreach { job =>
+      job.completionTime = Some(jobEnd.time)
+      job.succeeded = Some(jobEnd.jobResult == JobSucceeded)
+    }
+  }
+
+  override def onTaskEnd(taskEnd: SparkListenerTaskEnd): Unit = synchronized {
+    stages.get(taskEnd.stageId).foreach { s =>
+      s.numTasks += 1
+      if (!taskEnd.taskInfo.successful)
+        s.failedTasks += 1
+      val m = taskEnd.taskMetrics
+      if (m != null) {
+        s.executorRunTime += m.executorRunTime
+        s.executorCpuTime += m.executorCpuTime
+        s.jvmGCTime += m.jvmGCTime
+        s.inputBytes += m.inputMetrics.bytesRead
+        s.inputRecords += m.inputMetrics.recordsRead
+        s.outputBytes += m.outputMetrics.bytesWritten
+        s.shuffleReadBytes += m.shuffleReadMetrics.totalBytesRead
+        s.shuffleReadRecords += m.shuffleReadMetrics.recordsRead
+        s.shuffleWriteBytes += m.shuffleWriteMetrics.bytesWritten
+        s.shuffleWriteRecords += m.shuffleWriteMetrics.recordsWritten
+        s.memoryBytesSpilled += m.memoryBytesSpilled
+        s.diskBytesSpilled += m.diskBytesSpilled
+      }
+    }
+  }
+
+  // The jobs submitted at or after `since`, in milliseconds since the epoch,
+  // as a JSON array of JobMetrics.
+  def jobsJSON(since: Long): String = synchronized {
+    Serialization.write(jobs.filter(_.submissionTime >= since).toArray)(DefaultFormats)
+  }
+}
+
+object ActionMetricsListener {
+  def register(sc: SparkContext, maxJobs: Int): ActionMetricsListener = {
+    val listener = new ActionMetricsListener(maxJobs)
+    sc.addSparkListener(listener)
+    listener
+  }
+
+  def unregister(sc: SparkContext, listener: ActionMetricsListener): Unit =
+    sc.removeSparkListener(listener)
+}
@@ -0,0 +1,22 @@
+package is.hail.backend
+
+// Hands a byte array to Python in chunks of at most `chunkSize` bytes, so
+// py4j copies one chunk at a time rather than the whole array.
+class ByteChunkIterator(bytes: Array[Byte], chunkSize: Int) extends Iterator[Array[Byte]] {
+  require(chunkSize > 0)
+
+  private var off = 0
+
+  def nBytes: Int = bytes.length
+
+  def hasNext: Boolean = off < bytes.length
+
+  def next(): Array[Byte] = {
+    if (!hasNext)
+      throw new NoSuchElementException("next on empty iterator")
+    val end = math.min(off.toLong + chunkSize, bytes.length.toLong).toInt
+    val chunk = java.util.Arrays.copyOfRange(bytes, off, end)
+    off = end
+    chunk
+  }
+}
@@ -0,0 +1,27 @@
+package is.hail.backend
+
+import java.io.ByteArrayInputStream
+
+import is.hail.annotations.{Region, SafeRow}
+import is.hail.expr.ir.{IRParser, Literal}
+import is.hail.expr.types.physical.PTuple
+import is.hail.io.PackDecoder
+import is.hail.utils._
+
+// Large Python literals are sent in the same binary encoding as results,
+// rather than as JSON text in the IR, and passed to the parser as a
+// pre-built Literal node.
+object EncodedLiteral {
+  def apply(typ: String, bytes: Array[Byte]): Literal = {
+    val t = IRParser.parseType(typ)
+    val wrappedType = PTuple(FastIndexedSeq(t.deepOptional().physicalType), required = true)
+
+    val value = Region.scoped { region =>
+      val dec = new PackDecoder(wrappedType, EncodedResult.bufferSpec.buildInputBuffer(new ByteArrayInputStream(bytes)))
+      val offset = dec.readRegionValue(region)
+      dec.close()
+      SafeRow(wrappedType, region, offset).get(0)
+    }
+    Literal(t, value)
+  }
+}
@@ -0,0 +1,42 @@
+package is.hail.backend
+
+import java.io.ByteArrayOutputStream
+
+import is.hail.annotations.{Region, RegionValueBuilder}
+import is.hail.expr.types.physical.PTuple
+import is.hail.expr.types.virtual.{TVoid, Type}
+import is.hail.io.{BlockingBufferSpec, BufferSpec, PackEncoder, StreamBlockBufferSpec}
+import is.hail.utils._
+
+// Results are shipped to Python wrapped in a one-field tuple so that a
+// missing top-level value is encoded as a missing bit. All nested types are
+// made optional, except for the fixed representations of locus and interval,
+// so the Python decoder only needs the virtual type to read the bytes back.
+// Void results have no value and are sent as an empty array.
+object EncodedResult {
+  val bufferSpec: BufferSpec = new BlockingBufferSpec(32 * 1024, new StreamBlockBufferSpec)
+
+  def apply(value: Any, t: Type): Array[Byte] = t match {
+    case TVoid => Array.empty[Byte]
+    case _ => encode(value, t)
+  }
+
+  private def encode(value: Any, t: Type): Array[Byte] = {
+    val wrappedType = PTuple(FastIndexedSeq(t.deepOptional().physicalType), required = true)
+
+    Region.scoped { region =>
+      val rvb = new RegionValueBuilder(region)
+      rvb.start(wrappedType)
+      rvb.startTuple()
+      rvb.addAnnotation(wrappedType.types(0).virtualType, value)
+      rvb.endTuple()
+      val offset = rvb.end()
+
+      val baos = new ByteArrayOutputStream()
+      val enc = new PackEncoder(wrappedType, bufferSpec.buildOutputBuffer(baos))
+      enc.writeRegionValue(region, offset)
+      enc.close()
+      baos.toByteArray
+    }
+  }
+}
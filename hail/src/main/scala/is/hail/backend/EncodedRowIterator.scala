@@ -0,0 +1,38 @@
+package is.hail.backend
+
+import is.hail.annotations.{Region, RegionValue, SafeRow}
+import is.hail.expr.ir.{Interpret, TableIR}
+import is.hail.expr.types.virtual.TArray
+import is.hail.rvd.RVD
+import is.hail.utils._
+
+// Streams the rows of a table to Python in batches of at most `batchSize`
+// rows, each an array of rows encoded as by EncodedResult. Partitions are
+// computed one at a time, as the caller asks for more rows (see
+// RDD.toLocalIterator), so the driver holds at most one partition.
+class EncodedRowIterator(tir: TableIR, batchSize: Int) extends Iterator[Array[Byte]] {
+  require(batchSize > 0)
+
+  private val tv = Interpret(tir)
+  private val rowPType = tv.rvd.rowPType
+  private val batchType = TArray(tv.typ.rowType)
+  private val codec = RVD.wireCodec
+  private val makeDec = codec.buildDecoder(rowPType, rowPType)
+
+  private val batches = tv.rvd.encodedRDD(codec).toLocalIterator.grouped(batchSize)
+
+  def hasNext: Boolean = batches.hasNext
+
+  def next(): Array[Byte] = {
+    // grouped yields Lists, which RegionValueBuilder does not take as arrays
+    val rows = Region.scoped { region =>
+      val rv = RegionValue(region)
+      batches.next().map { bytes =>
+        val row = SafeRow(rowPType, RegionValue.fromBytes(makeDec, region, rv)(bytes))
+        region.clear()
+        row
+      }.toFastIndexedSeq
+    }
+    EncodedResult(rows, batchType)
+  }
+}
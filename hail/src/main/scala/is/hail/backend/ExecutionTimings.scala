@@ -0,0 +1,38 @@
+package is.hail.backend
+
+import is.hail.utils._
+
+case class TimedResult(value: Array[Byte], timings: String)
+
+// Records how long the phases of a query take on the JVM, for profiling from
+// Python. Phases are only timed on a thread inside `record`, so the timers
+// cost nothing otherwise, and concurrent queries do not mix their timings.
+object ExecutionTimings {
+  private val current = new ThreadLocal[ArrayBuilder[(String, Long, Long)]]
+
+  def time[T](phase: String)(f: => T): T = {
+    val timings = current.get()
+    if (timings == null)
+      f
+    else {
+      val start = System.nanoTime()
+      try f finally timings += ((phase, start, System.nanoTime() - start))
+    }
+  }
+
+  // Returns the result of `f` with the phases timed while computing it, as a
+  // JSON array of {"name", "start", "duration"} objects, in nanoseconds
+  // relative to the start of `f`.
+  def record(f: => Array[Byte]): TimedResult = {
+    val timings = new ArrayBuilder[(String, Long, Long)]()
+    current.set(timings)
+    val start = System.nanoTime()
+    try {
+      val value = f
+      TimedResult(value, timings.result().map { case (name, s, d) =>
+        s"""{"name":"$name","start":${ s - start },"duration":$d}"""
+      }.mkString("[", ",", "]"))
+    } finally
+      current.remove()
+  }
+}
@@ -0,0 +1,76 @@
+package is.hail.backend
+
+import java.util.UUID
+
+import is.hail.HailContext
+import is.hail.utils._
+import py4j.GatewayServer
+
+import scala.collection.mutable
+
+// The state of one Python process attached to a shared gateway. Temporary
+// files go in a directory of their own, removed when the session closes.
+class HailSession(val id: String, val tmpDir: String) {
+  def getTemporaryFile(nChar: Int = 10, prefix: Option[String] = None, suffix: Option[String] = None): String =
+    HailContext.get.hadoopConf.getTemporaryFile(tmpDir, nChar, prefix, suffix)
+}
+
+// A long-lived JVM with a running HailContext, which Python processes attach
+// to with hl.init(gateway_port=...) instead of starting their own. py4j
+// connections are not authenticated, so the gateway only accepts connections
+// from the local host.
+object HailGateway {
+  val defaultPort = 25333
+
+  private val sessions = mutable.Map.empty[String, HailSession]
+
+  def openSession(): HailSession = synchronized {
+    val hc = HailContext.get
+    val session = new HailSession(UUID.randomUUID().toString, TempDir.createTempDir(hc.tmpDir, hc.hadoopConf))
+    sessions(session.id) = session
+    info(s"opened session ${ session.id } with temporary directory ${ session.tmpDir }")
+    session
+  }
+
+  def closeSession(id: String): Unit = synchronized {
+    sessions.remove(id).foreach { session =>
+      HailContext.get.hadoopConf.delete(session.tmpDir, recursive = true)
+      info(s"closed session $id")
+    }
+  }
+
+  private def usage(): Nothing =
+    fatal("usage: HailGateway [--port PORT] [--app-name NAME] [--master MASTER] [--log LOG] " +
+      "[--min-block-size MB] [--branching-factor N] [--tmp-dir DIR]")
+
+  def main(args: Array[String]) {
+    if (args.length % 2 != 0)
+      usage()
+    val options = args.grouped(2).map {
+      case Array(k, v) if k.startsWith("--") => k.drop(2) -> v
+      case _ => usage()
+    }.toMap
+    options.keys.filterNot(Set("port", "app-name", "master", "log", "min-block-size", "branching-factor", "tmp-dir"))
+      .foreach(_ => usage())
+
+    val port = options.get("port").map(_.toInt).getOrElse(defaultPort)
+    val hc = HailContext(
+      appName = options.getOrElse("app-name", "Hail gateway"),
+      master = options.get("master"),
+      logFile = options.getOrElse("log", "hail-gateway.log"),
+      quiet = true,
+      minBlockSize = options.get("min-block-size").map(_.toLong).getOrElse(1L),
+      branchingFactor = options.get("branching-factor").map(_.toInt).getOrElse(50),
+      tmpDir = options.getOrElse("tmp-dir", "/tmp"))
+
+    val server = new GatewayServer(null, port)
+    sys.addShutdownHook {
+      server.shutdown()
+      synchronized { sessions.keys.toArray }.foreach(closeSession)
+      hc.sc.stop()
+    }
+    server.start()
+    info(s"Hail gateway listening on port $port")
+    System.err.println(s"Hail gateway listening on port $port")
+  }
+}
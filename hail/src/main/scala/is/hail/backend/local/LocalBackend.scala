@@ -1,9 +1,16 @@
 package is.hail.backend.local
 
+import is.hail.backend.EncodedResult
 import is.hail.expr.JSONAnnotationImpex
 import is.hail.expr.ir._
+import is.hail.utils._
 import org.json4s.jackson.JsonMethods
 
+// Executes value IR in a single JVM by lowering table operations to
+// operations on arrays, so supported pipelines run without Spark jobs. This
+// is an incremental step: IR containing table operations that LowerTableIR
+// does not handle, including native reads and writes, is interpreted with
+// Spark instead, and the JVM still requires a SparkContext.
 object LocalBackend {
   def executeJSON(ir: IR): String = {
     val t = ir.typ
@@ -12,10 +19,16 @@ object LocalBackend {
       JSONAnnotationImpex.exportAnnotation(value, t))
   }
 
+  def executeEncoded(ir: IR): Array[Byte] = {
+    val t = ir.typ
+    val value = execute(ir)
+    EncodedResult(value, t)
+  }
+
   def execute(ir0: IR): Any = {
     var ir = ir0
 
-    println("LocalBackend.execute got", Pretty(ir))
+    log.info(s"LocalBackend.execute got: ${ Pretty(ir) }")
 
     ir = ir.unwrap
     ir = Optimize(ir, noisy = true, canGenerateLiterals = true)
@@ -23,15 +36,23 @@ object LocalBackend {
     ir = LowerMatrixIR(ir)
     ir = Optimize(ir, noisy = true, canGenerateLiterals = false)
 
-    println("LocalBackend.execute to lower", Pretty(ir))
+    log.info(s"LocalBackend.execute to lower: ${ Pretty(ir) }")
 
-    ir = LowerTableIR.lower(ir)
+    val lowered = try {
+      LowerTableIR.lower(ir)
+    } catch {
+      case e: UnsupportedOperationException =>
+        // Tables that cannot be lowered yet, such as those read from disk,
+        // run on Spark as with the Spark backend.
+        log.info(s"LocalBackend.execute: ${ e.getMessage }; interpreting with Spark")
+        return Interpret[Any](ir)
+    }
 
-    println("LocalBackend.execute lowered", Pretty(ir))
+    log.info(s"LocalBackend.execute lowered: ${ Pretty(lowered) }")
 
-    ir = Optimize(ir, noisy = true, canGenerateLiterals = false)
+    ir = Optimize(lowered, noisy = true, canGenerateLiterals = false)
 
-    println("LocalBackend.execute", Pretty(ir))
+    log.info(s"LocalBackend.execute: ${ Pretty(ir) }")
 
     Interpret[Any](ir)
   }
@@ -6,10 +6,12 @@ import is.hail.backend.Binding
 import is.hail.expr.JSONAnnotationImpex
 import is.hail.expr.types.virtual._
 import is.hail.rvd.AbstractRVDSpec
+import is.hail.table.Ascending
 import is.hail.utils._
 import is.hail.variant.RVDComponentSpec
 import org.json4s.jackson.JsonMethods
 
+// Rows are kept sorted by `key`, so joins can merge the two sides.
 case class LocalTableIR(
   globals: List[Binding],
   key: IndexedSeq[String],
@@ -50,6 +52,12 @@ object LowerTableIR {
           "global" -> Ref(g, gv.typ))))
     case TableCount(child) =>
       ArrayLen(lower(child).closedRows())
+    case TableAggregate(child, query) =>
+      val p = lower(child)
+      val Binding(g, gv) = p.globals.head
+      p.close(
+        Let("global", Ref(g, gv.typ),
+          ArrayAgg(p.rows, "row", query)))
 
     case _ =>
       ir.copy(ir.children.map(lower))
@@ -116,6 +124,39 @@ object LowerTableIR {
 
     case TableRepartition(child, n, strategy) =>
       lower(child)
+
+    case TableKeyBy(child, keys, isSorted) =>
+      val p = lower(child)
+      if (isSorted || keys.isEmpty || p.key.startsWith(keys))
+        p.copy(key = keys)
+      else
+        p.copy(key = keys, rows = sortBy(p.rows, keys, ascending = true))
+
+    case TableOrderBy(child, sortFields) if sortFields.forall(_.sortOrder == sortFields.head.sortOrder) =>
+      val p = lower(child)
+      p.copy(
+        key = FastIndexedSeq(),
+        rows = sortBy(p.rows, sortFields.map(_.field), ascending = sortFields.head.sortOrder == Ascending))
+
+    case x@TableExplode(child, path) =>
+      val p = lower(child)
+      p.copy(
+        rows = ArrayFlatMap(p.rows, "row",
+          ArrayMap(ArrayRange(I32(0), x.length, I32(1)), x.idx.name, x.newRow)))
+
+    case TableLeftJoinRightDistinct(left, right, root) =>
+      val lp = lower(left)
+      val rp = lower(right)
+      val l = genUID()
+      val r = genUID()
+      val lRef = Ref(l, left.typ.rowType)
+      val rRef = Ref(r, right.typ.rowType)
+      val rKey = right.typ.key
+      val lKey = MakeStruct(rKey.zip(left.typ.key).map { case (rk, lk) => rk -> GetField(lRef, lk) })
+      lp.copy(
+        rows = ArrayLeftJoinDistinct(lp.rows, rp.closedRows(), l, r,
+          ApplyComparisonOp(Compare(right.typ.keyType), lKey, SelectFields(rRef, rKey)),
+          InsertFields(lRef, Seq(root -> SelectFields(rRef, right.typ.valueType.fieldNames)))))
     case TableHead(child, n) =>
       val rows = genUID()
       val i = genUID()
@@ -130,6 +171,21 @@ object LowerTableIR {
               ArrayRange(I32(0), I32(n.toInt), I32(1)),
               i,
               ArrayRef(Ref(rows, p.rows.typ), Ref(i, TInt32()))))))
+    case _ =>
+      throw new UnsupportedOperationException(s"local backend cannot execute ${ Pretty(tir) }")
+  }
+
+  // stable sort of `rows` by the fields `fields`
+  private def sortBy(rows: IR, fields: IndexedSeq[String], ascending: Boolean): IR = {
+    val row = genUID()
+    val kv = genUID()
+    val rowType = coerce[TArray](rows.typ).elementType.asInstanceOf[TStruct]
+    val keyed = ArrayMap(rows, row,
+      MakeStruct(Seq(
+        "key" -> SelectFields(Ref(row, rowType), fields),
+        "value" -> Ref(row, rowType))))
+    val sorted = ArraySort(keyed, if (ascending) True() else False(), onKey = true)
+    ArrayMap(sorted, kv, GetField(Ref(kv, coerce[TArray](sorted.typ).elementType), "value"))
   }
 
   def lower(mir: MatrixIR): MatrixIR = ???
@@ -3,6 +3,7 @@ package is.hail.expr.ir
 import is.hail.annotations._
 import is.hail.annotations.aggregators.RegionValueAggregator
 import is.hail.asm4s._
+import is.hail.backend.ExecutionTimings
 import is.hail.expr.types.physical.PType
 import is.hail.expr.types.virtual.Type
 import is.hail.utils._
@@ -37,7 +38,7 @@ object Compile {
     argTypeInfo: Array[MaybeGenericTypeInfo[_]],
     body: IR,
     nSpecialArgs: Int
-  ): (PType, Int => F) = {
+  ): (PType, Int => F) = ExecutionTimings.time("compile") {
     val fb = new EmitFunctionBuilder[F](argTypeInfo, GenericTypeInfo[R]())
 
     var ir = body
@@ -4,6 +4,7 @@ import is.hail.{HailContext, Uploader, stats}
 import is.hail.annotations.aggregators.RegionValueAggregator
 import is.hail.annotations._
 import is.hail.asm4s.AsmFunction3
+import is.hail.backend.{ByteChunkIterator, EncodedResult, ExecutionTimings, TimedResult}
 import is.hail.expr.{JSONAnnotationImpex, TypedAggregator}
 import is.hail.expr.types._
 import is.hail.expr.types.physical.PTuple
@@ -24,6 +25,38 @@ object Interpret {
       JSONAnnotationImpex.exportAnnotation(value, t))
   }
 
+  def interpretEncoded(ir: IR): Array[Byte] = {
+    val t = ir.typ
+    val value = Interpret[Any](ir)
+    ExecutionTimings.time("encode") {
+      EncodedResult(value, t)
+    }
+  }
+
+  def interpretEncodedTimed(ir: IR): TimedResult =
+    ExecutionTimings.record(interpretEncoded(ir))
+
+  // The Spark jobs launched by these run in `jobGroup`, which another thread
+  // can cancel with cancelJobGroup. The group is a property of the calling
+  // JVM thread, so concurrent callers do not see each other's groups.
+  def interpretJSON(ir: IR, jobGroup: String): String =
+    inJobGroup(jobGroup)(interpretJSON(ir))
+
+  def interpretEncoded(ir: IR, jobGroup: String): Array[Byte] =
+    inJobGroup(jobGroup)(interpretEncoded(ir))
+
+  def interpretEncodedChunks(ir: IR, jobGroup: String, chunkSize: Int): ByteChunkIterator =
+    new ByteChunkIterator(interpretEncoded(ir, jobGroup), chunkSize)
+
+  def cancelJobGroup(jobGroup: String): Unit =
+    HailContext.get.sc.cancelJobGroup(jobGroup)
+
+  private def inJobGroup[T](jobGroup: String)(f: => T): T = {
+    val sc = HailContext.get.sc
+    sc.setJobGroup(jobGroup, jobGroup, interruptOnCancel = true)
+    try f finally sc.clearJobGroup()
+  }
+
   def apply(tir: TableIR): TableValue =
     apply(tir, optimize = true)
 
@@ -85,12 +118,16 @@ object Interpret {
       })
     }
 
-    if (optimize) optimizeIR(true)
-    ir = LiftLiterals(ir).asInstanceOf[IR]
-    ir = LowerMatrixIR(ir)
-    if (optimize) optimizeIR(false)
+    ExecutionTimings.time("optimize") {
+      if (optimize) optimizeIR(true)
+      ir = LiftLiterals(ir).asInstanceOf[IR]
+      ir = LowerMatrixIR(ir)
+      if (optimize) optimizeIR(false)
+    }
 
-    val result = apply(ir, valueEnv, args, agg, None, Memo.empty[AsmFunction3[Region, Long, Boolean, Long]]).asInstanceOf[T]
+    val result = ExecutionTimings.time("run") {
+      apply(ir, valueEnv, args, agg, None, Memo.empty[AsmFunction3[Region, Long, Boolean, Long]]).asInstanceOf[T]
+    }
 
     Uploader.uploadPipeline(ir0, ir)
 
@@ -0,0 +1,112 @@
+package is.hail.linalg
+
+import java.nio.{ByteBuffer, ByteOrder}
+
+import breeze.linalg.{DenseMatrix => BDM}
+import is.hail.HailContext
+import is.hail.utils._
+import org.json4s.jackson
+
+// Moves arrays of doubles and block matrices between the JVM and numpy as
+// little-endian bytes sent through py4j, rather than through local files.
+// Data is sent in chunks, a block or a slice of an array at a time, so no
+// single byte array approaches the 2^31 byte limit.
+object NumpyTransfer {
+  // doubles per chunk of an array
+  val chunkSize: Int = 1 << 24
+
+  def newArray(n: Int): Array[Double] = new Array[Double](n)
+
+  def copyFromBytes(bytes: Array[Byte], a: Array[Double], start: Int): Unit =
+    ByteBuffer.wrap(bytes).order(ByteOrder.LITTLE_ENDIAN).asDoubleBuffer().get(a, start, bytes.length / 8)
+
+  def copyToBytes(a: Array[Double], start: Int, end: Int): Array[Byte] = {
+    val bytes = new Array[Byte]((end - start) * 8)
+    ByteBuffer.wrap(bytes).order(ByteOrder.LITTLE_ENDIAN).asDoubleBuffer().put(a, start, end - start)
+    bytes
+  }
+
+  // `data` holds the entries in column-major order
+  def denseMatrix(nRows: Int, nCols: Int, data: Array[Double]): BDM[Double] =
+    new BDM(nRows, nCols, data)
+
+  // block row and column, numbers of rows and columns as 4-byte integers,
+  // then the entries in column-major order
+  def blockToBytes(i: Int, j: Int, lm: BDM[Double]): Array[Byte] = {
+    val buf = ByteBuffer.allocate(16 + 8 * lm.rows * lm.cols).order(ByteOrder.LITTLE_ENDIAN)
+    buf.putInt(i).putInt(j).putInt(lm.rows).putInt(lm.cols)
+    buf.asDoubleBuffer().put(lm.toArray)
+    buf.array()
+  }
+
+  def blockFromBytes(nRows: Int, nCols: Int, bytes: Array[Byte]): BDM[Double] = {
+    val data = new Array[Double](nRows * nCols)
+    copyFromBytes(bytes, data, 0)
+    new BDM(nRows, nCols, data)
+  }
+}
+
+// Streams the blocks of a block matrix to Python, encoded by
+// NumpyTransfer.blockToBytes. Blocks are computed in parallel, as many per
+// Spark job as fit in `maxBytesPerJob` on the driver, and the next job runs
+// once Python has taken all the blocks of the previous one.
+class BlockIterator(bm: BlockMatrix, maxBytesPerJob: Long) extends Iterator[Array[Byte]] {
+  private val blocks = bm.blocks.map { case ((i, j), lm) => NumpyTransfer.blockToBytes(i, j, lm) }
+
+  private val blocksPerJob = math.max(1L, maxBytesPerJob / (8L * bm.blockSize * bm.blockSize)).toInt
+
+  private val jobs = blocks.partitions.indices.grouped(blocksPerJob)
+
+  private var current: Iterator[Array[Byte]] = Iterator.empty
+
+  def hasNext: Boolean = {
+    while (!current.hasNext && jobs.hasNext) {
+      val parts = jobs.next()
+      current = blocks.sparkContext.runJob(blocks, (it: Iterator[Array[Byte]]) => it.toArray, parts)
+        .iterator.flatMap(_.iterator)
+    }
+    current.hasNext
+  }
+
+  def next(): Array[Byte] = {
+    if (!hasNext)
+      throw new NoSuchElementException("next on empty iterator")
+    current.next()
+  }
+}
+
+// Assembles a block matrix from blocks sent from Python one at a time. Each
+// block is written to a temporary file as it arrives, in the format of
+// BlockMatrix.write, so the driver holds at most one block and executors
+// read the blocks from storage, as in RichDenseMatrixDouble.writeBlockMatrix.
+class BlockMatrixBuilder(hc: HailContext, nRows: Long, nCols: Long, blockSize: Int) {
+  private val gp = GridPartitioner(blockSize, nRows, nCols)
+  private val d = digitsNeeded(gp.numPartitions)
+  private val added = new Array[Boolean](gp.numPartitions)
+
+  private val uri = hc.getTemporaryFile(prefix = Some("from-numpy"))
+  hc.hadoopConf.mkDir(uri)
+
+  def addBlock(i: Int, j: Int, bytes: Array[Byte]): Unit = {
+    val pi = gp.coordinatesBlock(i, j)
+    val (blockNRows, blockNCols) = gp.blockDims(pi)
+    require(bytes.length == 8L * blockNRows * blockNCols,
+      s"block ($i, $j) must have $blockNRows x $blockNCols entries, found ${ bytes.length / 8 }")
+    NumpyTransfer.blockFromBytes(blockNRows, blockNCols, bytes)
+      .write(hc, uri + "/parts/" + partFile(d, pi), forceRowMajor = false, bufferSpec = BlockMatrix.bufferSpec)
+    added(pi) = true
+  }
+
+  def result(): BlockMatrix = {
+    require(added.forall(identity), "not all blocks were added")
+    val hadoop = hc.hadoopConf
+    hadoop.writeDataFile(uri + BlockMatrix.metadataRelativePath) { os =>
+      implicit val formats = defaultJSONFormats
+      jackson.Serialization.write(
+        BlockMatrixMetadata(blockSize, nRows, nCols, gp.maybeBlocks, Array.tabulate(gp.numPartitions)(partFile(d, _))),
+        os)
+    }
+    hadoop.writeTextFile(uri + "/_SUCCESS")(out => ())
+    BlockMatrix.read(hc, uri)
+  }
+}
@@ -0,0 +1,27 @@
+package is.hail.backend
+
+import is.hail.SparkSuite
+import is.hail.utils._
+import org.testng.annotations.Test
+
+class HailGatewaySuite extends SparkSuite {
+  @Test def testSessions() {
+    val s1 = HailGateway.openSession()
+    val s2 = HailGateway.openSession()
+    assert(s1.id != s2.id)
+    assert(s1.tmpDir != s2.tmpDir)
+    assert(hadoopConf.exists(s1.tmpDir))
+
+    val f = s1.getTemporaryFile(suffix = Some("ht"))
+    assert(f.startsWith(s1.tmpDir + "/") && f.endsWith(".ht"))
+    hadoopConf.writeTextFile(f)(_.write("x"))
+
+    HailGateway.closeSession(s1.id)
+    assert(!hadoopConf.exists(s1.tmpDir))
+    assert(hadoopConf.exists(s2.tmpDir))
+    HailGateway.closeSession(s1.id)
+
+    HailGateway.closeSession(s2.id)
+    assert(!hadoopConf.exists(s2.tmpDir))
+  }
+}
@@ -0,0 +1,64 @@
+package is.hail.backend.local
+
+import is.hail.SparkSuite
+import is.hail.expr.ir._
+import is.hail.expr.ir.TestUtils._
+import is.hail.expr.types.virtual.{TInt32, TStruct}
+import is.hail.table.{Ascending, Descending, SortField}
+import is.hail.utils._
+import org.testng.annotations.Test
+
+class LocalBackendSuite extends SparkSuite {
+  def range(n: Int): TableIR = TableRange(n, 4)
+
+  def mapRow(t: TableIR, fields: (String, IR => IR)*): TableIR = {
+    val row = Ref("row", t.typ.rowType)
+    TableMapRows(t, InsertFields(row, fields.map { case (name, f) => name -> f(GetField(row, "idx")) }))
+  }
+
+  def collect(t: TableIR): IR = TableCollect(t)
+
+  def assertLocalMatchesSpark(ir: IR) {
+    assert(LocalBackend.execute(ir) == Interpret[Any](ir))
+  }
+
+  @Test def testAggregate() {
+    val t = range(10)
+    assertLocalMatchesSpark(TableAggregate(t, IRAggCount))
+    assertLocalMatchesSpark(TableAggregate(t, IRAggCollect(GetField(Ref("row", t.typ.rowType), "idx"))))
+  }
+
+  @Test def testKeyBy() {
+    val t = mapRow(range(10), "rev" -> (idx => ApplyBinaryPrimOp(Subtract(), I32(9), idx)))
+    assertLocalMatchesSpark(collect(TableKeyBy(t, FastIndexedSeq("rev"))))
+    assertLocalMatchesSpark(collect(TableKeyBy(t, FastIndexedSeq("idx"))))
+  }
+
+  @Test def testOrderBy() {
+    val t = TableKeyBy(range(10), FastIndexedSeq())
+    assertLocalMatchesSpark(collect(TableOrderBy(t, FastIndexedSeq(SortField("idx", Descending)))))
+    assertLocalMatchesSpark(collect(TableOrderBy(t, FastIndexedSeq(SortField("idx", Ascending)))))
+  }
+
+  @Test def testExplode() {
+    val t = mapRow(range(5), "a" -> (idx => ArrayRange(I32(0), idx, I32(1))))
+    assertLocalMatchesSpark(collect(TableExplode(t, FastIndexedSeq("a"))))
+  }
+
+  @Test def testLeftJoinRightDistinct() {
+    val left = mapRow(range(10), "x" -> (idx => idx))
+    val right = TableFilter(
+      mapRow(range(10), "y" -> (idx => ApplyBinaryPrimOp(Multiply(), I32(2), idx))),
+      ApplyComparisonOp(LT(TInt32()), GetField(Ref("row", TStruct("idx" -> TInt32(), "y" -> TInt32())), "idx"), I32(5)))
+    assertLocalMatchesSpark(collect(TableLeftJoinRightDistinct(left, right, "r")))
+  }
+
+  @Test def testFallsBackToSpark() {
+    val path = tmpDir.createLocalTempFile(extension = "ht")
+    Interpret(TableWrite(range(10), path))
+    val t = TableIR.read(hc, path, requestedType = None)
+    assertLocalMatchesSpark(collect(t))
+    assertLocalMatchesSpark(TableCount(TableFilter(t,
+      ApplyComparisonOp(LT(TInt32()), GetField(Ref("row", t.typ.rowType), "idx"), I32(5)))))
+  }
+}